@@ -0,0 +1,113 @@
+import hashlib
+import mimetypes
+import os
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from flask import Request, Response
+
+from automd.rendering import RenderedBody
+from automd.templates.openapi import CDN_ASSET_URLS
+
+# Directory of the UI assets shipped in the package, filled by `automd vendor-assets` when building a release
+PACKAGE_ASSET_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Hashed asset names change with their content, so browsers may keep them as long as they like
+IMMUTABLE_MAX_AGE: int = 365 * 24 * 60 * 60
+
+ASSET_HASH_LENGTH: int = 16
+
+
+def hashed_asset_name(filename: str, content: bytes) -> str:
+    """
+    Name of an asset including a hash of its content, e.g. "redoc.standalone.0123456789abcdef.js"
+    :param filename: File name of the asset
+    :param content: Content of the asset
+    :return: Content hashed name
+    """
+    stem, extension = os.path.splitext(filename)
+
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:ASSET_HASH_LENGTH]}{extension}"
+
+
+class AssetBundle:
+    """
+    UI assets served by the app instead of a CDN, read once and held in memory under content hashed names,
+    with their compressed variants made up front.
+    """
+    def __init__(self, asset_dir: str, filenames: Iterable[str]):
+        """
+
+        :param asset_dir: Directory holding the assets
+        :param filenames: File names of the assets to serve
+        :raises ValueError: An asset is missing from asset_dir
+        """
+        self.asset_dir: str = os.path.abspath(asset_dir)
+
+        filenames = list(filenames)
+        missing: List[str] = [filename for filename in filenames
+                              if not os.path.isfile(os.path.join(self.asset_dir, filename))]
+        if missing:
+            raise ValueError(f"UI assets {missing} not found in {self.asset_dir}, "
+                             f"download them with `automd vendor-assets --output {self.asset_dir}`")
+
+        self.hashed_names: Dict[str, str] = {}
+        self.bodies: Dict[str, RenderedBody] = {}
+
+        filename: str
+        for filename in filenames:
+            content: bytes = Path(self.asset_dir, filename).read_bytes()
+            hashed_name: str = hashed_asset_name(filename, content)
+
+            self.hashed_names[filename] = hashed_name
+            self.bodies[hashed_name] = RenderedBody(content,
+                                                    mimetypes.guess_type(filename)[0] or "application/octet-stream")
+
+    def urls(self, base_url: str) -> Dict[str, str]:
+        """
+        Urls of the assets by file name
+        :param base_url: Url the assets are served under
+        :return: Url of each asset's hashed name
+        """
+        return {filename: f"{base_url}/{hashed_name}" for filename, hashed_name in self.hashed_names.items()}
+
+    def response(self, hashed_name: str, request: Request) -> Optional[Response]:
+        """
+        Response serving an asset for the current request, cached as immutable
+        :param hashed_name: Content hashed name of the asset
+        :param request: Request being answered
+        :return: Response with the asset, None if no asset has that name
+        """
+        body: RenderedBody = self.bodies.get(hashed_name)
+        if body is None:
+            return None
+
+        response: Response = body.to_response(request)
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+
+        return response
+
+
+def vendor_assets(asset_dir: str = PACKAGE_ASSET_DIR, asset_urls: Dict[str, str] = None) -> List[Path]:
+    """
+    Download the UI assets to a directory, to serve them with AutoMDApp(serve_assets=True).
+    Run when building a release (or an image for an air-gapped host), never by the app itself.
+    :param asset_dir: Directory to write the assets to, created if missing.  Defaults to the package's.
+    :param asset_urls: Url to download each asset from by file name, defaults to the CDN urls of the shell pages
+    :return: Paths of the written assets
+    """
+    Path(asset_dir).mkdir(parents=True, exist_ok=True)
+
+    asset_paths: List[Path] = []
+    filename: str
+    url: str
+    for filename, url in (asset_urls or CDN_ASSET_URLS).items():
+        asset_path: Path = Path(asset_dir, filename)
+        with urllib.request.urlopen(url) as asset_response:
+            asset_path.write_bytes(asset_response.read())
+        asset_paths.append(asset_path)
+
+    return asset_paths
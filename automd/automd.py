@@ -1,22 +1,34 @@
-import mimetypes
+import threading
 
 from http.client import responses
 from inspect import Signature
-from typing import Dict, Union, List, Callable, Type, Tuple
+from typing import Dict, Union, List, Callable, Type, Tuple, Collection, Iterator, Optional, FrozenSet
 from marshmallow import Schema, fields
 from werkzeug.local import LocalProxy
-from flask import url_for, Flask
+from flask import Flask
 
 from apispec import APISpec
-from apispec.ext.marshmallow import MarshmallowPlugin
-from werkzeug.routing import Rule, BuildError
 
-from automd.decorators import automd
+from automd.decorators import automd, argument_location
+from automd.endpoint_doc import EndpointDoc
+from automd.endpoint_registry import endpoint_registry, ViewIndex
+from automd.fragments import OperationFragment, merge_fragment, component_name, REF_PREFIX
 from automd.http_verbs import HTTPVerb
 from automd.keys import AutoMDKeys
-from automd.mixedfield import mixedfield_2properties
+from automd.parallel_build import build_shards_in_pool, fork_available
+from automd.rendering import RenderedSpec
+from automd.route_index import RouteIndex, Route
 from automd.responses import ResponseObjectInterface
-from automd.responses.responses import map_type_field_mapping, type_to_field
+from automd.responses.responses import map_type_field_mapping, type_to_field, response_type_registry, TEXT_MIMETYPE
+from automd.spec_builder import SpecBuilder, OperationResolver
+
+# Parallel builds split the endpoints into this many shards per worker, balancing uneven shards
+SHARDS_PER_WORKER: int = 4
+# Minimum endpoints in a shard, below which the pool costs more than it saves
+MIN_SHARD_ENDPOINTS: int = 100
+
+# Schema of responses without a documented type, one component shared by every such operation
+EMPTY_RESPONSE_SCHEMA: Schema = Schema.from_dict({}, name="EmptyResponseSchema")()
 
 
 class AutoMD:
@@ -42,41 +54,58 @@ class AutoMD:
         self.always_document: bool = always_document
         self.default_tag: str = default_tag or title
         self.documented_verbs: Tuple[HTTPVerb] = documented_verbs
-        self._ma_plugin: MarshmallowPlugin = MarshmallowPlugin()
         self.apispec_options: Dict = {
             "title": title,
             "app_version": app_version,
             "openapi_version": openapi_version,
-            "info": {} if info is None else info,
-            "plugins": [self._ma_plugin]
+            "info": {} if info is None else info
         }
+        self.spec_builder: SpecBuilder = SpecBuilder(**self.apispec_options)
+        self._spec_cache: Dict[FrozenSet, RenderedSpec] = {}
+        self._pending_endpoints: List[str] = []
+        self._build_lock: threading.RLock = threading.RLock()
+        # guards the spec cache and pending endpoints only, so routes are registered without waiting on a build
+        self._pending_lock: threading.Lock = threading.Lock()
+        self._view_index: ViewIndex = None
+        self._operation_cache: Dict[Tuple, Tuple[Tuple, OperationFragment]] = {}
+        self._previous_operation_cache: Dict[Tuple, Tuple[Tuple, OperationFragment]] = {}
+        self.operation_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        # response type registry generation the cached operations and spec were built in, see operation_fragment
+        self._operation_generation: int = response_type_registry.generation
+        self._spec_generation: int = response_type_registry.generation
+        self._operation_resolver: OperationResolver = None
 
     def start_spec(self) -> APISpec:
         """
         Returns a new APISpec object based off the parameters this class
         :return: new APISpec class
         """
-        api_spec: APISpec = APISpec(self.apispec_options["title"],
-                                    self.apispec_options["app_version"],
-                                    self.apispec_options["openapi_version"],
-                                    info=self.apispec_options["info"],
-                                    plugins=self.apispec_options["plugins"])
+        return self.spec_builder.start_spec()
 
-        # register the Mixed Field handling function
-        self._ma_plugin.converter.add_attribute_function(mixedfield_2properties)
+    def operation_resolver(self) -> OperationResolver:
+        """
+        Returns the OperationResolver operations are built with, started on first use and replaced by each full build,
+        so it only holds the schemas of the endpoints documented since
+        :return: OperationResolver shared by the operations built
+        """
+        resolver: OperationResolver = self._operation_resolver
+        if resolver is None:
+            resolver = self._operation_resolver = self.spec_builder.start_resolver()
 
-        return api_spec
+        return resolver
 
     @staticmethod
     def parse_parameter_schema(parameter_object: Union[Dict, Schema],
                                func_signature: Signature,
                                path_url: str,
-                               http_verb: str) -> Dict[str, Dict[str, fields.Field]]:
+                               http_verb: str,
+                               path_arguments: Collection[str] = ()) -> Dict[str, Dict[str, fields.Field]]:
         # No marhmallow parameters, infer from function signature
         if parameter_object is None:
             parameter_signature_dict = {}
             for name, param in func_signature.parameters.items():
-                if name == "self":
+                # path variables are passed as arguments too, but documented as path parameters
+                if name == "self" or name in path_arguments:
                     continue
 
                 field_args: Dict = {
@@ -105,7 +134,7 @@ class AutoMD:
 
         location_argmaps: Dict[str, Dict[str, fields.Field]] = {}
         for name, field in parameter_dict.items():
-            location: str = field.metadata.get("location", "query")
+            location: str = argument_location(field)
             if location not in location_argmaps:
                 location_argmaps[location] = {}
 
@@ -142,36 +171,26 @@ class AutoMD:
         :param http_verb:
         :return: Response Schema, content-type
         """
-        response_schema: Schema
-        if response_interface is not None:
-            response_schema = response_interface.to_schema()
-        else:
-            url_name: str = "".join([part.title() for part in path_url.split("/")])
-            # TODO: test this code path
-            response_schema = Schema.from_dict({}, name=f"{url_name}{http_verb.title()}ResponseSchema")()
-
-        content_type: str
-        try:
-            content_type = response_interface.content_type()
-        except AttributeError:
-            content_type = mimetypes.MimeTypes().types_map[1][".txt"]
-
-        return response_schema, content_type
-
-    def register_path(self,
-                      api_spec: APISpec,
-                      path_url: str,
-                      http_verb: str,
-                      response_code: int,
-                      summary: str = None,
-                      description: str = None,
-                      parameter_object: Union[Dict, Schema] = None,
-                      response_object: Union[Type, ResponseObjectInterface] = None,
-                      func_signature: Signature = None,
-                      tags: List[str] = None) -> APISpec:
+        if response_interface is None:
+            return EMPTY_RESPONSE_SCHEMA, TEXT_MIMETYPE
+
+        # schema and content type are resolved once per response class
+        return response_type_registry.entry(response_interface)
+
+    def build_operation_fragment(self,
+                                 path_url: str,
+                                 http_verb: str,
+                                 response_code: int,
+                                 summary: str = None,
+                                 description: str = None,
+                                 parameter_object: Union[Dict, Schema] = None,
+                                 response_object: Union[Type, ResponseObjectInterface] = None,
+                                 func_signature: Signature = None,
+                                 tags: List[str] = None,
+                                 path_parameters: List[Dict] = None) -> OperationFragment:
         """
-        Register a new path to the provided APISpec object (passed in APISpec object is mutated).
-        :param api_spec: APISpec to register the path to
+        Introspect a single operation into a finished OpenAPI operation, independent of any APISpec.
+        Schemas are resolved to references by the operation resolver, exactly as they would be in the final spec.
         :param path_url: url of the path
         :param http_verb:
         :param response_code:
@@ -181,10 +200,15 @@ class AutoMD:
         :param response_object: HTTP response information
         :param func_signature: inspection Signature object of the API call function
         :param tags: Tags for categorizing the path.  Defaults to the AutoMD App Title
-        :return: The same APISpec object passed in, but now with a new path registered
+        :param path_parameters: OpenAPI parameter objects of the variables of the path
+        :return: The operation and the component schemas it references
         """
-
-        parameter_schema: Dict = self.parse_parameter_schema(parameter_object, func_signature, path_url, http_verb)
+        path_parameters = path_parameters or []
+        parameter_schema: Dict = self.parse_parameter_schema(parameter_object,
+                                                             func_signature,
+                                                             path_url,
+                                                             http_verb,
+                                                             [parameter["name"] for parameter in path_parameters])
 
         response_schema, content_type = self.parse_response_schema(response_object, path_url, http_verb)
 
@@ -208,31 +232,218 @@ class AutoMD:
         if description is not None:
             verb_dict["description"] = description
 
-        resp_params = self._ma_plugin.converter.fields2parameters((parameter_schema or {}).get("query", {}),
-                                                                  default_in="query")
-
-        verb_dict["parameters"] = resp_params
-        if parameter_schema:
-            req_body = self._ma_plugin.converter.fields2parameters((parameter_schema or {}).get("json", {}),
-                                                                   default_in="body")
-
-            if len(req_body) > 0:
-                verb_dict["requestBody"] = {
-                    "content": {
-                        "application/json": {
-                            "schema": req_body[0]["schema"]
+        resolver: OperationResolver = self.operation_resolver()
+        with resolver.lock:
+            resp_params = resolver.converter.fields2parameters((parameter_schema or {}).get("query", {}),
+                                                               default_in="query")
+
+            # copied, the resolver sets "required" on path parameters
+            verb_dict["parameters"] = [*(dict(parameter) for parameter in path_parameters), *resp_params]
+            body_schemas: Dict[str, Dict] = {}
+            if parameter_schema:
+                req_body = resolver.converter.fields2parameters((parameter_schema or {}).get("json", {}),
+                                                                default_in="body")
+
+                if len(req_body) > 0:
+                    # a component rather than inline, so identical bodies are shared across operations
+                    schema_class: Optional[type] = type(parameter_object) if isinstance(parameter_object, Schema) else None
+                    body_name: str = component_name(req_body[0]["schema"], "RequestBody", schema_class)
+                    body_schemas[body_name] = req_body[0]["schema"]
+                    verb_dict["requestBody"] = {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": f"{REF_PREFIX}{body_name}"}
+                            }
                         }
                     }
-                }
 
-        operations: Dict = {http_verb.lower(): verb_dict}
+            operation: Dict = resolver.resolve_operation(path_url, http_verb, verb_dict)
 
-        api_spec.path(
-            path=path_url,
-            operations=operations,
-        )
+            # in the order the schemas were first met: parameters, request body, then responses
+            schemas: Dict[str, Dict] = resolver.referenced_schemas(operation["parameters"], *body_schemas.values())
+            schemas.update(body_schemas)
+            resolver.referenced_schemas(operation, schemas=schemas)
 
-        return api_spec
+        return OperationFragment(operation, schemas)
+
+    def register_path(self,
+                      api_spec: APISpec,
+                      path_url: str,
+                      http_verb: str,
+                      response_code: int,
+                      summary: str = None,
+                      description: str = None,
+                      parameter_object: Union[Dict, Schema] = None,
+                      response_object: Union[Type, ResponseObjectInterface] = None,
+                      func_signature: Signature = None,
+                      tags: List[str] = None,
+                      path_parameters: List[Dict] = None) -> APISpec:
+        """
+        Register a new path to the provided APISpec object (passed in APISpec object is mutated).
+        :param api_spec: APISpec to register the path to
+        :param path_url: url of the path
+        :param http_verb:
+        :param response_code:
+        :param summary:
+        :param description:
+        :param parameter_object: HTTP Parameters of the path
+        :param response_object: HTTP response information
+        :param func_signature: inspection Signature object of the API call function
+        :param tags: Tags for categorizing the path.  Defaults to the AutoMD App Title
+        :param path_parameters: OpenAPI parameter objects of the variables of the path
+        :return: The same APISpec object passed in, but now with a new path registered
+        """
+        fragment: OperationFragment = self.build_operation_fragment(path_url,
+                                                                    http_verb,
+                                                                    response_code,
+                                                                    summary,
+                                                                    description,
+                                                                    parameter_object,
+                                                                    response_object,
+                                                                    func_signature,
+                                                                    tags,
+                                                                    path_parameters)
+
+        return merge_fragment(api_spec, path_url, http_verb, fragment)
+
+    def register_operation(self,
+                           api_spec: APISpec,
+                           func: Callable,
+                           path_url: str,
+                           http_verb: str,
+                           response_code: int,
+                           summary: str = None,
+                           description: str = None,
+                           parameter_object: Union[Dict, Schema] = None,
+                           response_object: Union[Type, ResponseObjectInterface] = None,
+                           func_signature: Signature = None,
+                           tags: List[str] = None,
+                           path_parameters: List[Dict] = None) -> APISpec:
+        """
+        Register the operation of a documented function to the provided APISpec object
+        (passed in APISpec object is mutated), reusing the operation built for it last time
+        when neither the function nor its documentation has changed since.
+        :param api_spec: APISpec to register the path to
+        :param func: Documented function of the operation
+        :param path_url: url of the path
+        :param http_verb:
+        :param response_code:
+        :param summary:
+        :param description:
+        :param parameter_object: HTTP Parameters of the path
+        :param response_object: HTTP response information
+        :param func_signature: inspection Signature object of the API call function
+        :param tags: Tags for categorizing the path.  Defaults to the AutoMD App Title
+        :param path_parameters: OpenAPI parameter objects of the variables of the path
+        :return: The same APISpec object passed in, but now with a new path registered
+        """
+        fragment: OperationFragment = self.operation_fragment(func,
+                                                              path_url,
+                                                              http_verb,
+                                                              response_code,
+                                                              summary,
+                                                              description,
+                                                              parameter_object,
+                                                              response_object,
+                                                              func_signature,
+                                                              tags,
+                                                              path_parameters)
+
+        return merge_fragment(api_spec, path_url, http_verb, fragment)
+
+    def operation_fragment(self,
+                           func: Callable,
+                           path_url: str,
+                           http_verb: str,
+                           response_code: int,
+                           summary: str = None,
+                           description: str = None,
+                           parameter_object: Union[Dict, Schema] = None,
+                           response_object: Union[Type, ResponseObjectInterface] = None,
+                           func_signature: Signature = None,
+                           tags: List[str] = None,
+                           path_parameters: List[Dict] = None) -> OperationFragment:
+        """
+        Return the operation of a documented function, reusing the operation built for it last time
+        when neither the function nor its documentation has changed since.
+        :param func: Documented function of the operation
+        :param path_url: url of the path
+        :param http_verb:
+        :param response_code:
+        :param summary:
+        :param description:
+        :param parameter_object: HTTP Parameters of the path
+        :param response_object: HTTP response information
+        :param func_signature: inspection Signature object of the API call function
+        :param tags: Tags for categorizing the path.  Defaults to the AutoMD App Title
+        :param path_parameters: OpenAPI parameter objects of the variables of the path
+        :return: The operation and the component schemas it references
+        """
+        if self._operation_generation != response_type_registry.generation:
+            # response types registered since, the cached operations may document their annotations differently
+            self._operation_cache = {}
+            self._previous_operation_cache = {}
+            self._operation_generation = response_type_registry.generation
+
+        cache_key: Tuple = (func, path_url, http_verb, response_code)
+        metadata: Tuple = (summary,
+                           description,
+                           parameter_object,
+                           response_object,
+                           func_signature,
+                           tags,
+                           path_parameters)
+
+        cached: Tuple[Tuple, OperationFragment] = (self._operation_cache.get(cache_key)
+                                                   or self._previous_operation_cache.get(cache_key))
+
+        fragment: OperationFragment
+        if cached is not None and self.same_metadata(cached[0], metadata):
+            fragment = cached[1]
+            self.operation_cache_stats["hits"] += 1
+        else:
+            fragment = self.build_operation_fragment(path_url,
+                                                     http_verb,
+                                                     response_code,
+                                                     summary,
+                                                     description,
+                                                     parameter_object,
+                                                     response_object,
+                                                     func_signature,
+                                                     tags,
+                                                     path_parameters)
+            self.operation_cache_stats["misses"] += 1
+
+        self._operation_cache[cache_key] = (metadata, fragment)
+
+        return fragment
+
+    def cache_operation(self,
+                        fragment: OperationFragment,
+                        func: Callable,
+                        path_url: str,
+                        http_verb: str,
+                        response_code: int,
+                        *metadata):
+        """
+        Cache an operation built elsewhere (e.g. by a build worker), as operation_fragment caches the ones it builds
+        :param fragment: Built operation
+        :param func: Documented function of the operation, followed by the other arguments of operation_fragment
+        """
+        self._operation_cache[(func, path_url, http_verb, response_code)] = (metadata, fragment)
+
+    @staticmethod
+    def same_metadata(cached: Tuple, current: Tuple) -> bool:
+        """
+        Compare documentation metadata, by identity first since it is usually the very same objects
+        :param cached: Metadata an operation was built from
+        :param current: Metadata of the function now
+        :return: Whether an operation built from the cached metadata is still valid
+        """
+        try:
+            return all(old is new or old == new for old, new in zip(cached, current))
+        except Exception:
+            return False
 
     def application_to_apispec(self, app: Union[Flask, LocalProxy]) -> APISpec:
         """
@@ -241,90 +452,373 @@ class AutoMD:
         :return:
         """
         automd_spec: APISpec = self.start_spec()
+        route_index: RouteIndex = self.app_route_index(app)
+
+        # operations of endpoints no longer routed are dropped with the previous cache at the end of the build
+        self._previous_operation_cache, self._operation_cache = self._operation_cache, {}
+        self._operation_resolver = None
+        try:
+            name: str
+            for name in self.documented_endpoints(app):
+                self.register_endpoint(app, automd_spec, name, app.view_functions[name], route_index)
+        finally:
+            self._previous_operation_cache = {}
+
+        return automd_spec
+
+    def application_to_apispec_in_pool(self, app: Union[Flask, LocalProxy], workers: int) -> APISpec:
+        """
+        Create a new APISpec of the provided application, building the operations in a pool of forked processes.
+        Only for offline builds, see build_shards_in_pool.  The operations the workers build are cached here,
+        as a serial build caches them.
+        :param app: Flask app initialized with AutoMD
+        :param workers: Number of processes
+        :return:
+        """
+        shards: List[List[str]] = self.endpoint_shards(app, workers)
+        if len(shards) <= 1:
+            return self.application_to_apispec(app)
+
+        automd_spec: APISpec = self.start_spec()
+        route_index: RouteIndex = self.app_route_index(app)
+
+        # introspected once, here, the workers only build the operations
+        operations: Dict[str, List[Tuple]] = {
+            name: self.endpoint_operation_arguments(name, app.view_functions[name], route_index)
+            for shard in shards for name in shard
+        }
+
+        self._previous_operation_cache, self._operation_cache = self._operation_cache, {}
+        self._operation_resolver = None
+        try:
+            # fragments are merged in endpoint order, exactly as a serial build merges them
+            name: str
+            fragments: List[Tuple[str, str, OperationFragment]]
+            for name, fragments in build_shards_in_pool(self, shards, workers, operations):
+                for operation_arguments, (_, _, fragment) in zip(operations[name], fragments):
+                    self.cache_operation(fragment, *operation_arguments)
+
+                self.merge_fragments(automd_spec, fragments)
+        finally:
+            self._previous_operation_cache = {}
+
+        return automd_spec
+
+    def rendered_spec_in_pool(self, app: Union[Flask, LocalProxy], workers: int) -> RenderedSpec:
+        """
+        rendered_spec, building the spec with application_to_apispec_in_pool when it isn't already built
+        :param app: Flask app initialized with AutoMD
+        :param workers: Number of processes
+        :return: RenderedSpec holding the APISpec and its serialized documents
+        """
+        with self._build_lock:
+            with self._pending_lock:
+                fingerprint: FrozenSet = self.route_fingerprint(app)
+                generation: int = response_type_registry.generation
+                built: bool = fingerprint in self._spec_cache and self._spec_generation == generation
+
+            if not built and fork_available():
+                rendered: RenderedSpec = RenderedSpec(self.application_to_apispec_in_pool(app, workers),
+                                                      self._build_lock)
+                with self._pending_lock:
+                    self._spec_cache = {fingerprint: rendered}
+                    self._pending_endpoints = []
+                    self._spec_generation = generation
+
+            return self.rendered_spec(app)
+
+    def documented_endpoints(self, app: Union[Flask, LocalProxy]) -> List[str]:
+        """
+        Endpoints of an app that may have documented operations, found from the documented functions in the
+        endpoint registry, or every endpoint with always_document
+        :param app: Flask app initialized with AutoMD
+        :return: Endpoint names, in the order they were added to the app
+        """
+        view_index: ViewIndex = self._view_index
+        if view_index is None or view_index.view_functions is not app.view_functions:
+            view_index = ViewIndex(app.view_functions, endpoint_registry)
+            self._view_index = view_index
+
+        if self.always_document:
+            view_index.update()
+            return list(view_index.positions)
+
+        return list(view_index.documented_endpoints())
+
+    def endpoint_shards(self, app: Union[Flask, LocalProxy], workers: int = None) -> List[List[str]]:
+        """
+        Split the endpoints of an app into contiguous shards to build in parallel
+        :param app: Flask app initialized with AutoMD
+        :param workers: Number of processes building the shards
+        :return: Endpoint names of each shard, a single shard when the build should be serial
+        """
+        names: List[str] = self.documented_endpoints(app)
+
+        shard_count: int = 1
+        if workers is not None and workers > 1:
+            shard_count = min(workers * SHARDS_PER_WORKER, len(names) // MIN_SHARD_ENDPOINTS)
+
+        if shard_count <= 1:
+            return [names]
+
+        shard_size: int = -(-len(names) // shard_count)
+        return [names[start:start + shard_size] for start in range(0, len(names), shard_size)]
+
+    def extend_apispec(self, app: Union[Flask, LocalProxy], automd_spec: APISpec, endpoints: List[str]) -> APISpec:
+        """
+        Register the operations of the given endpoints to an already built APISpec (passed in APISpec is mutated).
+        :param app: Flask app initialized with AutoMD
+        :param automd_spec: APISpec built from the app
+        :param endpoints: Names of the endpoints added to the app since the APISpec was built
+        :return: The same APISpec object passed in, now with the endpoints registered
+        """
+        route_index: RouteIndex = self.app_route_index(app)
+        documented: set = set(self.documented_endpoints(app))
 
         name: str
-        for name, view in app.view_functions.items():
-            if hasattr(view, "methods"):
-                self.parse_flask_restful(automd_spec, view)
-            elif hasattr(view, AutoMDKeys.function.value) or self.always_document:
-                self.parse_flask_route(app, automd_spec, name, view)
-            else:
-                continue
+        for name in dict.fromkeys(endpoints):
+            if name in documented:
+                self.register_endpoint(app, automd_spec, name, app.view_functions[name], route_index)
 
         return automd_spec
 
-    def parse_flask_route(self, app: Union[Flask, LocalProxy], automd_spec: APISpec, name: str, view):
-        route_rules: List[Rule] = list(app.url_map.iter_rules(name))
+    def register_endpoint(self,
+                          app: Union[Flask, LocalProxy],
+                          automd_spec: APISpec,
+                          name: str,
+                          view: Callable,
+                          route_index: RouteIndex = None):
+        route_index = route_index or self.app_route_index(app)
 
-        rule: Rule
-        for rule in route_rules:
+        self.merge_fragments(automd_spec, self.endpoint_fragments(name, view, route_index))
+
+    @staticmethod
+    def merge_fragments(automd_spec: APISpec, fragments: List[Tuple[str, str, OperationFragment]]):
+        path_url: str
+        http_verb: str
+        fragment: OperationFragment
+        for path_url, http_verb, fragment in fragments:
+            merge_fragment(automd_spec, path_url, http_verb, fragment)
+
+    def endpoint_fragments(self,
+                           name: str,
+                           view: Callable,
+                           route_index: RouteIndex) -> List[Tuple[str, str, OperationFragment]]:
+        """
+        Build the operations of an endpoint, without registering them to an APISpec
+        :param name: Endpoint name
+        :param view: View function of the endpoint
+        :param route_index: Routes of the app
+        :return: (path, HTTP verb, operation) of every documented operation of the endpoint, in registration order
+        """
+        return [(operation_arguments[1], operation_arguments[2], self.operation_fragment(*operation_arguments))
+                for operation_arguments in self.endpoint_operation_arguments(name, view, route_index)]
+
+    def endpoint_operation_arguments(self, name: str, view: Callable, route_index: RouteIndex) -> List[Tuple]:
+        """
+        Arguments of operation_fragment for every documented operation of an endpoint, in registration order
+        :param name: Endpoint name
+        :param view: View function of the endpoint
+        :param route_index: Routes of the app
+        :return: Positional arguments of operation_fragment of each operation
+        """
+        operations: List[Tuple] = []
+
+        value_func: Callable
+        route: Route
+        method: str
+        for value_func, route, method in self.endpoint_operations(name, view, route_index):
+            endpoint_doc: EndpointDoc = EndpointDoc.from_metadata(value_func,
+                                                                  getattr(value_func, AutoMDKeys.function.value))
+
+            for response_code, response in endpoint_doc.response_schemas.items():
+                operations.append((value_func,
+                                   route.path,
+                                   method,
+                                   response_code,
+                                   endpoint_doc.summary,
+                                   endpoint_doc.description,
+                                   endpoint_doc.parameter_schema,
+                                   response,
+                                   endpoint_doc.func_signature,
+                                   endpoint_doc.tags,
+                                   route.path_parameters))
+
+        return operations
+
+    def endpoint_operations(self,
+                            name: str,
+                            view: Callable,
+                            route_index: RouteIndex) -> Iterator[Tuple[Callable, Route, str]]:
+        """
+        Documented operations of an endpoint
+        :param name: Endpoint name
+        :param view: View function of the endpoint
+        :param route_index: Routes of the app
+        :return: Iterator of (documented function, route, HTTP verb)
+        """
+        # an endpoint found from one documented function may have undocumented handlers as well
+        if hasattr(view, "methods"):
+            if self.always_document or endpoint_registry.has_documented_methods(view.view_class, view.methods):
+                yield from self.parse_flask_restful(view, route_index.routes(name))
+        elif endpoint_registry.is_documented(view) or (self.always_document and not self.is_static_endpoint(name)):
+            yield from self.parse_flask_route(view, route_index.routes(name))
+
+    @staticmethod
+    def is_static_endpoint(name: str) -> bool:
+        """
+        Whether an endpoint is the static file route Flask adds to apps and blueprints, which is not part of the API
+        :param name: Endpoint name
+        :return: True for static file endpoints
+        """
+        return name == "static" or name.endswith(".static")
+
+    @staticmethod
+    def app_route_index(app: Union[Flask, LocalProxy]) -> RouteIndex:
+        """
+        Index of the documented paths of an app's url rules
+        :param app: Flask app
+        :return: RouteIndex of the app's url map
+        """
+        return RouteIndex(app.url_map, app.config.get("APPLICATION_ROOT", "/"))
+
+    @staticmethod
+    def route_fingerprint(app: Union[Flask, LocalProxy]) -> FrozenSet:
+        """
+        Fingerprint of the routing state of a Flask app: the url, methods and endpoint of every rule, along with the
+        view function routed to.  Changes when a route is added, a rule replaced or a view function swapped.
+        View functions are held rather than their ids, which could be reused by a function defined later.
+        :param app: Flask app to fingerprint
+        :return: Hashable fingerprint of the url map and view functions
+        """
+        view_functions: Dict[str, Callable] = app.view_functions
+        # a set, werkzeug sorts the rules as it adds them
+        return frozenset((rule.rule, frozenset(rule.methods or ()), rule.endpoint, view_functions.get(rule.endpoint))
+                         for rule in app.url_map.iter_rules())
+
+    def rendered_spec(self, app: Union[Flask, LocalProxy]) -> RenderedSpec:
+        """
+        Return the built spec of the provided application, only rebuilding it when the route map has changed.
+        :param app: Flask app initialized with AutoMD
+        :return: RenderedSpec holding the APISpec and its serialized documents
+        """
+        fingerprint: FrozenSet = self.route_fingerprint(app)
+
+        rendered: RenderedSpec = self._spec_cache.get(fingerprint)
+        if (rendered is not None and not self._pending_endpoints
+                and self._spec_generation == response_type_registry.generation):
+            return rendered
+
+        # Single flight: concurrent callers wait on the build in progress and share its result.
+        # Rendering takes the same lock, since extending mutates the APISpec being rendered.
+        with self._build_lock:
+            pending: List[str]
+            with self._pending_lock:
+                fingerprint = self.route_fingerprint(app)
+                previous: RenderedSpec = self._spec_cache.get(fingerprint)
+                pending, self._pending_endpoints = self._pending_endpoints, []
+
+                if self._spec_generation != response_type_registry.generation:
+                    # response types registered since the build, rebuilt as a whole
+                    previous = None
+                    self._spec_generation = response_type_registry.generation
+
+            if previous is None:
+                rendered = RenderedSpec(self.application_to_apispec(app), self._build_lock)
+            elif pending:
+                rendered = RenderedSpec(self.extend_apispec(app, previous.api_spec, pending), self._build_lock)
+            else:
+                return previous
+
+            with self._pending_lock:
+                if previous is not None and any(cached is previous for cached in self._spec_cache.values()):
+                    # routes added while extending moved the previous spec to their fingerprint, and are pending
+                    self._spec_cache = {cached_fingerprint: rendered for cached_fingerprint in self._spec_cache}
+                else:
+                    self._spec_cache = {fingerprint: rendered}
+
+        return rendered
+
+    def endpoint_added(self, app: Union[Flask, LocalProxy], endpoint: str):
+        """
+        Record a route added to the app, so the cached spec is extended with only that endpoint
+        instead of being rebuilt.  Registration is deferred to the next spec request, so decorators applied
+        after the route is registered are still picked up.  Doesn't wait on a build in progress.
+        :param app: Flask app initialized with AutoMD
+        :param endpoint: Name of the endpoint of the added route
+        """
+        with self._pending_lock:
+            if len(self._spec_cache) != 1:
+                return
+
+            cached_fingerprint: FrozenSet
+            rendered: RenderedSpec
+            (cached_fingerprint, rendered), = self._spec_cache.items()
+
+            # only routes added since the build extend it, anything else changed is left to a rebuild
+            fingerprint: FrozenSet = self.route_fingerprint(app)
+            if not cached_fingerprint <= fingerprint:
+                return
+
+            self._spec_cache = {fingerprint: rendered}
+            self._pending_endpoints.append(endpoint)
+
+    def cached_apispec(self, app: Union[Flask, LocalProxy]) -> APISpec:
+        """
+        Return the APISpec of the provided application, only rebuilding it when the route map has changed.
+        :param app: Flask app initialized with AutoMD
+        :return: APISpec of the application
+        """
+        return self.rendered_spec(app).api_spec
+
+    def clear_operation_cache(self):
+        """
+        Drop the cached operations, forcing the next build to introspect every endpoint again
+        """
+        with self._build_lock:
+            self._operation_cache = {}
+            self._previous_operation_cache = {}
+            self._operation_resolver = None
+
+    def invalidate_spec_cache(self):
+        """
+        Drop the cached APISpec, forcing the next call to cached_apispec to rebuild it
+        """
+        with self._build_lock, self._pending_lock:
+            self._spec_cache = {}
+            self._pending_endpoints = []
+
+    def parse_flask_route(self, view: Callable, routes: List[Route]) -> Iterator[Tuple[Callable, Route, str]]:
+        route: Route
+        for route in routes:
             method: str
-            for method in rule.methods:
+            for method in route.methods:
                 if HTTPVerb[method.lower()] not in self.documented_verbs:
                     continue
-                try:
-                    key: str = url_for(rule.endpoint)
-                except BuildError:
-                    continue
                 value_func: Callable = view
 
                 if (self.always_document
-                        and not hasattr(value_func, AutoMDKeys.function.value)
-                        and not hasattr(value_func, AutoMDKeys.hide_function.value)):
+                        and not endpoint_registry.is_documented(value_func)
+                        and not endpoint_registry.is_hidden(value_func)):
                     value_func = automd()(value_func)
 
-                if hasattr(value_func, AutoMDKeys.function.value):
-                    automd_spec_parameters: Dict = getattr(value_func, AutoMDKeys.function.value)
-                    response_schemas: Dict = automd_spec_parameters.get("response_schemas")
-                    parameter_schema: Dict = automd_spec_parameters.get("parameter_schema")
-                    func_signature: Signature = automd_spec_parameters.get("func_signature")
-                    summary: str = automd_spec_parameters.get("summary")
-                    description: str = automd_spec_parameters.get("description")
-                    tags: List[str] = automd_spec_parameters.get("tags")
-
-                    for response_code, response in response_schemas.items():
-                        self.register_path(automd_spec,
-                                           key,
-                                           method,
-                                           response_code,
-                                           summary,
-                                           description,
-                                           parameter_schema,
-                                           response,
-                                           func_signature,
-                                           tags)
-
-    def parse_flask_restful(self, automd_spec: APISpec, view):
-        method: str
-        for method in view.methods:
-            if HTTPVerb[method.lower()] not in self.documented_verbs:
-                continue
-            key: str = url_for(view.view_class.endpoint)
-
-            value_func: Callable = getattr(view.view_class, method.lower())
-
-            if (self.always_document
-                    and not hasattr(value_func, AutoMDKeys.function.value)
-                    and not hasattr(value_func, AutoMDKeys.hide_function.value)):
-                value_func = automd()(value_func)
-
-            if hasattr(value_func, AutoMDKeys.function.value):
-                automd_spec_parameters: Dict = getattr(value_func, AutoMDKeys.function.value)
-                response_schemas: Dict = automd_spec_parameters.get("response_schemas")
-                parameter_schema: Dict = automd_spec_parameters.get("parameter_schema")
-                func_signature: Signature = automd_spec_parameters.get("func_signature")
-                summary: str = automd_spec_parameters.get("summary")
-                description: str = automd_spec_parameters.get("description")
-                tags: List[str] = automd_spec_parameters.get("tags")
-
-                for response_code, response in response_schemas.items():
-                    self.register_path(automd_spec,
-                                       key,
-                                       method,
-                                       response_code,
-                                       summary,
-                                       description,
-                                       parameter_schema,
-                                       response,
-                                       func_signature,
-                                       tags)
+                if endpoint_registry.is_documented(value_func):
+                    yield value_func, route, method
+
+    def parse_flask_restful(self, view: Callable, routes: List[Route]) -> Iterator[Tuple[Callable, Route, str]]:
+        route: Route
+        for route in routes:
+            method: str
+            for method in view.methods:
+                if HTTPVerb[method.lower()] not in self.documented_verbs:
+                    continue
+
+                value_func: Callable = getattr(view.view_class, method.lower())
+
+                if (self.always_document
+                        and not endpoint_registry.is_documented(value_func)
+                        and not endpoint_registry.is_hidden(value_func)):
+                    value_func = automd()(value_func)
+
+                if endpoint_registry.is_documented(value_func):
+                    yield value_func, route, method
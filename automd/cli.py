@@ -0,0 +1,161 @@
+import argparse
+import contextlib
+import importlib
+import os
+import sys
+from gzip import GzipFile
+from pathlib import Path
+from typing import List, Dict, BinaryIO, Optional
+
+from flask import Flask
+
+from automd.assets import PACKAGE_ASSET_DIR, vendor_assets
+from automd.automd import AutoMD
+from automd.keys import AutoMDKeys
+from automd.parallel_build import fork_available
+from automd.rendering import RenderedSpec, SpecFormat, spec_artifact_names, content_encoding_suffixes
+from automd.registration import AutoMDApp
+from automd.templates.pages import PageFormat, write_pages
+
+
+def load_app(import_path: str) -> Flask:
+    """
+    Import a Flask app from an import path of the form "package.module:attribute".
+    The attribute defaults to "app" when omitted.
+    :param import_path: Import path of the Flask app
+    :return: The imported Flask app
+    """
+    module_name, _, attribute = import_path.partition(":")
+
+    # match `flask run`, allowing apps in the working directory to be imported
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    module = importlib.import_module(module_name)
+    app: Flask = getattr(module, attribute or "app")
+
+    if AutoMDKeys.config.value not in app.config:
+        raise ValueError(f"{import_path} has not been initialized with AutoMDApp")
+
+    return app
+
+
+def build_artifacts(app: Flask,
+                    output_dir: Path,
+                    spec_formats: List[SpecFormat] = tuple(SpecFormat),
+                    gzip: bool = False,
+                    workers: int = None) -> Dict[SpecFormat, Path]:
+    """
+    Build the spec of an app initialized with AutoMDApp and write it to disk, without running a server.
+    :param app: Flask app initialized with AutoMDApp
+    :param output_dir: Directory to write the spec files to, created if missing
+    :param spec_formats: Formats to write
+    :param gzip: Also write a gzip compressed copy of each file, with a ".gz" suffix
+    :param workers: Build the operations of large apps in a pool of this many forked processes
+    :return: Path of the file written for each format
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    automd_app: AutoMDApp = app.config[AutoMDKeys.config.value]
+    # the app may have started a build when imported, it must be done before worker processes are forked
+    automd_app.wait_for_started_build()
+
+    rendered: RenderedSpec = (automd_app.auto_md.rendered_spec(app) if workers is None
+                              else automd_app.auto_md.rendered_spec_in_pool(app, workers))
+
+    artifacts: Dict[SpecFormat, Path] = {}
+    spec_format: SpecFormat
+    for spec_format in spec_formats:
+        artifact_path: Path = Path(output_dir, spec_artifact_names[spec_format])
+        gzip_path: Path = Path(f"{artifact_path}{content_encoding_suffixes['gzip']}")
+
+        # streamed to disk, so the whole document is never held in memory
+        with contextlib.ExitStack() as files:
+            artifact_file: BinaryIO = files.enter_context(artifact_path.open("wb"))
+            gzip_file: Optional[GzipFile] = files.enter_context(GzipFile(gzip_path, "wb")) if gzip else None
+
+            chunk: bytes
+            for chunk in rendered.stream(spec_format):
+                artifact_file.write(chunk)
+                if gzip_file is not None:
+                    gzip_file.write(chunk)
+
+        artifacts[spec_format] = artifact_path
+
+    return artifacts
+
+
+def build_command(args: argparse.Namespace) -> int:
+    app: Flask = load_app(args.app)
+    spec_formats: List[SpecFormat] = [SpecFormat(spec_format) for spec_format in args.format or SpecFormat]
+
+    if args.workers is not None and not fork_available():
+        print("Process pools need a platform that can fork, building the spec in this process", file=sys.stderr)
+
+    artifacts: Dict[SpecFormat, Path] = build_artifacts(app, Path(args.output), spec_formats, args.gzip, args.workers)
+    for artifact_path in artifacts.values():
+        print(f"Wrote {artifact_path}")
+
+    if args.pages is not None:
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+        page_paths: List[str] = write_pages(auto_md.rendered_spec(app).api_spec.to_dict(),
+                                            str(Path(args.output, "pages")),
+                                            PageFormat(args.pages),
+                                            args.workers)
+        print(f"Wrote {len(page_paths)} pages to {Path(args.output, 'pages')}")
+
+    return 0
+
+
+def vendor_assets_command(args: argparse.Namespace) -> int:
+    asset_path: Path
+    for asset_path in vendor_assets(args.output):
+        print(f"Wrote {asset_path}")
+
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="automd",
+                                                              description="AutoMD documentation tools")
+    # not required=True, which Python 3.6 doesn't support
+    subparsers = parser.add_subparsers(dest="command")
+
+    build_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "build",
+        help="Write the OpenAPI spec of an app to disk"
+    )
+    build_parser.add_argument("app", help='Import path of the Flask app, e.g. "automd_testapp.app:app"')
+    build_parser.add_argument("-o", "--output", default="automd_build", help="Output directory")
+    build_parser.add_argument("-f", "--format",
+                              action="append",
+                              choices=[spec_format.value for spec_format in SpecFormat],
+                              help="Format to write, can be repeated.  Defaults to all formats")
+    build_parser.add_argument("--gzip", action="store_true", help="Also write gzip compressed copies")
+    build_parser.add_argument("-w", "--workers",
+                              type=int,
+                              help="Build the operations of large apps in this many processes")
+    build_parser.add_argument("--pages",
+                              choices=[page_format.value for page_format in PageFormat],
+                              help="Also write static pages of the spec to a pages directory, one per tag plus an "
+                                   "index, in html or markdown (md), rendered in --workers processes")
+    build_parser.set_defaults(command_func=build_command)
+
+    vendor_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "vendor-assets",
+        help="Download the Redoc and Swagger UI assets, to serve them with AutoMDApp(serve_assets=True)"
+    )
+    vendor_parser.add_argument("-o", "--output",
+                               default=PACKAGE_ASSET_DIR,
+                               help="Output directory.  Defaults to the package's asset directory")
+    vendor_parser.set_defaults(command_func=vendor_assets_command)
+
+    args: argparse.Namespace = parser.parse_args(argv)
+    if args.command is None:
+        parser.error("a command is required")
+
+    return args.command_func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
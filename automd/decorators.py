@@ -1,9 +1,13 @@
 import inspect
 from inspect import Signature
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Mapping, Tuple, Type, Any
+from weakref import WeakKeyDictionary
 
+from marshmallow import fields
+
+from automd.endpoint_doc import EndpointDoc
+from automd.endpoint_registry import endpoint_registry
 from automd.keys import AutoMDKeys
-from automd.responses.responses import map_response_object_type
 
 
 def automd(parameter_schema: Dict = None,
@@ -19,30 +23,13 @@ def automd(parameter_schema: Dict = None,
     :return:
     """
     def automd_wrapper(func: Callable) -> Callable:
-        return_type = map_response_object_type(inspect.signature(func).return_annotation)
-
-        automd_spec_parameters = {}
-
-        if summary is not None:
-            automd_spec_parameters["summary"] = summary
-
-        if description is not None:
-            automd_spec_parameters["description"] = description
-
-        if tags is not None:
-            automd_spec_parameters["tags"] = tags
-
-        automd_spec_parameters["parameter_schema"] = parameter_schema
-
-        # TODO: use signature args as fallback for schema and default values,
-        #       and primary for return type, handle None return type
-        automd_spec_parameters["func_signature"] = inspect.signature(func)
-
-        automd_spec_parameters["response_schemas"] = {
-            200: return_type
-        }
-
-        setattr(func, AutoMDKeys.function.value, automd_spec_parameters)
+        # introspection of the function is deferred to the first spec build
+        setattr(func, AutoMDKeys.function.value, EndpointDoc(func,
+                                                             parameter_schema=parameter_schema,
+                                                             summary=summary,
+                                                             description=description,
+                                                             tags=tags))
+        endpoint_registry.register(func)
 
         return func
     return automd_wrapper
@@ -55,11 +42,59 @@ def disable_automd() -> Callable:
     """
     def automd_wrapper(func: Callable) -> Callable:
         setattr(func, AutoMDKeys.hide_function.value, True)
+        endpoint_registry.hide(func)
 
         return func
     return automd_wrapper
 
 
+def record_argument_locations(argmap: Mapping, location: str):
+    """
+    Record the location an argmap's fields are parsed from, for automd to document arguments declared with the
+    same fields.  Kept apart from the fields, which belong to the caller and may be shared between argmaps.
+    :param argmap: Dict of argument name to field
+    :param location: Location passed to use_args
+    """
+    field: fields.Field
+    for field in argmap.values():
+        argument_locations[field] = location
+
+
+def argument_location(field: fields.Field, default: str = "query") -> str:
+    """
+    Location of a documented argument: the one its field was last used with by use_args,
+    else the "location" of its metadata
+    :param field: Field of the argument
+    :param default: Location of fields neither used by use_args nor declaring one
+    :return: Location of the argument
+    """
+    if field in argument_locations:
+        return argument_locations[field]
+
+    return field.metadata.get("location", default)
+
+
+def parser_location_arguments(parser: Any) -> Tuple[bool, bool]:
+    """
+    Whether the use_args of a webargs parser takes a "location" argument (webargs 6+) and/or "locations" (earlier),
+    inspected once per parser class
+    :param parser: webargs parser
+    :return: Takes "location", takes "locations"
+    """
+    location_arguments: Tuple[bool, bool] = parser_signatures.get(type(parser))
+    if location_arguments is None:
+        flask_parser_signature: Signature = inspect.signature(parser.use_args)
+        location_arguments = ("location" in flask_parser_signature.parameters.keys(),
+                              "locations" in flask_parser_signature.parameters.keys())
+        parser_signatures[type(parser)] = location_arguments
+
+    return location_arguments
+
+
+parser_signatures: Dict[Type, Tuple[bool, bool]] = {}
+argument_locations: WeakKeyDictionary = WeakKeyDictionary()
+
+
 def override_webargs_flaskparser():
     import webargs.flaskparser as fp
 
@@ -71,8 +106,9 @@ def override_webargs_flaskparser():
                         validate=None,
                         error_status_code=None,
                         error_headers=None):
-        for arg in argmap.values():
-            arg.metadata["location"] = location
+        if isinstance(argmap, Mapping):
+            # automd documents arguments declared with the same fields at this location
+            record_argument_locations(argmap, location)
 
         parser_args: Dict = {
             "as_kwargs": as_kwargs,
@@ -81,10 +117,10 @@ def override_webargs_flaskparser():
             "error_headers": error_headers
         }
 
-        flask_parser_signature: Signature = inspect.signature(fp.parser.use_args)
-        if "location" in flask_parser_signature.parameters.keys():
+        takes_location, takes_locations = parser_location_arguments(fp.parser)
+        if takes_location:
             parser_args["location"] = location
-        if "locations" in flask_parser_signature.parameters.keys():
+        if takes_locations:
             parser_args["locations"] = [location]
 
         return fp.parser.use_args(argmap, req, *args,
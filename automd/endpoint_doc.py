@@ -0,0 +1,101 @@
+import inspect
+from inspect import Signature
+from typing import Callable, Dict, List, Iterator, Any, Mapping, Type
+
+from automd.responses import ResponseObjectInterface
+from automd.responses.responses import map_response_object_type, response_type_registry
+
+
+class EndpointDoc(Mapping):
+    """
+    Documentation metadata of an endpoint function, as recorded by the automd decorator.
+    Decorating only stores a reference to the function.  Introspection of its signature and return type
+    is deferred to the first time they are read (normally the first spec build), then kept.
+    Slotted, so the tens of thousands of records of a large app don't each carry an attribute dict.
+    Readable as the legacy metadata dict, with the optional entries present only when they were provided.
+    """
+    __slots__ = ("func", "parameter_schema", "summary", "description", "tags", "_func_signature", "_response_schemas",
+                 "_response_generation")
+
+    optional_keys: List[str] = ["summary", "description", "tags"]
+    introspected_keys: List[str] = ["parameter_schema", "func_signature", "response_schemas"]
+
+    def __init__(self,
+                 func: Callable,
+                 parameter_schema: Dict = None,
+                 summary: str = None,
+                 description: str = None,
+                 tags: List[str] = None):
+        """
+
+        :param func: Documented endpoint function
+        :param parameter_schema: same as get passed into use_kwargs
+        :param summary: Quick overview of the endpoint
+        :param description: Detailed information about the endpoint
+        :param tags: Controls which section the documentation is shown in
+        """
+        self.func: Callable = func
+        self.parameter_schema: Dict = parameter_schema
+        self.summary: str = summary
+        self.description: str = description
+        self.tags: List[str] = tags
+        self._func_signature: Signature = None
+        self._response_schemas: Dict[int, Type[ResponseObjectInterface]] = None
+        # registry generation the response schemas were resolved in, None when given rather than resolved
+        self._response_generation: int = None
+
+    @classmethod
+    def from_metadata(cls, func: Callable, metadata: Mapping) -> "EndpointDoc":
+        """
+        Return the EndpointDoc of a function's metadata, reading legacy metadata dicts into a new EndpointDoc
+        :param func: Documented endpoint function
+        :param metadata: Metadata attached to the function, an EndpointDoc or a legacy dict
+        :return: EndpointDoc of the metadata
+        """
+        if isinstance(metadata, EndpointDoc):
+            return metadata
+
+        endpoint_doc: EndpointDoc = cls(func,
+                                        parameter_schema=metadata.get("parameter_schema"),
+                                        summary=metadata.get("summary"),
+                                        description=metadata.get("description"),
+                                        tags=metadata.get("tags"))
+        endpoint_doc._func_signature = metadata.get("func_signature")
+        endpoint_doc._response_schemas = metadata.get("response_schemas")
+        return endpoint_doc
+
+    @property
+    def func_signature(self) -> Signature:
+        if self._func_signature is None:
+            self._func_signature = inspect.signature(self.func)
+
+        return self._func_signature
+
+    @property
+    def response_schemas(self) -> Dict[int, Type[ResponseObjectInterface]]:
+        if self._response_schemas is None or self._response_generation not in (None, response_type_registry.generation):
+            # TODO: use signature args as fallback for schema and default values,
+            #       and primary for return type, handle None return type
+            self._response_schemas = {
+                200: map_response_object_type(self.func_signature.return_annotation)
+            }
+            self._response_generation = response_type_registry.generation
+
+        return self._response_schemas
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.introspected_keys or (key in self.optional_keys and getattr(self, key) is not None):
+            return getattr(self, key)
+
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        key: str
+        for key in self.optional_keys:
+            if getattr(self, key) is not None:
+                yield key
+
+        yield from self.introspected_keys
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -0,0 +1,129 @@
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Type
+from weakref import WeakSet
+
+from automd.keys import AutoMDKeys
+
+FUNCTION_KEY: str = AutoMDKeys.function.value
+HIDE_FUNCTION_KEY: str = AutoMDKeys.hide_function.value
+
+
+class EndpointRegistry:
+    """
+    Registry of the functions decorated with automd or disable_automd, filled in at decoration time.
+    Spec discovery starts from the documented functions, looking up their endpoints in a ViewIndex,
+    so undocumented views cost nothing per build.
+    """
+    def __init__(self):
+        self.documented: WeakSet = WeakSet()
+        self.hidden: WeakSet = WeakSet()
+
+    def register(self, func: Callable):
+        """
+        Record a function decorated with automd
+        :param func: Documented function
+        """
+        self.documented.add(func)
+
+    def hide(self, func: Callable):
+        """
+        Record a function decorated with disable_automd
+        :param func: Hidden function
+        """
+        self.hidden.add(func)
+
+    def adopt(self, func: Callable):
+        """
+        Record a function carrying the documentation of another, e.g. a wrapper made with functools.wraps,
+        which copies the decorator's attributes without registering the copy
+        :param func: View function or handler
+        """
+        if hasattr(func, FUNCTION_KEY):
+            self.register(func)
+        if hasattr(func, HIDE_FUNCTION_KEY):
+            self.hide(func)
+
+    def is_documented(self, func: Callable) -> bool:
+        return func in self.documented
+
+    def is_hidden(self, func: Callable) -> bool:
+        return func in self.hidden
+
+    def has_documented_methods(self, view_class: Type, methods: Iterable[str]) -> bool:
+        """
+        Whether a class based view (e.g. a Flask-RESTful Resource) has a documented handler for any of its methods
+        :param view_class: Class of the view
+        :param methods: HTTP methods the view answers
+        :return: False if none of its handlers can be documented
+        """
+        return any(self.is_documented(getattr(view_class, method.lower(), None)) for method in methods)
+
+
+def view_handlers(view: Callable) -> List[Callable]:
+    """
+    Functions that may be documented for a view: the handler of each method of a class based view,
+    or the view function itself
+    """
+    if hasattr(view, "methods"):
+        return [handler for handler in (getattr(view.view_class, method.lower(), None) for method in view.methods)
+                if handler is not None]
+
+    return [view]
+
+
+class ViewIndex:
+    """
+    Endpoints of an app by the functions that may be documented for them.  Flask only ever appends view functions,
+    so the index is extended with the views added since it was last updated, and each view is indexed once.
+    A view reassigned or removed behind Flask's back re-indexes every view.
+    """
+    def __init__(self, view_functions: Dict[str, Callable], registry: EndpointRegistry):
+        """
+
+        :param view_functions: View functions of the app by endpoint name
+        :param registry: Registry of the documented functions
+        """
+        self.view_functions: Dict[str, Callable] = view_functions
+        self.registry: EndpointRegistry = registry
+        self.positions: Dict[str, int] = {}
+        self.endpoints: Dict[Callable, List[str]] = {}
+        self.views: Dict[str, Callable] = {}
+
+    def update(self):
+        # copied in one step, routes may be added by other threads while this one iterates
+        view_functions: Dict[str, Callable] = self.view_functions.copy()
+
+        name: str
+        view: Callable
+        if (len(view_functions) < len(self.views)
+                or any(view_functions.get(name) is not view for name, view in self.views.items())):
+            # views were reassigned or removed, which Flask itself never does
+            self.positions = {}
+            self.endpoints = {}
+            self.views = {}
+
+        for name, view in islice(view_functions.items(), len(self.views), None):
+            self.positions[name] = len(self.positions)
+            self.views[name] = view
+
+            handler: Callable
+            for handler in view_handlers(view):
+                self.registry.adopt(handler)
+                self.endpoints.setdefault(handler, []).append(name)
+
+    def documented_endpoints(self) -> Iterator[str]:
+        """
+        Endpoints with a documented function, found from the registry
+        :return: Endpoint names, in the order they were added to the app
+        """
+        self.update()
+
+        names: set = set()
+        func: Callable
+        for func in list(self.registry.documented):
+            names.update(self.endpoints.get(func, ()))
+
+        return iter(sorted(names, key=self.positions.__getitem__))
+
+
+endpoint_registry: EndpointRegistry = EndpointRegistry()
@@ -0,0 +1,15 @@
+from flask import current_app, request, abort, Response
+from flask_restful import Resource
+
+from automd.decorators import disable_automd
+from automd.keys import AutoMDKeys
+
+
+class AutoMDAsset(Resource):
+    @disable_automd()
+    def get(self, name: str) -> Response:
+        response: Response = current_app.config[AutoMDKeys.config.value].asset_bundle.response(name, request)
+        if response is None:
+            abort(404)
+
+        return response
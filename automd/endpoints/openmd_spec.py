@@ -1,12 +1,11 @@
 from typing import Dict
 
-from apispec import APISpec
 from flask import current_app
 from flask_restful import Resource
 
 from automd.decorators import automd
-from automd.automd import AutoMD
 from automd.keys import AutoMDKeys
+from automd.rendering import SpecFormat
 
 
 class OpenAPISpecJSON(Resource):
@@ -14,13 +13,7 @@ class OpenAPISpecJSON(Resource):
             description="Returns the OpenAPI Spec in JSON format",
             tags=["AutoMD"])
     def get(self) -> Dict:
-        auto_app: AutoMD = current_app.config[AutoMDKeys.config.value].auto_md
-
-        automd_spec: APISpec = auto_app.application_to_apispec(current_app)
-
-        ret: Dict = automd_spec.to_dict()
-
-        return ret
+        return current_app.config[AutoMDKeys.config.value].spec_response(SpecFormat.json)
 
 
 class OpenAPISpecYAML(Resource):
@@ -28,10 +21,4 @@ class OpenAPISpecYAML(Resource):
             description="Returns the OpenAPI Spec in Yaml format",
             tags=["AutoMD"])
     def get(self) -> str:
-        auto_app: AutoMD = current_app.config[AutoMDKeys.config.value].auto_md
-
-        automd_spec: APISpec = auto_app.application_to_apispec(current_app)
-
-        ret: str = automd_spec.to_yaml()
-
-        return ret
+        return current_app.config[AutoMDKeys.config.value].spec_response(SpecFormat.yaml)
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import re
+from typing import Dict, Any, Tuple, Set
+from weakref import WeakKeyDictionary
+
+from apispec import APISpec
+from apispec.exceptions import DuplicateComponentNameError
+
+REF_PREFIX: str = "#/components/schemas/"
+
+
+def schema_key(schema: Dict) -> str:
+    """
+    Structural key of a schema definition, equal for identical definitions whatever their key order
+    :param schema: OpenAPI schema object
+    :return: Canonical JSON of the schema
+    """
+    return json.dumps(schema, sort_keys=True, default=str)
+
+
+def component_name(schema: Dict, suffix: str, schema_class: type = None) -> str:
+    """
+    Name of a component schema that may be shared by operations, independent of the operation that registers it
+    first: after its marshmallow schema class, e.g. "ItemRequestBody" for ItemSchema, or else after its structure,
+    e.g. "RequestBody1a2b3c4d", so an identical schema gets the same name in every operation.
+    :param schema: OpenAPI schema object
+    :param suffix: What the schema describes
+    :param schema_class: Marshmallow schema class the schema was converted from, if any
+    :return: Component name
+    """
+    if schema_class is not None:
+        return f"{re.sub(r'Schema$', '', schema_class.__name__)}{suffix}"
+
+    return f"{suffix}{hashlib.sha1(schema_key(schema).encode('utf-8')).hexdigest()[:8]}"
+
+
+class OperationFragment:
+    """
+    Finished OpenAPI operation of a single path and verb, along with the component schemas it references.
+    Independent of any APISpec, so it can be merged into any number of specs.  The operation is shared by every
+    spec it is merged into, so it must not be mutated.
+    """
+    def __init__(self, operation: Dict, schemas: Dict[str, Dict]):
+        """
+
+        :param operation: OpenAPI operation object, with schemas resolved to references
+        :param schemas: Component schemas referenced by the operation, by name
+        """
+        self.operation: Dict = operation
+        self.schemas: Dict[str, Dict] = schemas
+        # computed once per built operation, merges into every later spec reuse them
+        self.schema_keys: Dict[str, str] = {name: schema_key(schema) for name, schema in schemas.items()}
+        # operation with its references renamed by the last merge, rebuilds rename them the same way
+        self.renamed_operation: Tuple[Dict[str, str], Dict] = None
+
+
+class SchemaIndex:
+    """
+    Names of the component schemas registered to an APISpec, by structural key
+    """
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.registered_names: Set[str] = set()
+
+    def sync(self, api_spec: APISpec):
+        """
+        Index schemas registered to the APISpec other than by merges, e.g. directly through apispec.
+        Reads the whole spec, so it is only done for a new spec and when a merge runs into an unindexed name.
+        :param api_spec: APISpec the index belongs to
+        """
+        registered_schemas: Dict[str, Dict] = api_spec.to_dict().get("components", {}).get("schemas", {})
+
+        name: str
+        for name, schema in registered_schemas.items():
+            if name not in self.registered_names:
+                self.names.setdefault(schema_key(schema), name)
+                self.registered_names.add(name)
+
+
+schema_indexes: "WeakKeyDictionary[APISpec, SchemaIndex]" = WeakKeyDictionary()
+
+
+def rename_refs(obj: Any, renames: Dict[str, str]) -> Any:
+    """
+    Copy of a (nested) OpenAPI object with its schema references renamed
+    :param obj: OpenAPI object
+    :param renames: New schema names, by old schema name
+    :return: Copy of the object referencing the new names
+    """
+    if isinstance(obj, dict):
+        ref: str = obj.get("$ref")
+        if isinstance(ref, str) and ref.startswith(REF_PREFIX) and ref[len(REF_PREFIX):] in renames:
+            return {**obj, "$ref": f"{REF_PREFIX}{renames[ref[len(REF_PREFIX):]]}"}
+        return {key: rename_refs(value, renames) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [rename_refs(value, renames) for value in obj]
+
+    return obj
+
+
+def merge_fragment(api_spec: APISpec, path_url: str, http_verb: str, fragment: OperationFragment) -> APISpec:
+    """
+    Add an operation fragment to an APISpec (passed in APISpec object is mutated).
+    Component schemas are deduplicated by structure: a schema identical to one already registered, under any name,
+    is referenced by that name instead of being registered again.  A different definition under a taken name is
+    registered under a numbered name, the way apispec names them.
+    :param api_spec: APISpec to add the operation to
+    :param path_url: url of the path
+    :param http_verb: HTTP verb of the operation
+    :param fragment: Operation to add
+    :return: The same APISpec object passed in, now with the operation added
+    """
+    schema_index: SchemaIndex = schema_indexes.get(api_spec)
+    if schema_index is None:
+        schema_index = schema_indexes[api_spec] = SchemaIndex()
+        schema_index.sync(api_spec)
+
+    renames: Dict[str, str] = {}
+    new_schemas: Dict[str, Dict] = {}
+    new_names: Dict[str, str] = {}
+    name: str
+    for name, schema in fragment.schemas.items():
+        key: str = fragment.schema_keys[name]
+        if renames and REF_PREFIX in key:
+            # nested schemas come first, their new names change the structure of the schemas referencing them
+            schema = rename_refs(schema, renames)
+            key = schema_key(schema)
+
+        registered_name: str = schema_index.names.get(key, new_names.get(key))
+        if registered_name is None:
+            registered_name = name
+            counter: int = 0
+            while registered_name in schema_index.registered_names or registered_name in new_schemas:
+                counter += 1
+                registered_name = f"{name}{counter}"
+
+            new_schemas[registered_name] = schema
+            new_names[key] = registered_name
+
+        if registered_name != name:
+            renames[name] = registered_name
+
+    operation: Dict = fragment.operation
+    if renames:
+        if fragment.renamed_operation is None or fragment.renamed_operation[0] != renames:
+            fragment.renamed_operation = (renames, rename_refs(operation, renames))
+        operation = fragment.renamed_operation[1]
+        new_schemas = {name: rename_refs(schema, renames) for name, schema in new_schemas.items()}
+
+    try:
+        for key, name in new_names.items():
+            api_spec.components.schema(name, component=new_schemas[name])
+            schema_index.names[key] = name
+            schema_index.registered_names.add(name)
+    except DuplicateComponentNameError:
+        # registered directly through apispec since the spec was indexed, merge again against the registered schemas
+        schema_index.sync(api_spec)
+        return merge_fragment(api_spec, path_url, http_verb, fragment)
+
+    # Relies on the private APISpec._paths of apispec 3 (pinned in setup.py): the operation is already resolved and
+    # cleaned, so it is set directly instead of going through APISpec.path, which copies it and runs every helper
+    api_spec._paths.setdefault(path_url, {})[http_verb.lower()] = operation
+
+    return api_spec
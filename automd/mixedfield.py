@@ -1,49 +1,215 @@
-from typing import Iterable, Dict, Any
+import numbers
+from collections.abc import Mapping
+from typing import Iterable, Dict, Any, List, Callable, Type, Tuple
 
 from marshmallow import ValidationError, fields
 from marshmallow.fields import Field
 
+# Container types no number field can convert
+NON_NUMBER_TYPES: tuple = (list, tuple, dict, set, frozenset)
+
+# Candidate fields of a value type, in the order to try them, and the values each converted
+CandidateOrder = Tuple[Tuple[Field, ...], Tuple[int, ...]]
+
+
+def accepts_any(field: Field, value_type: Type) -> bool:
+    return False
+
+
+def rejects_non_string(field: Field, value_type: Type) -> bool:
+    return not issubclass(value_type, (str, bytes))
+
+
+def rejects_non_number(field: Field, value_type: Type) -> bool:
+    if getattr(field, "strict", False) and not issubclass(value_type, numbers.Integral):
+        return True
+
+    return value_type is bool or value_type in NON_NUMBER_TYPES
+
+
+def rejects_non_collection(field: Field, value_type: Type) -> bool:
+    return (not hasattr(value_type, "__iter__")
+            or hasattr(value_type, "strip")
+            or issubclass(value_type, Mapping))
+
+
+def rejects_non_mapping(field: Field, value_type: Type) -> bool:
+    return not issubclass(value_type, Mapping)
+
+
+def rejects_number_containers(field: Field, value_type: Type) -> bool:
+    return value_type in NON_NUMBER_TYPES
+
+
+def rejects_non_iterable(field: Field, value_type: Type) -> bool:
+    return value_type is not type(None) and not hasattr(value_type, "__iter__")
+
+
+def rejects_non_items(field: Field, value_type: Type) -> bool:
+    # without key and value fields the value is converted by the mapping type, which depends on the value
+    return ((field.key_field is not None or field.value_field is not None)
+            and value_type is not type(None)
+            and not hasattr(value_type, "items"))
+
+
+# Checks of the value types a field always fails to deserialize or serialize, whatever the value.
+# Only exact field classes are listed, subclasses may override how values are converted.
+deserialize_rejections: Dict[Type[Field], Callable[[Field, Type], bool]] = {
+    fields.String: rejects_non_string,
+    fields.Number: rejects_non_number,
+    fields.Integer: rejects_non_number,
+    fields.Float: rejects_non_number,
+    fields.List: rejects_non_collection,
+    fields.Dict: rejects_non_mapping,
+    fields.Mapping: rejects_non_mapping
+}
+
+serialize_rejections: Dict[Type[Field], Callable[[Field, Type], bool]] = {
+    fields.Number: rejects_number_containers,
+    fields.Integer: rejects_number_containers,
+    fields.Float: rejects_number_containers,
+    fields.List: rejects_non_iterable,
+    fields.Dict: rejects_non_items,
+    fields.Mapping: rejects_non_items
+}
+
+rejections: Dict[str, Dict[Type[Field], Callable[[Field, Type], bool]]] = {
+    "serialize": serialize_rejections,
+    "deserialize": deserialize_rejections
+}
+
+
+def rejects_unconvertible_number(field: Field, value: Any) -> bool:
+    # the conversion number fields validate with, without building the ValidationError they raise on failure
+    try:
+        field.num_type(value)
+    except (TypeError, ValueError, OverflowError):
+        return True
+
+    return False
+
+
+# Checks of values a field fails to convert, far cheaper than the exception the field raises for them
+value_rejections: Dict[str, Dict[Type[Field], Callable[[Field, Any], bool]]] = {
+    "serialize": {
+        fields.Number: rejects_unconvertible_number,
+        fields.Integer: rejects_unconvertible_number,
+        fields.Float: rejects_unconvertible_number
+    },
+    "deserialize": {
+        fields.Number: rejects_unconvertible_number,
+        fields.Integer: rejects_unconvertible_number,
+        fields.Float: rejects_unconvertible_number
+    }
+}
+
 
 class MixedField(Field):
-    def __init__(self, field_types: Iterable[Field], *args, **kwargs):
+    def __init__(self, field_types: Iterable[Field], *args, adaptive_order: bool = False, **kwargs):
+        """
+
+        :param field_types: Fields to try for each value, the first one converting it is used
+        :param adaptive_order: Try the fields that converted the most values of a type first, instead of in the
+                               order given.  Faster when one type dominates, but when several fields can convert
+                               the same value the field used can differ from the first one given.
+        """
         super().__init__(*args, **kwargs)
-        self.field_types: Iterable[Field] = field_types
+        self.field_types: List[Field] = list(field_types)
+        self.adaptive_order: bool = adaptive_order
+        # candidate fields by exact value type, built on the first value of each type, per direction, with the
+        # conversions by each candidate when adaptive_order is set.  Entries are replaced, never changed in place,
+        # so values converted concurrently always see candidates matching their counts.
+        self._dispatch: Dict[str, Dict[Type, CandidateOrder]] = {direction: {} for direction in rejections}
+        self.dispatch_stats: Dict[str, int] = {"hits": 0, "misses": 0, "skipped": 0}
 
-    def _serialize(self, value, attr, obj, **kwargs):
-        result: Any = None
-        found_type: bool = False
+    def candidates(self, direction: str, value_type: Type) -> Tuple[Field, ...]:
+        """
+        Fields that may convert values of a type, leaving out the fields that always fail on it
+        :param direction: "serialize" or "deserialize"
+        :param value_type: Exact type of the value
+        :return: Candidate fields, in the order to try them
+        """
+        order: CandidateOrder = self._dispatch[direction].get(value_type)
+        if order is None:
+            direction_rejections: Dict[Type[Field], Callable[[Field, Type], bool]] = rejections[direction]
+            candidates: Tuple[Field, ...] = tuple(
+                field for field in self.field_types
+                if not direction_rejections.get(type(field), accepts_any)(field, value_type))
+            # a concurrent first value of the type may have stored its order already, which is kept
+            order = self._dispatch[direction].setdefault(value_type, (candidates, (0,) * len(candidates)))
 
-        for field_type in self.field_types:
-            try:
-                result = field_type._serialize(value, attr, obj, **kwargs)
-                found_type = True
-                break
-            except Exception:
-                # could not parse, trying next field_type
-                pass
-        if not found_type:
-            message: str = (f"Value {value} could not be serialized by Mixed Field using"
-                            f" types {[type(field).__name__ for field in self.field_types]}")
-            raise ValidationError(message)
-        return result
+        return order[0]
 
-    def _deserialize(self, value, attr, data, **kwargs):
-        result: Any = None
-        found_type: bool = False
+    def record_success(self, direction: str, value_type: Type, field: Field):
+        """
+        Move a candidate that converted a value ahead of the candidates that converted fewer values of its type.
+        The reordered candidates replace the previous ones in a single assignment, so a conversion counted
+        concurrently may be lost, but the candidates and their counts never go out of step.
+        :param direction: "serialize" or "deserialize"
+        :param value_type: Exact type of the value converted
+        :param field: Candidate that converted it
+        """
+        candidates: Tuple[Field, ...]
+        successes: Tuple[int, ...]
+        candidates, successes = self._dispatch[direction][value_type]
+
+        # the candidate is looked up again, as the order may have changed since the value was converted
+        index: int = candidates.index(field)
+        new_candidates: List[Field] = list(candidates)
+        new_successes: List[int] = list(successes)
+
+        new_successes[index] += 1
+        while index > 0 and new_successes[index - 1] < new_successes[index]:
+            new_candidates[index - 1], new_candidates[index] = new_candidates[index], new_candidates[index - 1]
+            new_successes[index - 1], new_successes[index] = new_successes[index], new_successes[index - 1]
+            index -= 1
+
+        self._dispatch[direction][value_type] = (tuple(new_candidates), tuple(new_successes))
+
+    def convert(self, direction: str, convert_func: Callable[[Field], Any], value: Any) -> Any:
+        """
+        Convert a value with the first candidate field that accepts it
+        :param direction: "serialize" or "deserialize"
+        :param convert_func: Conversion of the value by a field
+        :param value: Value to convert
+        :return: Converted value
+        :raises ValidationError: No field converted the value
+        """
+        value_type: Type = type(value)
+        candidates: Tuple[Field, ...] = self.candidates(direction, value_type)
+        self.dispatch_stats["skipped"] += len(self.field_types) - len(candidates)
+        direction_value_rejections: Dict[Type[Field], Callable[[Field, Any], bool]] = value_rejections[direction]
+
+        field_type: Field
+        for field_type in candidates:
+            value_rejection: Callable[[Field, Any], bool] = direction_value_rejections.get(type(field_type))
+            if value_rejection is not None and value is not None and value_rejection(field_type, value):
+                self.dispatch_stats["skipped"] += 1
+                continue
 
-        for field_type in self.field_types:
             try:
-                result = field_type._deserialize(value, attr, data, **kwargs)
-                found_type = True
-                break
+                result: Any = convert_func(field_type)
             except Exception:
                 # could not parse, trying next field_type
-                pass
-        if not found_type:
-            message: str = (f"Value {value} could not be deserialized by Mixed Field using"
-                            f" types {[type(field).__name__ for field in self.field_types]}")
-            raise ValidationError(message)
-        return result
+                self.dispatch_stats["misses"] += 1
+                continue
+
+            self.dispatch_stats["hits"] += 1
+            if self.adaptive_order:
+                self.record_success(direction, value_type, field_type)
+            return result
+
+        message: str = (f"Value {value} could not be {direction}d by Mixed Field using"
+                        f" types {[type(field).__name__ for field in self.field_types]}")
+        raise ValidationError(message)
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        return self.convert("serialize", lambda field_type: field_type._serialize(value, attr, obj, **kwargs), value)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return self.convert("deserialize",
+                            lambda field_type: field_type._deserialize(value, attr, data, **kwargs),
+                            value)
 
 
 # Based on implementation from
@@ -0,0 +1,67 @@
+import multiprocessing
+from typing import List, Tuple, Iterator, Dict, TYPE_CHECKING
+
+from automd.fragments import OperationFragment
+
+if TYPE_CHECKING:
+    from automd.automd import AutoMD
+
+EndpointFragments = Tuple[str, List[Tuple[str, str, OperationFragment]]]
+
+# AutoMD instance of the pool a worker process belongs to and the operations to build, set in the worker only
+worker_state: Tuple["AutoMD", Dict[str, List[Tuple]]] = None
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def init_worker(auto_md: "AutoMD", operations: Dict[str, List[Tuple]]):
+    """
+    Initialize a forked worker process with the operations it builds, inherited from the parent rather than pickled
+    :param auto_md: AutoMD instance documenting the app
+    :param operations: Arguments of operation_fragment of each operation, by endpoint name
+    """
+    global worker_state
+    worker_state = (auto_md, operations)
+
+
+def build_shard(names: List[str]) -> List[EndpointFragments]:
+    """
+    Build the operations of a shard of endpoints, in a worker process
+    :param names: Endpoint names of the shard
+    :return: (endpoint name, operations) of each endpoint of the shard, in shard order
+    """
+    auto_md, operations = worker_state
+
+    return [(name, [(operation_arguments[1], operation_arguments[2], auto_md.operation_fragment(*operation_arguments))
+                    for operation_arguments in operations[name]])
+            for name in names]
+
+
+def build_shards_in_pool(auto_md: "AutoMD",
+                         shards: List[List[str]],
+                         workers: int,
+                         operations: Dict[str, List[Tuple]]) -> Iterator[EndpointFragments]:
+    """
+    Build the operations of the shards of an app's endpoints in a pool of forked processes, which share the
+    already imported app.  Meant for offline builds (`automd build --workers`) only: forking a process running
+    other threads, like a server, can leave the workers deadlocked on locks held by those threads.
+    :param auto_md: AutoMD instance documenting the app
+    :param shards: Endpoint names of each shard
+    :param workers: Number of processes
+    :param operations: Arguments of operation_fragment of each operation, by endpoint name, see
+                       AutoMD.endpoint_operation_arguments.  Inherited by the workers, as they hold functions that
+                       can't be pickled, so the parent caches the built operations under these same arguments.
+    :return: Iterator of (endpoint name, operations), in shard order
+    :raises ValueError: The platform can't fork
+    """
+    if not fork_available():
+        raise ValueError("Parallel spec builds need a platform that can fork")
+
+    with multiprocessing.get_context("fork").Pool(processes=workers,
+                                                  initializer=init_worker,
+                                                  initargs=(auto_md, operations)) as pool:
+        shard_fragments: List[EndpointFragments]
+        for shard_fragments in pool.imap(build_shard, shards):
+            yield from shard_fragments
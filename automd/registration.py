@@ -1,14 +1,25 @@
+import os
+import threading
 from enum import Enum
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional, Callable, Union, FrozenSet
 
+from flask import Flask, Response, current_app, request, send_from_directory
 from flask_restful import Api
 
+from automd.assets import AssetBundle, PACKAGE_ASSET_DIR
 from automd.automd import AutoMD
 from automd.encoder import AutoMDObjEncoder
+from automd.endpoints.openmd_assets import AutoMDAsset
 from automd.endpoints.openmd_html import AutoMDHTML
 from automd.endpoints.openmd_spec import OpenAPISpecJSON, OpenAPISpecYAML
 from automd.http_verbs import HTTPVerb
 from automd.keys import AutoMDKeys
+from automd.responses.responses import response_type_registry
+from automd.shared_cache import SharedSpecCache, MappedSpec, spec_version
+from automd.rendering import (RenderedSpec, RenderedBody, SpecFormat, spec_artifact_names, spec_format_mimetypes,
+                              content_encoding_suffixes)
+from automd.templates.openapi import (generate_redoc_shell, generate_swagger_ui_shell, REDOC_SHELL_ASSETS,
+                                      SWAGGER_UI_SHELL_ASSETS)
 
 
 class AutoMDSpecRoute(Enum):
@@ -18,6 +29,29 @@ class AutoMDSpecRoute(Enum):
     yaml = "yaml"
 
 
+class AutoMDHTMLMode(Enum):
+    inline = "inline"
+    redoc_shell = "redoc_shell"
+    swagger_ui_shell = "swagger_ui_shell"
+
+
+html_shell_generators: Dict[AutoMDHTMLMode, Callable[[str, Optional[Dict[str, str]]], str]] = {
+    AutoMDHTMLMode.redoc_shell: generate_redoc_shell,
+    AutoMDHTMLMode.swagger_ui_shell: generate_swagger_ui_shell
+}
+
+html_shell_assets: Dict[AutoMDHTMLMode, Tuple[str, ...]] = {
+    AutoMDHTMLMode.redoc_shell: REDOC_SHELL_ASSETS,
+    AutoMDHTMLMode.swagger_ui_shell: SWAGGER_UI_SHELL_ASSETS
+}
+
+
+class AutoMDBuildMode(Enum):
+    lazy = "lazy"
+    eager = "eager"
+    background = "background"
+
+
 class AutoMDApp:
     def __init__(
             self,
@@ -30,7 +64,18 @@ class AutoMDApp:
             path_override: str = None,
             spec_routes: Tuple = (AutoMDSpecRoute.html, AutoMDSpecRoute.yaml, AutoMDSpecRoute.json),
             always_document: bool = False,
-            documented_verbs: Tuple = (HTTPVerb.get, HTTPVerb.post, HTTPVerb.put, HTTPVerb.delete, HTTPVerb.patch)
+            documented_verbs: Tuple = (HTTPVerb.get, HTTPVerb.post, HTTPVerb.put, HTTPVerb.delete, HTTPVerb.patch),
+            build_mode: AutoMDBuildMode = AutoMDBuildMode.lazy,
+            wait_for_build: bool = True,
+            retry_after: int = 5,
+            prebuilt_path: str = None,
+            shared_cache_dir: str = None,
+            shared_cache_version: str = None,
+            stream_specs: bool = False,
+            html_mode: AutoMDHTMLMode = AutoMDHTMLMode.inline,
+            html_max_age: int = 7 * 24 * 60 * 60,
+            serve_assets: bool = False,
+            asset_dir: str = None
     ):
         """
         Configures OpenAPI documentation generator for the FlaskRESTful application.
@@ -50,6 +95,33 @@ class AutoMDApp:
                             AutoMDSpecRoute enums
         :param always_document: Apply basic documentation to all endpoints, even if undecorated.
         :param documented_verbs: Tuple of what HTTP Verbs to document.  Defaults to GET, POST, PUT, DELETE, PATCH
+        :param build_mode: When start_build is called, build the spec synchronously (eager), in a background
+                           thread (background), or not at all, leaving it to the first documentation request (lazy).
+        :param wait_for_build: Documentation requests arriving while a build started by start_build is running
+                               wait for it to finish.  If False, they get a 503 response instead.
+        :param retry_after: Seconds sent in the Retry-After header of 503 responses when not waiting for the build.
+        :param prebuilt_path: Directory of spec files written by `automd build`.  When set, the documentation
+                              routes serve those files as-is and the spec is never built by the app.
+        :param shared_cache_dir: Directory to share the built spec through, between every process serving the app
+                                 on a host.  The first process to need the spec builds it and writes it there,
+                                 then every process serves it from memory maps of the same files.
+        :param shared_cache_version: Included in the shared spec version, e.g. the deployed commit.  Without it,
+                                     a new shared spec is only built when the routes, AutoMD options or the
+                                     introspected documentation of the operations change.
+        :param stream_specs: Serialize the spec while sending it instead of rendering each format whole and keeping
+                             it in memory, bounding memory for very large specs.  Streamed responses have no ETag
+                             and are not compressed.  Not used with shared_cache_dir, which serves memory maps.
+        :param html_mode: Serve the HTML documentation with the spec embedded (inline), or as a small static page
+                          loading the spec from the JSON route with Redoc (redoc_shell) or Swagger UI
+                          (swagger_ui_shell).  Shell pages are cached by browsers apart from the spec.
+        :param html_max_age: Seconds browsers may cache shell pages for, without revalidating them.  Not used with
+                             serve_assets, shell pages then reference assets that only exist until the next deploy
+                             and are revalidated on every request instead.
+        :param serve_assets: Serve the Redoc or Swagger UI assets of shell pages from the app, under content hashed
+                             names cached as immutable, instead of loading them from CDNs.  The pages then make no
+                             external requests, for hosts without internet access.
+        :param asset_dir: Directory of the assets served with serve_assets, as written by `automd vendor-assets`.
+                          Defaults to the assets shipped in the package.
         """
         self.app_api: Api = app_api
         self.app_api.app.config[AutoMDKeys.config.value] = self
@@ -63,13 +135,210 @@ class AutoMDApp:
                                       always_document=always_document,
                                       documented_verbs=documented_verbs)
 
+        self.build_mode: AutoMDBuildMode = build_mode
+        self.wait_for_build: bool = wait_for_build
+        self.retry_after: int = retry_after
+        self.stream_specs: bool = stream_specs
+        self._spec_built: threading.Event = threading.Event()
+        self._spec_built.set()
+        self.prebuilt_path: Optional[str] = None if prebuilt_path is None else os.path.abspath(prebuilt_path)
+        self.shared_cache: Optional[SharedSpecCache] = (None if shared_cache_dir is None
+                                                        else SharedSpecCache(shared_cache_dir))
+        self.shared_cache_version: Optional[str] = shared_cache_version
+        self._mapped_specs: Dict[Tuple[FrozenSet, int], Union[RenderedSpec, MappedSpec]] = {}
+        self._mapped_lock: threading.Lock = threading.Lock()
+
         endpoint_prefix: str = "automd"
         url: str = f"/{endpoint_prefix}" if path_override is None else path_override
 
         spec_routes = () if spec_routes is None else spec_routes
+        self.html_mode: AutoMDHTMLMode = html_mode
+        self.html_max_age: int = html_max_age
+        self.html_shell: Optional[RenderedBody] = None
+        self.asset_bundle: Optional[AssetBundle] = None
+        if html_mode != AutoMDHTMLMode.inline and AutoMDSpecRoute.html in spec_routes:
+            if AutoMDSpecRoute.json not in spec_routes:
+                raise ValueError(f"HTML mode {html_mode.value} loads the spec from the JSON route, "
+                                 f"which is not in spec_routes")
+
+            asset_urls: Optional[Dict[str, str]] = None
+            if serve_assets:
+                self.asset_bundle = AssetBundle(asset_dir or PACKAGE_ASSET_DIR, html_shell_assets[html_mode])
+                asset_urls = self.asset_bundle.urls("assets")
+
+            # relative to the HTML route, so the page works wherever the app is mounted
+            self.html_shell = RenderedBody(html_shell_generators[html_mode]("spec/json", asset_urls).encode("utf-8"),
+                                           spec_format_mimetypes[SpecFormat.html])
+        elif serve_assets:
+            raise ValueError("serve_assets serves the assets of shell pages, "
+                             "set html_mode to a shell mode with the html route in spec_routes")
+
+        # formats of the spec rendered when building it, shell pages don't need the spec
+        self.spec_formats: Tuple[SpecFormat] = tuple(SpecFormat(route.value) for route in spec_routes
+                                                     if route != AutoMDSpecRoute.html or self.html_shell is None)
         if AutoMDSpecRoute.json in spec_routes:
             app_api.add_resource(OpenAPISpecJSON, f"{url}/spec/json", endpoint=f"OpenAPISpecJSON_{endpoint_prefix}")
         if AutoMDSpecRoute.yaml in spec_routes or AutoMDSpecRoute.yml in spec_routes:
             app_api.add_resource(OpenAPISpecYAML, f"{url}/spec/yaml", endpoint=f"OpenAPISpecYAML_{endpoint_prefix}")
         if AutoMDSpecRoute.html in spec_routes:
             app_api.add_resource(AutoMDHTML, f"{url}/html", endpoint=f"OpenAPIHTML_{endpoint_prefix}")
+        if self.asset_bundle is not None:
+            app_api.add_resource(AutoMDAsset, f"{url}/assets/<string:name>", endpoint=f"AutoMDAsset_{endpoint_prefix}")
+
+        self.hook_route_registration()
+
+    def hook_route_registration(self):
+        """
+        Wrap the app's add_url_rule, so routes added after the spec is built extend it instead of rebuilding it.
+        Api.add_resource and app.route both register their routes through add_url_rule.
+        """
+        app: Flask = self.app_api.app
+        add_url_rule: Callable = app.add_url_rule
+
+        def automd_add_url_rule(rule: str, endpoint: str = None, view_func: Callable = None, **options):
+            add_url_rule(rule, endpoint, view_func, **options)
+
+            # same endpoint naming as Flask.add_url_rule
+            endpoint = endpoint or view_func.__name__
+            self.auto_md.endpoint_added(app, endpoint)
+
+        app.add_url_rule = automd_add_url_rule
+
+    def start_build(self) -> Optional[threading.Thread]:
+        """
+        Build the spec ahead of the first documentation request, as configured by build_mode.
+        Call once all resources are registered.
+        :return: The build thread in background mode, None otherwise
+        """
+        if self.build_mode == AutoMDBuildMode.lazy or self.prebuilt_path is not None:
+            return None
+
+        self._spec_built.clear()
+
+        if self.build_mode == AutoMDBuildMode.eager:
+            self.build_spec()
+            return None
+
+        build_thread: threading.Thread = threading.Thread(target=self.build_spec, name="automd-build", daemon=True)
+        build_thread.start()
+
+        return build_thread
+
+    def build_spec(self):
+        """
+        Build the spec and render every served format, outside of a documentation request
+        """
+        app: Flask = self.app_api.app
+        try:
+            with app.app_context():
+                spec: Union[RenderedSpec, MappedSpec] = self.current_spec()
+
+                if not self.streamed():
+                    spec_format: SpecFormat
+                    for spec_format in self.spec_formats:
+                        spec.body(spec_format)
+        finally:
+            self._spec_built.set()
+
+    def wait_for_started_build(self):
+        """
+        Block until a build started by start_build has finished, if one is running
+        """
+        self._spec_built.wait()
+
+    def spec_response(self, spec_format: SpecFormat) -> Response:
+        """
+        Response serving the spec in the given format for the current request
+        :param spec_format: Format to serve
+        :return: Response with the rendered spec, or a 503 if the spec is still building and not waiting for it
+        """
+        if self.prebuilt_path is not None:
+            return self.prebuilt_response(spec_format)
+
+        if not self._spec_built.is_set():
+            if not self.wait_for_build:
+                response: Response = Response("AutoMD documentation is being built", status=503, mimetype="text/plain")
+                response.headers["Retry-After"] = str(self.retry_after)
+                return response
+
+            self._spec_built.wait()
+
+        if self.streamed():
+            return Response(self.current_spec().stream(spec_format), mimetype=spec_format_mimetypes[spec_format])
+
+        return self.current_spec().body(spec_format).to_response(request)
+
+    def html_response(self) -> Response:
+        """
+        Response serving the HTML documentation for the current request, as configured by html_mode
+        :return: Response with the shell page, or the spec rendered to HTML
+        """
+        if self.html_shell is None:
+            return self.spec_response(SpecFormat.html)
+
+        response: Response = self.html_shell.to_response(request)
+        response.cache_control.public = True
+        if self.asset_bundle is None:
+            response.cache_control.max_age = self.html_max_age
+        else:
+            # revalidated through its ETag, a shell cached across a deploy would load assets that are gone
+            response.cache_control.no_cache = True
+
+        return response
+
+    def streamed(self) -> bool:
+        return self.stream_specs and self.shared_cache is None
+
+    def current_spec(self) -> Union[RenderedSpec, MappedSpec]:
+        """
+        The built spec of the current app, mapped from the shared cache when one is configured
+        :return: Spec holding the serialized documents
+        """
+        if self.shared_cache is None:
+            return self.auto_md.rendered_spec(current_app)
+
+        # response types registered since change the documentation, and the version with it
+        state: Tuple[FrozenSet, int] = (self.auto_md.route_fingerprint(current_app), response_type_registry.generation)
+
+        mapped: Union[RenderedSpec, MappedSpec] = self._mapped_specs.get(state)
+        if mapped is None:
+            with self._mapped_lock:
+                mapped = self._mapped_specs.get(state)
+                if mapped is None:
+                    version: str = spec_version(current_app, self.auto_md, self.shared_cache_version)
+                    mapped = self.shared_cache.load(version, self.build_shared_spec, self.spec_formats)
+                    self._mapped_specs = {state: mapped}
+
+        return mapped
+
+    def build_shared_spec(self) -> RenderedSpec:
+        rendered: RenderedSpec = self.auto_md.rendered_spec(current_app)
+
+        # served from the shared cache files from here on, so this process does not keep its own copy
+        self.auto_md.invalidate_spec_cache()
+
+        return rendered
+
+    def prebuilt_response(self, spec_format: SpecFormat) -> Response:
+        """
+        Response serving the prebuilt spec file of the given format, preferring its gzip copy when accepted.
+        Served as a file response, so the WSGI server can use sendfile, and conditional and Range requests
+        are handled.
+        :param spec_format: Format to serve
+        :return: File response of the spec file
+        """
+        filename: str = spec_artifact_names[spec_format]
+        mimetype: str = spec_format_mimetypes[spec_format]
+
+        response: Response
+        gzip_filename: str = f"{filename}{content_encoding_suffixes['gzip']}"
+        if (request.accept_encodings.best_match(["gzip"]) == "gzip"
+                and os.path.isfile(os.path.join(self.prebuilt_path, gzip_filename))):
+            response = send_from_directory(self.prebuilt_path, gzip_filename, mimetype=mimetype, conditional=True)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = send_from_directory(self.prebuilt_path, filename, mimetype=mimetype, conditional=True)
+
+        response.vary.add("Accept-Encoding")
+
+        return response
@@ -0,0 +1,334 @@
+import gzip
+import hashlib
+import io
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Callable, List, Iterator, Sized, Any
+
+from apispec import APISpec
+from apispec.yaml_utils import YAMLDumper
+from flask import Request, Response
+from yaml.events import DocumentStartEvent, DocumentEndEvent, MappingStartEvent, MappingEndEvent
+from yaml.nodes import Node
+
+from automd.encoder import AutoMDObjEncoder
+from automd.templates.openapi import generate_template_from_dict, generate_template_chunks
+
+# Streamed documents are written key by key down to the operations of each path, and each operation in one piece
+STREAM_DEPTH: int = 3
+
+
+class SpecFormat(Enum):
+    json = "json"
+    yaml = "yaml"
+    html = "html"
+
+
+spec_format_mimetypes: Dict[SpecFormat, str] = {
+    SpecFormat.json: "application/json",
+    SpecFormat.yaml: "text/yaml",
+    SpecFormat.html: "text/html"
+}
+
+
+spec_artifact_names: Dict[SpecFormat, str] = {
+    SpecFormat.json: "spec.json",
+    SpecFormat.yaml: "spec.yaml",
+    SpecFormat.html: "spec.html"
+}
+
+
+content_encoders: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress
+}
+
+
+content_encoding_suffixes: Dict[str, str] = {
+    "gzip": ".gz",
+    "deflate": ".zz"
+}
+
+
+def iter_chunks(content: Sized, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Iterate over a bytes-like object (such as a mmap) in bytes chunks, to serve it without copying it whole
+    :param content: Content to iterate over
+    :param chunk_size: Size of the chunks
+    :return: Iterator over the chunks of the content
+    """
+    for offset in range(0, len(content), chunk_size):
+        yield content[offset:offset + chunk_size]
+
+
+class RenderedBody:
+    """
+    Serialized spec document in a single format, with a strong ETag derived from its content.
+    Compressed variants of the document are made once, up front, and picked per request from Accept-Encoding.
+    """
+    def __init__(self, body: bytes, mimetype: str, etag: str = None, variants: Dict[str, bytes] = None):
+        """
+
+        :param body: Serialized document.  Any bytes-like object, e.g. a mmap of the document.
+        :param mimetype: Mimetype the document is served with
+        :param etag: ETag of the document, computed from the body when not provided
+        :param variants: Compressed copies of the body by content encoding, compressed from the body when not provided
+        """
+        self.body: bytes = body
+        self.mimetype: str = mimetype
+        self.etag: str = hashlib.sha256(body).hexdigest() if etag is None else etag
+        self.variants: Dict[str, bytes] = variants
+        if self.variants is None:
+            self.variants = {
+                encoding: encoder(body)
+                for encoding, encoder
+                in content_encoders.items()
+            }
+
+    def negotiate_encoding(self, request: Request) -> str:
+        """
+        Pick the content encoding to serve, based off the request's Accept-Encoding
+        :param request: Request being answered
+        :return: Name of a compressed variant, or "identity" for the uncompressed body
+        """
+        encodings: List[str] = list(self.variants.keys())
+
+        return request.accept_encodings.best_match(encodings, default="identity")
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Build a response serving the pre-rendered body, answering with a 304 when the request's
+        If-None-Match matches the ETag of the negotiated variant.
+        :param request: Request being answered
+        :return: Response serving the body
+        """
+        encoding: str = self.negotiate_encoding(request)
+
+        content: bytes = self.body if encoding == "identity" else self.variants[encoding]
+
+        response: Response
+        if isinstance(content, bytes):
+            response = Response(content, mimetype=self.mimetype)
+        else:
+            response = Response(iter_chunks(content), mimetype=self.mimetype)
+            response.content_length = len(content)
+
+        if encoding == "identity":
+            response.set_etag(self.etag)
+        else:
+            response.headers["Content-Encoding"] = encoding
+            response.set_etag(f"{self.etag}-{encoding}")
+
+        response.vary.add("Accept-Encoding")
+
+        return response.make_conditional(request)
+
+
+def render_json(api_spec: APISpec) -> RenderedBody:
+    return RenderedBody(json.dumps(api_spec.to_dict(), cls=AutoMDObjEncoder).encode("utf-8"),
+                        spec_format_mimetypes[SpecFormat.json])
+
+
+def render_yaml(api_spec: APISpec) -> RenderedBody:
+    return RenderedBody(api_spec.to_yaml().encode("utf-8"), spec_format_mimetypes[SpecFormat.yaml])
+
+
+def render_html(api_spec: APISpec) -> RenderedBody:
+    return RenderedBody(generate_template_from_dict(api_spec.to_dict()).encode("utf-8"),
+                        spec_format_mimetypes[SpecFormat.html])
+
+
+spec_format_renderers: Dict[SpecFormat, Callable[[APISpec], RenderedBody]] = {
+    SpecFormat.json: render_json,
+    SpecFormat.yaml: render_yaml,
+    SpecFormat.html: render_html
+}
+
+
+def iter_json(obj: Any, depth: int = STREAM_DEPTH) -> Iterator[str]:
+    """
+    Serialize an object to JSON in pieces, concatenating to exactly json.dumps of the whole object,
+    with the AutoMDObjEncoder the spec routes were served with.
+    Mappings down to the given depth are written key by key, deeper values each in one piece.
+    :param obj: Object to serialize
+    :param depth: Levels of mappings to write key by key
+    :return: Iterator over the pieces of the document
+    """
+    if depth > 0 and isinstance(obj, dict) and obj and all(isinstance(key, str) for key in obj):
+        separator: str = "{"
+        for key, value in list(obj.items()):
+            yield f"{separator}{json.dumps(key)}: "
+            yield from iter_json(value, depth - 1)
+            separator = ", "
+        yield "}"
+    else:
+        yield json.dumps(obj, cls=AutoMDObjEncoder)
+
+
+def drain(buffer: io.StringIO) -> str:
+    written: str = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return written
+
+
+def emit_yaml(dumper: YAMLDumper, obj: Any, depth: int) -> Iterator[None]:
+    """
+    Emit the YAML events of an object, the way dumper.represent would, pausing after each value written in one piece.
+    Only the nodes of one such value are held at a time.
+    :param dumper: Opened dumper, inside a document
+    :param obj: Object to emit
+    :param depth: Levels of mappings to emit key by key
+    :return: Iterator pausing after each piece
+    """
+    if depth > 0 and type(obj) in (dict, OrderedDict) and obj:
+        # the events the representer makes for a block style dict, YAMLDumper keeps the order of OrderedDicts
+        dumper.emit(MappingStartEvent(None, "tag:yaml.org,2002:map", True, flow_style=False))
+        items: List = list(obj.items())
+        if dumper.sort_keys and type(obj) is dict:
+            try:
+                items = sorted(items)
+            except TypeError:
+                pass
+
+        for key, value in items:
+            serialize_yaml(dumper, key)
+            yield from emit_yaml(dumper, value, depth - 1)
+        dumper.emit(MappingEndEvent())
+    else:
+        serialize_yaml(dumper, obj)
+        yield
+
+
+def serialize_yaml(dumper: YAMLDumper, obj: Any):
+    node: Node = dumper.represent_data(obj)
+    dumper.anchor_node(node)
+    dumper.serialize_node(node, None, None)
+
+    # forget the represented objects, so memory stays bounded by a single piece
+    dumper.represented_objects = {}
+    dumper.object_keeper = []
+    dumper.alias_key = None
+    dumper.serialized_nodes = {}
+    dumper.anchors = {}
+
+
+def iter_yaml(obj: Any, depth: int = STREAM_DEPTH) -> Iterator[str]:
+    """
+    Serialize an object to YAML in pieces, concatenating to the same document as APISpec.to_yaml.
+    Objects shared between pieces are written in full in each, where a whole document dump would alias them.
+    :param obj: Object to serialize
+    :param depth: Levels of mappings to write key by key
+    :return: Iterator over the pieces of the document
+    """
+    buffer: io.StringIO = io.StringIO()
+    # same options as yaml.dump
+    dumper: YAMLDumper = YAMLDumper(buffer, default_flow_style=False)
+    try:
+        dumper.open()
+        dumper.emit(DocumentStartEvent(explicit=dumper.use_explicit_start,
+                                       version=dumper.use_version,
+                                       tags=dumper.use_tags))
+        for _ in emit_yaml(dumper, obj, depth):
+            yield drain(buffer)
+        dumper.emit(DocumentEndEvent(explicit=dumper.use_explicit_end))
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+    yield drain(buffer)
+
+
+def stream_json(api_spec: APISpec) -> Iterator[str]:
+    return iter_json(api_spec.to_dict())
+
+
+def stream_yaml(api_spec: APISpec) -> Iterator[str]:
+    return iter_yaml(api_spec.to_dict())
+
+
+def stream_html(api_spec: APISpec) -> Iterator[str]:
+    return generate_template_chunks(stream_json(api_spec))
+
+
+spec_format_streamers: Dict[SpecFormat, Callable[[APISpec], Iterator[str]]] = {
+    SpecFormat.json: stream_json,
+    SpecFormat.yaml: stream_yaml,
+    SpecFormat.html: stream_html
+}
+
+
+def next_chunk(pieces: Iterator[str], chunk_size: int) -> bytes:
+    """
+    Join the next pieces of a streamed document into a chunk of at least chunk_size characters,
+    or whatever is left of the document
+    :param pieces: Iterator over the pieces of a document
+    :param chunk_size: Minimum size of the chunk
+    :return: Encoded chunk, empty at the end of the document
+    """
+    chunk: List[str] = []
+    size: int = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            break
+
+    return "".join(chunk).encode("utf-8")
+
+
+class RenderedSpec:
+    """
+    Built APISpec along with its serialized documents.  Each format is rendered the first time it is requested,
+    then served from memory for the lifetime of the spec.
+    """
+    def __init__(self, api_spec: APISpec, lock: threading.RLock = None):
+        """
+
+        :param api_spec: Built APISpec to render
+        :param lock: Lock held while rendering, shared with whatever mutates the APISpec
+        """
+        self.api_spec: APISpec = api_spec
+        self._bodies: Dict[SpecFormat, RenderedBody] = {}
+        self._lock: threading.RLock = threading.RLock() if lock is None else lock
+
+    def body(self, spec_format: SpecFormat) -> RenderedBody:
+        """
+        Return the serialized document for the format, rendering it on first use
+        :param spec_format: Format to serialize the spec to
+        :return: Serialized document
+        """
+        rendered: RenderedBody = self._bodies.get(spec_format)
+        if rendered is None:
+            with self._lock:
+                rendered = self._bodies.get(spec_format)
+                if rendered is None:
+                    rendered = spec_format_renderers[spec_format](self.api_spec)
+                    self._bodies[spec_format] = rendered
+
+        return rendered
+
+    def stream(self, spec_format: SpecFormat, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Serialize the spec in chunks as they are consumed, without rendering or keeping the whole document.
+        The output is the same as the rendered body's.
+        :param spec_format: Format to serialize the spec to
+        :param chunk_size: Size of the chunks, in characters
+        :return: Iterator over the encoded chunks of the document
+        """
+        rendered: RenderedBody = self._bodies.get(spec_format)
+        if rendered is not None:
+            yield from iter_chunks(rendered.body, chunk_size)
+            return
+
+        pieces: Iterator[str] = spec_format_streamers[spec_format](self.api_spec)
+        while True:
+            # each chunk is serialized under the lock, the APISpec may be extended between chunks
+            with self._lock:
+                chunk: bytes = next_chunk(pieces, chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -1,2 +1,2 @@
 from .responses import (ResponseObjectInterface, ValueResponse, StringResponse, IntegerResponse, ListResponse,
-                        DictResponse, JSONResponse)
+                        DictResponse, JSONResponse, ResponseTypeRegistry, response_type_registry)
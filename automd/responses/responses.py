@@ -1,13 +1,18 @@
 from inspect import Signature
 import mimetypes
+import threading
 from abc import ABC, abstractmethod
 import typing
-from typing import Union, Dict, List, Any, AnyStr, Text, Type, Tuple
+from typing import Union, Dict, List, Any, AnyStr, Text, Type, Tuple, Callable, Optional, Iterable
 
 from marshmallow import Schema, fields
 
 from automd.mixedfield import MixedField
 
+# Resolved once at import from the module's built in map, constructing MimeTypes reads the system mime database
+JSON_MIMETYPE: str = mimetypes.types_map[".json"]
+TEXT_MIMETYPE: str = mimetypes.types_map[".txt"]
+
 
 class ResponseObjectInterface(ABC):
     """
@@ -67,7 +72,7 @@ class ValueResponse(ResponseObjectInterface):
         Return the Content Type for the Response Object for HTTP serialization
         :return:
         """
-        return mimetypes.MimeTypes().types_map[1][".json"]
+        return JSON_MIMETYPE
 
 
 class ListResponse(ResponseObjectInterface):
@@ -93,7 +98,7 @@ class ListResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".txt"]
+        return TEXT_MIMETYPE
 
 
 class TupleResponse(ResponseObjectInterface):
@@ -119,7 +124,7 @@ class TupleResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".txt"]
+        return TEXT_MIMETYPE
 
 
 class DictResponse(ResponseObjectInterface):
@@ -146,7 +151,7 @@ class DictResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".json"]
+        return JSON_MIMETYPE
 
 
 class JSONResponse(ResponseObjectInterface):
@@ -175,7 +180,7 @@ class JSONResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".json"]
+        return JSON_MIMETYPE
 
 
 class StringResponse(ResponseObjectInterface):
@@ -201,7 +206,7 @@ class StringResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".txt"]
+        return TEXT_MIMETYPE
 
 
 class IntegerResponse(ResponseObjectInterface):
@@ -227,7 +232,7 @@ class IntegerResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".txt"]
+        return TEXT_MIMETYPE
 
 
 class FloatResponse(ResponseObjectInterface):
@@ -253,7 +258,7 @@ class FloatResponse(ResponseObjectInterface):
 
     @staticmethod
     def content_type() -> str:
-        return mimetypes.MimeTypes().types_map[1][".txt"]
+        return TEXT_MIMETYPE
 
 
 def get_type_origin(key: Type) -> Type:
@@ -269,6 +274,67 @@ def get_type_origin(key: Type) -> Type:
     return origin
 
 
+class TypeResolutionCache:
+    """
+    Bounded cache of a resolution function of type annotations, keyed by the annotation object itself.
+    typing caches its subscriptions, so the same annotation written on many endpoints is usually the same object.
+    Equality is not used: Union compares equal regardless of argument order, which the resolved fields depend on.
+    Unhashable (mutable) annotations are resolved every time.
+    """
+    def __init__(self, resolve: Callable[[Any], Any], maxsize: int = 1024):
+        """
+
+        :param resolve: Resolution function, called with the annotation on a cache miss
+        :param maxsize: Maximum number of cached annotations, the oldest are evicted first
+        """
+        self.resolve: Callable[[Any], Any] = resolve
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.uncacheable: int = 0
+        # entries hold a reference to their annotation, so its id can't be reused while cached
+        self._entries: Dict[int, Tuple[Any, Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, key: Any) -> Any:
+        entry: Tuple[Any, Any] = self._entries.get(id(key))
+        if entry is not None and entry[0] is key:
+            self.hits += 1
+            return entry[1]
+
+        try:
+            hash(key)
+        except TypeError:
+            self.uncacheable += 1
+            return self.resolve(key)
+
+        self.misses += 1
+        resolved: Any = self.resolve(key)
+
+        with self._lock:
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[id(key)] = (key, resolved)
+
+        return resolved
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+
 response_object_type_map: Dict[Any, Type[ResponseObjectInterface]] = {
     int: IntegerResponse,
     "int": IntegerResponse,
@@ -312,16 +378,23 @@ response_object_type_map: Dict[Any, Type[ResponseObjectInterface]] = {
 }
 
 
-def map_response_object_type(key: Any,
-                             default: Union[ResponseObjectInterface, Type[ResponseObjectInterface]] = None
-                             ) -> Type[ResponseObjectInterface]:
+def resolve_response_object_type(key: Any) -> Optional[Type[ResponseObjectInterface]]:
     ret_interface: Type[ResponseObjectInterface] = response_object_type_map.get(key)
 
     if ret_interface is None:
         name: Type = get_type_origin(key)
         ret_interface = response_object_type_map.get(name)
 
-    return ret_interface or default
+    return ret_interface
+
+
+response_object_type_cache: TypeResolutionCache = TypeResolutionCache(resolve_response_object_type)
+
+
+def map_response_object_type(key: Any,
+                             default: Union[ResponseObjectInterface, Type[ResponseObjectInterface]] = None
+                             ) -> Type[ResponseObjectInterface]:
+    return response_object_type_cache(key) or default
 
 
 type_field_mapping: Dict[Any, Type[fields.Field]] = {
@@ -360,22 +433,32 @@ type_field_mapping: Dict[Any, Type[fields.Field]] = {
 }
 
 
-def map_type_field_mapping(key: Any, default: Type[fields.Field] = None) -> Type[fields.Field]:
+def resolve_type_field_mapping(key: Any) -> Optional[Type[fields.Field]]:
     ret_field: Type[fields.Field] = type_field_mapping.get(key)
 
     if ret_field is None:
         name: Type = get_type_origin(key)
         ret_field = type_field_mapping.get(name)
 
-    return ret_field or default
+    return ret_field
 
 
-def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
-    field_class: Type[fields.Field] = map_type_field_mapping(input_type, fields.Raw)
+type_field_mapping_cache: TypeResolutionCache = TypeResolutionCache(resolve_type_field_mapping)
 
-    field_args: List = []
 
-    ret_field: fields.Field
+def map_type_field_mapping(key: Any, default: Type[fields.Field] = None) -> Type[fields.Field]:
+    return type_field_mapping_cache(key) or default
+
+
+def resolve_field_factory(input_type: Any) -> Callable[..., fields.Field]:
+    """
+    Resolve a type annotation to a factory of its marshmallow field.  The annotation is only introspected here,
+    calling the factory just instantiates the fields.
+    :param input_type: Type annotation to resolve
+    :return: Factory taking the field's keyword arguments, returning a new field on every call
+    """
+    field_class: Type[fields.Field] = map_type_field_mapping(input_type, fields.Raw)
+
     if map_response_object_type(input_type) == map_response_object_type(List):
         list_inner_types: Type = Any
 
@@ -387,8 +470,12 @@ def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
             except (AttributeError, IndexError, TypeError):
                 pass
 
-        inner_field = type_to_field(list_inner_types)
-        field_args = [inner_field, *field_args]
+        inner_factory: Callable[..., fields.Field] = field_factory_cache(list_inner_types)
+
+        def list_field_factory(**input_kwargs) -> fields.Field:
+            return field_class(inner_factory(), **input_kwargs)
+
+        return list_field_factory
     elif map_type_field_mapping(input_type) == map_type_field_mapping(Dict):
         dict_key_type: Type = Any
         dict_value_type: Type = Any
@@ -403,10 +490,15 @@ def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
             except (AttributeError, IndexError, TypeError):
                 pass
 
-        key_field = type_to_field(dict_key_type)
-        value_field = type_to_field(dict_value_type)
-        input_kwargs["keys"] = key_field
-        input_kwargs["values"] = value_field
+        key_factory: Callable[..., fields.Field] = field_factory_cache(dict_key_type)
+        value_factory: Callable[..., fields.Field] = field_factory_cache(dict_value_type)
+
+        def dict_field_factory(**input_kwargs) -> fields.Field:
+            input_kwargs["keys"] = key_factory()
+            input_kwargs["values"] = value_factory()
+            return field_class(**input_kwargs)
+
+        return dict_field_factory
     elif get_type_origin(input_type) == get_type_origin(Union):
         key_inner_args: List[Type] = []
         try:  # Try Python 3.8 method
@@ -422,12 +514,18 @@ def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
             key_inner_args.remove(type(None))
 
         if len(key_inner_args) == 1:
-            return type_to_field(key_inner_args[0], **input_kwargs)
-        else:
-            inner_fields: List[fields.Field] = [type_to_field(x, **input_kwargs) for x in key_inner_args]
-            field_args = [inner_fields, *field_args]
-            key_inner_names: List[str] = [getattr(x, "__name__", str(x)) for x in key_inner_args]
-            input_kwargs["description"] = f"Multiple Types Allowed: " + ", ".join(key_inner_names)
+            return field_factory_cache(key_inner_args[0])
+
+        inner_factories: List[Callable[..., fields.Field]] = [field_factory_cache(x) for x in key_inner_args]
+        key_inner_names: List[str] = [getattr(x, "__name__", str(x)) for x in key_inner_args]
+        union_description: str = f"Multiple Types Allowed: " + ", ".join(key_inner_names)
+
+        def union_field_factory(**input_kwargs) -> fields.Field:
+            inner_fields: List[fields.Field] = [factory(**input_kwargs) for factory in inner_factories]
+            input_kwargs["description"] = union_description
+            return field_class(inner_fields, **input_kwargs)
+
+        return union_field_factory
     elif map_response_object_type(input_type) == map_response_object_type(Tuple):
         any_type: Type = Any
         tuple_inner_types: List[Type] = []
@@ -435,15 +533,120 @@ def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
         try:  # Try Python 3.8 method
             tuple_inner_types = list(typing.get_args(input_type))
         except AttributeError:
-            try:
-                tuple_inner_types = input_type.__args__
+            try:  # bare Tuple has no arguments, None rather than () on Python 3.6
+                tuple_inner_types = list(input_type.__args__ or ())
             except AttributeError:
                 pass
 
-        inner_field = type_to_field(any_type)
-        field_args = [inner_field, *field_args]
-
+        any_factory: Callable[..., fields.Field] = field_factory_cache(any_type)
         tuple_inner_names: List[str] = [getattr(x, "__name__", str(x)) for x in tuple_inner_types]
-        input_kwargs["description"] = f"Tuple of types ({', '.join(tuple_inner_names)})"
+        tuple_description: str = f"Tuple of types ({', '.join(tuple_inner_names)})"
+
+        def tuple_field_factory(**input_kwargs) -> fields.Field:
+            input_kwargs["description"] = tuple_description
+            return field_class(any_factory(), **input_kwargs)
+
+        return tuple_field_factory
+
+    return field_class
+
+
+field_factory_cache: TypeResolutionCache = TypeResolutionCache(resolve_field_factory)
+
+
+def type_to_field(input_type: Any, **input_kwargs) -> fields.Field:
+    return field_factory_cache(input_type)(**input_kwargs)
+
+
+def type_resolution_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Hit rates of the type resolution caches, e.g. to check them after a spec build
+    :return: Stats of each cache, by name
+    """
+    return {
+        "response_object_type": response_object_type_cache.stats(),
+        "type_field_mapping": type_field_mapping_cache.stats(),
+        "field_factory": field_factory_cache.stats()
+    }
+
+
+def clear_type_resolution_caches():
+    """
+    Clear the type resolution caches.  Needed after changing response_object_type_map or type_field_mapping.
+    Also invalidates what was documented from them since: the response classes of documented functions,
+    and the operations and specs AutoMD built, see ResponseTypeRegistry.generation.
+    """
+    response_object_type_cache.clear()
+    type_field_mapping_cache.clear()
+    field_factory_cache.clear()
+    response_type_registry.generation += 1
+
+
+class ResponseTypeRegistry:
+    """
+    Schema instance and content type of each response class, resolved once per class and then reused.
+    Response classes are resolved the first time they are looked up, registering them also maps
+    return annotations to them.
+    """
+    def __init__(self):
+        self._entries: Dict[Type[ResponseObjectInterface], Tuple[Schema, str]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        # bumped whenever registrations change how types are documented, for documentation resolved from them
+        # to be resolved again
+        self.generation: int = 0
+
+    def register(self,
+                 response_class: Type[ResponseObjectInterface],
+                 python_types: Iterable[Any] = ()) -> Type[ResponseObjectInterface]:
+        """
+        Register a response class, e.g. a custom ResponseObjectInterface subclass.  Usable as a class decorator.
+        :param response_class: Response class to register
+        :param python_types: Return annotations documented as this response class, besides the class itself
+        :return: The response class
+        """
+        with self._lock:
+            self._entries[response_class] = self.resolve_entry(response_class)
+
+        python_type: Any
+        for python_type in (response_class, *python_types):
+            response_object_type_map[python_type] = response_class
+        clear_type_resolution_caches()
+
+        return response_class
+
+    @staticmethod
+    def resolve_entry(response_class: Type[ResponseObjectInterface]) -> Tuple[Schema, str]:
+        """
+        Build the schema and content type of a response class
+        :param response_class: Response class
+        :return: New Schema instance and content type of the class
+        """
+        # duck-typed response classes without a content type are documented as plain text
+        content_type: Callable[[], str] = getattr(response_class, "content_type", None)
+
+        return response_class.to_schema(), TEXT_MIMETYPE if content_type is None else content_type()
+
+    def entry(self, response: Union[ResponseObjectInterface, Type[ResponseObjectInterface]]) -> Tuple[Schema, str]:
+        """
+        Schema and content type of a response class
+        :param response: Response class, or an instance of it
+        :return: Shared Schema instance and content type of the class
+        """
+        response_class: Type[ResponseObjectInterface] = response if isinstance(response, type) else type(response)
+
+        entry: Tuple[Schema, str] = self._entries.get(response_class)
+        if entry is None:
+            entry = self.resolve_entry(response_class)
+            with self._lock:
+                entry = self._entries.setdefault(response_class, entry)
+
+        return entry
+
+    def schema(self, response: Union[ResponseObjectInterface, Type[ResponseObjectInterface]]) -> Schema:
+        return self.entry(response)[0]
+
+    def content_type(self, response: Union[ResponseObjectInterface, Type[ResponseObjectInterface]]) -> str:
+        return self.entry(response)[1]
+
 
-    return field_class(*field_args, **input_kwargs)
+response_type_registry: ResponseTypeRegistry = ResponseTypeRegistry()
@@ -0,0 +1,118 @@
+import re
+from typing import Dict, List, Tuple, Pattern, Match, Iterable
+
+from werkzeug.routing import Map, Rule
+
+# Same syntax werkzeug parses rule variables with: <converter(arguments):variable>
+RULE_VARIABLE_PATTERN: Pattern = re.compile(r"<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*)(?:\((?P<arguments>.*?)\))?:)?"
+                                            r"(?P<variable>[a-zA-Z_][a-zA-Z0-9_]*)>")
+
+
+converter_schemas: Dict[str, Dict] = {
+    "default": {"type": "string"},
+    "string": {"type": "string"},
+    "path": {"type": "string"},
+    "any": {"type": "string"},
+    "int": {"type": "integer"},
+    "float": {"type": "number"},
+    "uuid": {"type": "string", "format": "uuid"}
+}
+
+
+def converter_schema(converter: str, arguments: str = None) -> Dict:
+    """
+    OpenAPI schema of the values matched by a werkzeug converter.  Unknown (custom) converters match strings.
+    :param converter: Name of the converter
+    :param arguments: Arguments passed to the converter in the rule, e.g. the choices of "any"
+    :return: OpenAPI schema
+    """
+    schema: Dict = dict(converter_schemas.get(converter, converter_schemas["default"]))
+
+    if converter == "any" and arguments:
+        schema["enum"] = [choice.strip().strip("\"'") for choice in arguments.split(",")]
+
+    return schema
+
+
+def openapi_path(rule_template: str) -> Tuple[str, List[Dict]]:
+    """
+    Convert a werkzeug rule template to an OpenAPI path template and its path parameters,
+    e.g. "/items/<int:item_id>" to "/items/{item_id}"
+    :param rule_template: Rule template, as in Rule.rule
+    :return: OpenAPI path, and the OpenAPI parameter objects of its variables
+    """
+    path_parameters: List[Dict] = []
+
+    def replace_variable(match: Match) -> str:
+        path_parameters.append({
+            "in": "path",
+            "name": match.group("variable"),
+            "required": True,
+            "schema": converter_schema(match.group("converter") or "default", match.group("arguments"))
+        })
+        return f"{{{match.group('variable')}}}"
+
+    return RULE_VARIABLE_PATTERN.sub(replace_variable, rule_template), path_parameters
+
+
+class Route:
+    """
+    Documented path of a url rule
+    """
+    def __init__(self, rule: Rule, path: str, path_parameters: List[Dict]):
+        """
+
+        :param rule: werkzeug url rule
+        :param path: OpenAPI path template of the rule
+        :param path_parameters: OpenAPI parameter objects of the path variables
+        """
+        self.rule: Rule = rule
+        self.path: str = path
+        self.path_parameters: List[Dict] = path_parameters
+
+    @property
+    def methods(self) -> Iterable[str]:
+        return self.rule.methods or ()
+
+    @property
+    def path_arguments(self) -> List[str]:
+        return [parameter["name"] for parameter in self.path_parameters]
+
+
+class RouteIndex:
+    """
+    Documented paths of the rules of a url map, by endpoint.  Built from the rule templates, so unlike url_for
+    it needs no app or request context, and rules with variables are documented as path parameters.
+    Routes of an endpoint are converted the first time they are requested.
+    """
+    def __init__(self, url_map: Map, application_root: str = "/"):
+        """
+
+        :param url_map: Url map of the app
+        :param application_root: Path the app is mounted under, prefixed to every path
+        """
+        self.url_map: Map = url_map
+        self.path_prefix: str = (application_root or "/").rstrip("/")
+        self._routes: Dict[str, List[Route]] = {}
+
+    def routes(self, endpoint: str) -> List[Route]:
+        """
+        Routes of an endpoint, in the order werkzeug builds urls with its rules
+        :param endpoint: Endpoint name
+        :return: Routes of the endpoint, empty if it has no rules
+        """
+        routes: List[Route] = self._routes.get(endpoint)
+        if routes is None:
+            try:
+                rules: List[Rule] = list(self.url_map.iter_rules(endpoint))
+            except KeyError:
+                rules = []
+
+            routes = []
+            rule: Rule
+            for rule in rules:
+                path, path_parameters = openapi_path(rule.rule)
+                routes.append(Route(rule, f"{self.path_prefix}{path}", path_parameters))
+            self._routes[endpoint] = routes
+
+        return routes
@@ -0,0 +1,325 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from inspect import Signature
+from pathlib import Path
+from typing import Dict, Callable, Iterator, Tuple, Union, Any, List
+
+from flask import Flask
+from marshmallow import Schema, fields
+from werkzeug.local import LocalProxy
+
+from automd.automd import AutoMD
+from automd.responses import ResponseObjectInterface
+from automd.responses.responses import response_type_registry
+from automd.route_index import RouteIndex
+from automd.rendering import (RenderedBody, RenderedSpec, SpecFormat, spec_artifact_names, spec_format_mimetypes,
+                              content_encoding_suffixes)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+MANIFEST_NAME: str = "manifest.json"
+STALE_PREFIX: str = ".stale."
+
+
+def describe(obj: Any) -> str:
+    """
+    Description of a piece of documentation metadata that is stable across processes: types by name,
+    marshmallow schemas and fields by their structure, and other objects by repr without memory addresses.
+    :param obj: Documentation metadata, e.g. a parameter schema or a signature
+    :return: Description of the object
+    """
+    if isinstance(obj, type) and issubclass(obj, Schema):
+        return describe(obj())
+    elif isinstance(obj, Schema):
+        return f"{type(obj).__module__}.{type(obj).__qualname__}({describe(obj.fields)})"
+    elif isinstance(obj, type) and issubclass(obj, ResponseObjectInterface):
+        schema, content_type = response_type_registry.entry(obj)
+        return f"{obj.__module__}.{obj.__qualname__}({describe(schema)}, {content_type})"
+    elif isinstance(obj, fields.Field):
+        nested: Any = [getattr(obj, attribute) for attribute in ("nested", "inner", "key_field", "value_field")
+                       if getattr(obj, attribute, None) is not None]
+        return (f"{type(obj).__name__}(required={obj.required}, allow_none={obj.allow_none}, "
+                f"metadata={describe(obj.metadata)}, nested={describe(nested)})")
+    elif isinstance(obj, Signature):
+        return describe([(name, parameter.annotation, parameter.default)
+                         for name, parameter in obj.parameters.items()] + [obj.return_annotation])
+    elif isinstance(obj, dict):
+        return "{" + ", ".join(f"{describe(key)}: {describe(value)}"
+                               for key, value in sorted(obj.items(), key=lambda item: repr(item[0]))) + "}"
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(describe(value) for value in obj) + "]"
+    elif isinstance(obj, type) or callable(obj):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+
+    return re.sub(r" at 0x[0-9a-fA-F]+", "", repr(obj))
+
+
+def spec_version(app: Union[Flask, LocalProxy], auto_md: AutoMD, version_tag: str = None) -> str:
+    """
+    Version of the spec of an app, stable across processes: a hash of the AutoMD options, the route table
+    and the documentation of every documented operation (summaries, tags, parameter and response schemas).
+    Documentation that isn't introspected, like the values a schema's methods compute, is not detected,
+    so pass a version_tag (e.g. the deployed commit) to get a new version on every deploy.
+    :param app: Flask app initialized with AutoMD
+    :param auto_md: AutoMD instance documenting the app
+    :param version_tag: Extra value to include in the version
+    :return: Version string, usable as a file name
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(auto_md.apispec_options, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(repr((auto_md.default_tag,
+                        auto_md.always_document,
+                        [verb.value for verb in auto_md.documented_verbs],
+                        version_tag)).encode("utf-8"))
+
+    routes: Tuple = tuple(sorted((rule.rule, rule.endpoint, sorted(rule.methods or ()))
+                                 for rule
+                                 in app.url_map.iter_rules()))
+    for route in routes:
+        digest.update(repr(route).encode("utf-8"))
+
+    route_index: RouteIndex = auto_md.app_route_index(app)
+    # sorted, the methods of a view are a set, iterated in a different order by each process
+    operations: List[str] = sorted(describe(operation_arguments)
+                                   for name in auto_md.documented_endpoints(app)
+                                   for operation_arguments
+                                   in auto_md.endpoint_operation_arguments(name, app.view_functions[name], route_index))
+    for operation in operations:
+        digest.update(operation.encode("utf-8"))
+
+    return digest.hexdigest()[:32]
+
+
+@contextmanager
+def locked_file(lock_path: Path) -> Iterator:
+    """
+    Hold an exclusive lock on a lock file, blocking until it is acquired.
+    :param lock_path: Path of the lock file, created if missing
+    """
+    while True:
+        lock_file = open(lock_path, "a+b")
+        if fcntl is None:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            break
+
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path)):
+                break
+        except FileNotFoundError:
+            pass
+        # removed by prune while this process waited on it, lock the file now at the path instead
+        lock_file.close()
+
+    with lock_file:
+        try:
+            yield lock_file
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def hold_in_use(manifest_file) -> bool:
+    """
+    Mark the version of an opened manifest as in use, for as long as the file stays open, so it is not pruned.
+    :param manifest_file: Opened manifest file of a version
+    :return: Whether the opened manifest is still the version's, rather than one pruned meanwhile
+    """
+    if fcntl is not None:
+        fcntl.flock(manifest_file.fileno(), fcntl.LOCK_SH)
+
+    try:
+        return os.path.samestat(os.fstat(manifest_file.fileno()), os.stat(manifest_file.name))
+    except FileNotFoundError:
+        return False
+
+
+def map_file(file_path: Path) -> mmap.mmap:
+    with open(file_path, "rb") as mapped_file:
+        return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MappedSpec:
+    """
+    Serialized spec documents memory mapped from a shared cache directory.  The pages are shared between
+    every process mapping the same files.
+    """
+    def __init__(self, version_dir: Path):
+        """
+
+        :param version_dir: Directory of a spec version written by SharedSpecCache
+        """
+        self.version_dir: Path = version_dir
+        # kept open, marking the version as in use
+        self._manifest_file = open(Path(version_dir, MANIFEST_NAME), "rb")
+        if not hold_in_use(self._manifest_file):
+            self._manifest_file.close()
+            raise FileNotFoundError(f"Spec version {version_dir} was pruned")
+
+        manifest: Dict = json.loads(self._manifest_file.read())
+
+        self._bodies: Dict[SpecFormat, RenderedBody] = {}
+        format_name: str
+        for format_name, format_manifest in manifest["formats"].items():
+            spec_format: SpecFormat = SpecFormat(format_name)
+            artifact_path: Path = Path(version_dir, spec_artifact_names[spec_format])
+
+            self._bodies[spec_format] = RenderedBody(
+                map_file(artifact_path),
+                spec_format_mimetypes[spec_format],
+                etag=format_manifest["etag"],
+                variants={
+                    encoding: map_file(Path(f"{artifact_path}{content_encoding_suffixes[encoding]}"))
+                    for encoding
+                    in format_manifest["encodings"]
+                }
+            )
+
+    def body(self, spec_format: SpecFormat) -> RenderedBody:
+        """
+        Return the serialized document for the format
+        :param spec_format: Format of the document
+        :return: Serialized document, backed by memory maps
+        """
+        return self._bodies[spec_format]
+
+
+class SharedSpecCache:
+    """
+    Spec cache shared by every process on a host (e.g. gunicorn workers) through a directory.
+    The first process to need a spec version builds it while holding a file lock and writes each document
+    to the directory, then every process memory maps the same files.
+    """
+    def __init__(self, cache_dir: str):
+        """
+
+        :param cache_dir: Directory holding the cached spec versions, created if missing
+        """
+        self.cache_dir: Path = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self,
+             version: str,
+             build: Callable[[], RenderedSpec],
+             spec_formats: Tuple[SpecFormat]) -> Union[MappedSpec, RenderedSpec]:
+        """
+        Map the documents of a spec version, building and writing them first if no process has yet.
+        :param version: Version of the spec, see spec_version
+        :param build: Builds the spec, only called if the version is not already cached
+        :param spec_formats: Formats to write when building
+        :return: Memory mapped spec documents, or the built spec itself if it couldn't be written
+        """
+        version_dir: Path = Path(self.cache_dir, version)
+
+        while True:
+            if not Path(version_dir, MANIFEST_NAME).is_file():
+                with locked_file(Path(self.cache_dir, f"{version}.lock")):
+                    # another process may have written the version while this one waited on the lock
+                    if not Path(version_dir, MANIFEST_NAME).is_file():
+                        rendered: RenderedSpec = build()
+                        try:
+                            self.write(version_dir, rendered, spec_formats)
+                        except OSError:
+                            # e.g. a full disk, serve this process from memory rather than fail the request
+                            return rendered
+                        self.prune(version)
+
+            try:
+                return MappedSpec(version_dir)
+            except FileNotFoundError:
+                # pruned by a process writing another version before this one mapped it, written again
+                continue
+
+    def prune(self, current_version: str):
+        """
+        Remove the directories and lock files of versions other than the current one, best-effort.
+        Versions still mapped or being written by a live process are kept, as are all versions on platforms
+        without flock, where mapped files can't be removed.
+        :param current_version: Version just written
+        """
+        if fcntl is None:
+            return
+
+        version_dir: Path
+        for version_dir in self.cache_dir.iterdir():
+            if version_dir.name.startswith(STALE_PREFIX):
+                # moved aside by write, its readers keep their mappings of the removed files
+                shutil.rmtree(version_dir, ignore_errors=True)
+                continue
+
+            if version_dir.name == current_version or version_dir.name.startswith(".") or not version_dir.is_dir():
+                continue
+
+            lock_path: Path = Path(self.cache_dir, f"{version_dir.name}.lock")
+            try:
+                with open(lock_path, "a+b") as lock_file, open(Path(version_dir, MANIFEST_NAME), "rb") as manifest_file:
+                    try:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        fcntl.flock(manifest_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        # being written, or mapped by a live process
+                        continue
+
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                    # unlinked while held, processes waiting on it notice and lock a new file, see locked_file
+                    lock_path.unlink()
+            except OSError:
+                # pruned by another process, or not a version directory
+                continue
+
+    @staticmethod
+    def write(version_dir: Path, rendered: RenderedSpec, spec_formats: Tuple[SpecFormat]):
+        """
+        Write the documents of a spec to a version directory.  Written to a temporary directory first and
+        renamed into place, so readers never see a partial version.
+        :param version_dir: Directory to write the version to
+        :param rendered: Built spec to write
+        :param spec_formats: Formats to write
+        """
+        staging_dir: Path = Path(version_dir.parent, f".{version_dir.name}.{os.getpid()}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir()
+
+        manifest: Dict = {"formats": {}}
+        spec_format: SpecFormat
+        for spec_format in spec_formats:
+            body: RenderedBody = rendered.body(spec_format)
+            artifact_path: Path = Path(staging_dir, spec_artifact_names[spec_format])
+
+            artifact_path.write_bytes(body.body)
+            for encoding, variant in body.variants.items():
+                Path(f"{artifact_path}{content_encoding_suffixes[encoding]}").write_bytes(variant)
+
+            manifest["formats"][spec_format.value] = {
+                "etag": body.etag,
+                "encodings": list(body.variants.keys())
+            }
+
+        Path(staging_dir, MANIFEST_NAME).write_text(json.dumps(manifest))
+
+        if version_dir.exists():
+            # left without a manifest by an interrupted prune, moved aside since a directory can't replace it
+            stale_dir: Path = Path(version_dir.parent, f"{STALE_PREFIX}{version_dir.name}.{os.getpid()}")
+            shutil.rmtree(stale_dir, ignore_errors=True)
+            os.replace(version_dir, stale_dir)
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+        try:
+            os.replace(staging_dir, version_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
@@ -0,0 +1,166 @@
+import threading
+from typing import Dict, Any
+
+from apispec import APISpec
+from apispec.ext.marshmallow import MarshmallowPlugin
+from apispec.ext.marshmallow.openapi import OpenAPIConverter
+
+from automd.fragments import REF_PREFIX
+from automd.mixedfield import mixedfield_2properties
+
+
+class AutoMDOpenAPIConverter(OpenAPIConverter):
+    """
+    OpenAPIConverter with AutoMD's field handling part of its attribute functions, instead of being added
+    to each converter after the fact.
+    """
+    def init_attribute_functions(self):
+        super().init_attribute_functions()
+
+        # register the Mixed Field handling function
+        self.add_attribute_function(mixedfield_2properties)
+
+
+class AutoMDMarshmallowPlugin(MarshmallowPlugin):
+    """
+    MarshmallowPlugin recording the component schemas registered to its spec, which apispec has no public
+    accessor for.
+    """
+    Converter = AutoMDOpenAPIConverter
+
+    def init_spec(self, spec: APISpec):
+        super().init_spec(spec)
+        self.schemas: Dict[str, Dict] = {}
+
+    def schema_helper(self, name: str, definition: Dict, **kwargs) -> Dict:
+        schema_dict: Dict = super().schema_helper(name, definition, **kwargs)
+
+        # the definition updated with the helper's output, as apispec stores it
+        self.schemas[name] = {**(definition or {}), **(schema_dict or {})}
+
+        return schema_dict
+
+
+class SpecBuilder:
+    """
+    Reusable factory of APISpec objects sharing one set of options.
+    apispec binds a plugin's converter to the last spec it initialized, so every spec gets its own plugin:
+    converter state (schema refs, the bound spec) belongs to that spec and is released with it.
+    """
+    def __init__(self,
+                 title: str,
+                 app_version: str = "1.0.0",
+                 openapi_version: str = "3.0.0",
+                 info: Dict = None):
+        """
+
+        :param title: Application title
+        :param app_version: Application version
+        :param openapi_version: OpenAPI spec version presented.
+        :param info: Detailed information about the application.
+        """
+        self.title: str = title
+        self.app_version: str = app_version
+        self.openapi_version: str = openapi_version
+        self.info: Dict = {} if info is None else info
+
+    def start_spec(self) -> APISpec:
+        """
+        Returns a new, empty APISpec object
+        :return: new APISpec class
+        """
+        return APISpec(self.title,
+                       self.app_version,
+                       self.openapi_version,
+                       info=self.info,
+                       plugins=[AutoMDMarshmallowPlugin()])
+
+    def start_resolver(self) -> "OperationResolver":
+        """
+        Returns a new OperationResolver, resolving operations through a new APISpec
+        :return: new OperationResolver
+        """
+        return OperationResolver(self.start_spec())
+
+    @staticmethod
+    def plugin(api_spec: APISpec) -> AutoMDMarshmallowPlugin:
+        """
+        Return the marshmallow plugin of an APISpec started by a SpecBuilder
+        :param api_spec: APISpec to get the plugin of
+        :return: AutoMDMarshmallowPlugin of the spec
+        """
+        return next(plugin for plugin in api_spec.plugins if isinstance(plugin, AutoMDMarshmallowPlugin))
+
+    @staticmethod
+    def converter(api_spec: APISpec) -> OpenAPIConverter:
+        """
+        Return the marshmallow converter bound to an APISpec started by a SpecBuilder
+        :param api_spec: APISpec to get the converter of
+        :return: OpenAPIConverter of the spec
+        """
+        return SpecBuilder.plugin(api_spec).converter
+
+
+class OperationResolver:
+    """
+    Resolves the schemas of operations to component references through a single APISpec and plugin, shared by
+    every operation it resolves, rather than a scratch APISpec per operation.  Schemas are converted once for all
+    the operations referencing them.  The shared APISpec only collects components: each resolved operation is
+    taken out along with the schemas it references.
+    """
+    def __init__(self, api_spec: APISpec):
+        """
+
+        :param api_spec: APISpec started by a SpecBuilder, resolved against and otherwise unused
+        """
+        self.api_spec: APISpec = api_spec
+        self.plugin: AutoMDMarshmallowPlugin = SpecBuilder.plugin(api_spec)
+        self.converter: OpenAPIConverter = self.plugin.converter
+        # held while building an operation, the converter and the registered schemas are shared
+        self.lock: threading.RLock = threading.RLock()
+
+    def resolve_operation(self, path_url: str, http_verb: str, operation: Dict) -> Dict:
+        """
+        Resolve the schemas of an operation the way APISpec.path does, without copying the operation first
+        (the operation is mutated).
+        :param path_url: url of the path
+        :param http_verb: HTTP verb of the operation
+        :param operation: OpenAPI operation object, owned by the caller, with marshmallow schemas
+        :return: The operation, with schemas resolved to references
+        """
+        operations: Dict[str, Dict] = {http_verb.lower(): operation}
+        self.plugin.operation_helper(path=path_url, operations=operations)
+        self.api_spec.clean_operations(operations)
+
+        return operations[http_verb.lower()]
+
+    def referenced_schemas(self, *openapi_objects: Any, schemas: Dict[str, Dict] = None) -> Dict[str, Dict]:
+        """
+        Component schemas referenced by OpenAPI objects, directly or through other schemas.
+        Nested schemas come before the schemas referencing them, in the order a new APISpec would register them.
+        :param openapi_objects: (Nested) OpenAPI objects
+        :param schemas: Schemas collected so far, extended with the referenced schemas not already in it
+        :return: Referenced schemas by name
+        """
+        schemas = {} if schemas is None else schemas
+        for openapi_object in openapi_objects:
+            self.collect_schemas(openapi_object, schemas)
+
+        return schemas
+
+    def collect_schemas(self, obj: Any, schemas: Dict[str, Dict]):
+        if isinstance(obj, dict):
+            ref: str = obj.get("$ref")
+            if isinstance(ref, str) and ref.startswith(REF_PREFIX):
+                name: str = ref[len(REF_PREFIX):]
+                if name in self.plugin.schemas and name not in schemas:
+                    # placeholder against reference cycles, replaced after the nested schemas
+                    schemas[name] = None
+                    self.collect_schemas(self.plugin.schemas[name], schemas)
+                    del schemas[name]
+                    schemas[name] = self.plugin.schemas[name]
+            for value in obj.values():
+                self.collect_schemas(value, schemas)
+        elif isinstance(obj, list):
+            for value in obj:
+                self.collect_schemas(value, schemas)
@@ -8,11 +8,14 @@
 #  https://github.com/swagger-api/swagger-ui/blob/4f1772f6544699bc748299bd65f7ae2112777abc/dist/index.html
 #  (Copyright 2017 SmartBear Software, Licensed under Apache 2.0)
 #
+import html
 import yaml
 import json
 import sys
 
-from typing import Dict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from automd.encoder import AutoMDObjEncoder
 
 SWAGGER_UI_TEMPLATE_old: str = """
 <!DOCTYPE html>
@@ -167,6 +170,143 @@ REDOC_TEMPLATE: str = """
 </html>
 """
 
+# UI assets of the shell pages by file name, loaded from these urls unless served by the app.
+# Exact versions, `automd vendor-assets` downloads the same files for every release.
+CDN_ASSET_URLS: Dict[str, str] = {
+    "redoc.standalone.js": "https://cdn.jsdelivr.net/npm/redoc@2.0.0/bundles/redoc.standalone.js",
+    "swagger-ui.css": "https://cdn.jsdelivr.net/npm/swagger-ui-dist@3.25.3/swagger-ui.css",
+    "swagger-ui-bundle.js": "https://cdn.jsdelivr.net/npm/swagger-ui-dist@3.25.3/swagger-ui-bundle.js",
+    "swagger-ui-standalone-preset.js":
+        "https://cdn.jsdelivr.net/npm/swagger-ui-dist@3.25.3/swagger-ui-standalone-preset.js"
+}
+REDOC_SHELL_ASSETS: Tuple[str, ...] = ("redoc.standalone.js",)
+SWAGGER_UI_SHELL_ASSETS: Tuple[str, ...] = ("swagger-ui.css", "swagger-ui-bundle.js", "swagger-ui-standalone-preset.js")
+REDOC_FONTS_LINK: str = ('<link href="https://fonts.googleapis.com/css?family=Montserrat:300,400,700|'
+                         'Roboto:300,400,700" rel="stylesheet">')
+
+# Shell pages load the spec from its url, so they are static and cached apart from the spec
+REDOC_SHELL_TEMPLATE: str = """
+<!DOCTYPE html>
+<html>
+  <head>
+    <title>ReDoc</title>
+    <!-- needed for adaptive design -->
+    <meta charset="utf-8"/>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    %(fonts)s
+
+    <!--
+    ReDoc doesn't change outer page styles
+    -->
+    <style>
+      body {
+        margin: 0;
+        padding: 0;
+      }
+    </style>
+  </head>
+  <body>
+    <redoc spec-url="%(spec_url)s"></redoc>
+    <script src="%(redoc.standalone.js)s"> </script>
+  </body>
+</html>
+"""
+SWAGGER_UI_SHELL_TEMPLATE: str = """
+<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8">
+    <title>Swagger UI</title>
+    <link rel="stylesheet" type="text/css" href="%(swagger-ui.css)s" >
+    <style>
+      html
+      {
+        box-sizing: border-box;
+        overflow: -moz-scrollbars-vertical;
+        overflow-y: scroll;
+      }
+
+      *,
+      *:before,
+      *:after
+      {
+        box-sizing: inherit;
+      }
+
+      body
+      {
+        margin:0;
+        background: #fafafa;
+      }
+    </style>
+  </head>
+
+  <body>
+    <div id="swagger-ui"></div>
+
+    <script src="%(swagger-ui-bundle.js)s"> </script>
+    <script src="%(swagger-ui-standalone-preset.js)s"> </script>
+    <script>
+    window.onload = function() {
+      const ui = SwaggerUIBundle({
+        url: %(spec_url)s,
+        dom_id: '#swagger-ui',
+        deepLinking: true,
+        presets: [
+          SwaggerUIBundle.presets.apis,
+          SwaggerUIStandalonePreset
+        ],
+        plugins: [
+          SwaggerUIBundle.plugins.DownloadUrl
+        ],
+        layout: "StandaloneLayout"
+      })
+
+      window.ui = ui
+    }
+  </script>
+  </body>
+</html>
+"""
+
+
+def shell_asset_urls(asset_urls: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Html escaped urls of the UI assets of a shell page
+    :param asset_urls: Url of each asset by file name, the CDN urls when None
+    :return: Escaped url of each asset by file name
+    """
+    return {filename: html.escape(url, quote=True) for filename, url in (asset_urls or CDN_ASSET_URLS).items()}
+
+
+def generate_redoc_shell(spec_url: str, asset_urls: Dict[str, str] = None) -> str:
+    """
+    Creates a Redoc HTML page loading the spec from a url, instead of embedding it
+    :param spec_url: Url of the JSON spec, relative to the page or absolute
+    :param asset_urls: Urls of the locally served REDOC_SHELL_ASSETS by file name.  The page then makes no
+                       external requests, using system fonts instead of Google Fonts.
+    :return:
+    """
+    return REDOC_SHELL_TEMPLATE % {
+        **shell_asset_urls(asset_urls),
+        "fonts": REDOC_FONTS_LINK if asset_urls is None else "",
+        "spec_url": html.escape(spec_url, quote=True)
+    }
+
+
+def generate_swagger_ui_shell(spec_url: str, asset_urls: Dict[str, str] = None) -> str:
+    """
+    Creates a Swagger UI HTML page loading the spec from a url, instead of embedding it
+    :param spec_url: Url of the JSON spec, relative to the page or absolute
+    :param asset_urls: Urls of the locally served SWAGGER_UI_SHELL_ASSETS by file name
+    :return:
+    """
+    return SWAGGER_UI_SHELL_TEMPLATE % {
+        **shell_asset_urls(asset_urls),
+        # escaped so the url can't close the script element
+        "spec_url": json.dumps(spec_url).replace("<", "\\u003c")
+    }
+
 
 def generate_template_from_yaml(spec_yaml: str) -> str:
     """
@@ -178,13 +318,26 @@ def generate_template_from_yaml(spec_yaml: str) -> str:
     return generate_template_from_dict(spec)
 
 
+def generate_template_chunks(spec_json_chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Streamed generate_template_from_dict, wrapping the spec's JSON as it is serialized
+    :param spec_json_chunks: Pieces of the spec's JSON
+    :return: Iterator over the pieces of the HTML page
+    """
+    template_start, template_end = (REDOC_TEMPLATE % "\0").split("\0")
+
+    yield template_start
+    yield from spec_json_chunks
+    yield template_end
+
+
 def generate_template_from_dict(spec_dict: Dict) -> str:
     """
         Creates the OpenAPI HTML page from a JSON input
         :param spec_dict:
         :return:
         """
-    return REDOC_TEMPLATE % json.dumps(spec_dict)
+    return REDOC_TEMPLATE % json.dumps(spec_dict, cls=AutoMDObjEncoder)
 
 
 def main():
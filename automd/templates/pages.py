@@ -0,0 +1,538 @@
+import html
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Tuple, Iterable, Iterator, Type, Pattern
+
+from automd.http_verbs import HTTPVerb
+
+DEFAULT_TAG: str = "default"
+INDEX_PAGE: str = "index"
+SCHEMAS_PAGE: str = "schemas"
+SCHEMA_REF_PREFIX: str = "#/components/schemas/"
+
+# characters with a meaning in Markdown inline text
+MARKDOWN_SPECIAL_PATTERN: Pattern = re.compile(r"([\\`*_{}\[\]<>()#+\-.!|])")
+BACKTICK_RUN_PATTERN: Pattern = re.compile(r"`+")
+
+OPERATION_VERBS: Tuple[str, ...] = tuple(verb.value.lower() for verb in HTTPVerb)
+
+# path, verb, operation object and the parameters shared by the operations of the path
+TagOperation = Tuple[str, str, Dict, List[Dict]]
+
+
+class PageFormat(Enum):
+    html = "html"
+    markdown = "md"
+
+
+def page_slug(name: str) -> str:
+    """
+    Name usable in file names and anchors, e.g. "AutoMD Test Application" to "automd-test-application"
+    """
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "page"
+
+
+def tag_operations(spec: Dict) -> Dict[str, List[TagOperation]]:
+    """
+    Group the operations of a spec by tag.  Operations with several tags are in each of their groups, operations
+    without tags in DEFAULT_TAG's.
+    :param spec: OpenAPI spec dict
+    :return: Operations by tag, in the order of the spec's tag objects then of first use
+    """
+    tags: Dict[str, List[TagOperation]] = OrderedDict((tag["name"], []) for tag in spec.get("tags", ()))
+
+    path: str
+    path_item: Dict
+    for path, path_item in spec.get("paths", {}).items():
+        verb: str
+        operation: Dict
+        for verb, operation in path_item.items():
+            if verb not in OPERATION_VERBS:
+                continue
+
+            tag: str
+            for tag in operation.get("tags") or (DEFAULT_TAG,):
+                tags.setdefault(tag, []).append((path, verb, operation, path_item.get("parameters", [])))
+
+    return OrderedDict((tag, operations) for tag, operations in tags.items() if operations)
+
+
+def escape_markdown(text: str) -> str:
+    """
+    Escape text to show as is in Markdown, e.g. a tag name in a heading
+    """
+    return MARKDOWN_SPECIAL_PATTERN.sub(r"\\\1", text)
+
+
+def iter_unique_slugs(names: Iterable[str], taken: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Slug of each name, numbered where names differing only in case or punctuation, or repeated, share a slug
+    :param names: Names to slug
+    :param taken: Slugs already in use
+    :return: Unique slug of each name, in order
+    """
+    taken = set(taken)
+
+    name: str
+    for name in names:
+        slug: str = page_slug(name)
+        unique_slug: str = slug
+        suffix: int = 2
+        while unique_slug in taken:
+            unique_slug = f"{slug}-{suffix}"
+            suffix += 1
+
+        taken.add(unique_slug)
+        yield unique_slug
+
+
+def unique_slugs(names: Iterable[str], taken: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Slugs of names, numbered where names differing only in case or punctuation share a slug
+    :param names: Names to slug
+    :param taken: Slugs already in use
+    :return: Unique slug by name
+    """
+    names = list(names)
+    return dict(zip(names, iter_unique_slugs(names, taken)))
+
+
+def markdown_fence(text: str, minimum: int = 1) -> str:
+    """
+    Backticks delimiting text as Markdown code, more of them than in any run of backticks within the text
+    :param text: Code to delimit
+    :param minimum: Fewest backticks, e.g. 3 for a code block
+    :return: Backtick delimiter
+    """
+    return "`" * max(minimum, max((len(run) for run in BACKTICK_RUN_PATTERN.findall(text)), default=0) + 1)
+
+
+def operation_anchor_name(path: str, verb: str, operation: Dict) -> str:
+    return operation.get("operationId") or f"{verb}-{path}"
+
+
+def tag_page_names(tags: Iterable[str]) -> Dict[str, str]:
+    """
+    File name stems of the tag pages, unique and apart from the index and schemas pages
+    :param tags: Tag names
+    :return: Page name by tag
+    """
+    return unique_slugs(tags, (INDEX_PAGE, SCHEMAS_PAGE))
+
+
+class PageRenderer(ABC):
+    """
+    Renders the pages of a spec from formatting primitives, implemented for each PageFormat.
+    Pages are plain documents, readable without running any script.
+    """
+    page_format: PageFormat = None
+
+    def __init__(self, schema_anchors: Dict[str, str] = None):
+        """
+
+        :param schema_anchors: Anchor of each schema component on the schemas page, by component name
+        """
+        self.schema_anchors: Dict[str, str] = {} if schema_anchors is None else schema_anchors
+
+    def page_url(self, page_name: str, anchor: str = None) -> str:
+        url: str = f"{page_name}.{self.page_format.value}"
+        return url if anchor is None else f"{url}#{anchor}"
+
+    @abstractmethod
+    def heading(self, level: int, text: str, anchor: str = None) -> str:
+        pass
+
+    @abstractmethod
+    def paragraph(self, text: str) -> str:
+        pass
+
+    @abstractmethod
+    def table(self, header: List[str], rows: List[List[str]]) -> str:
+        """
+        Table of already formatted cells
+        """
+        pass
+
+    @abstractmethod
+    def code(self, text: str) -> str:
+        pass
+
+    @abstractmethod
+    def code_block(self, text: str) -> str:
+        pass
+
+    @abstractmethod
+    def link(self, text: str, url: str) -> str:
+        pass
+
+    @abstractmethod
+    def escape(self, text: str) -> str:
+        pass
+
+    @abstractmethod
+    def document(self, title: str, blocks: List[str]) -> str:
+        pass
+
+    def schema_anchor(self, name: str) -> str:
+        anchor: str = self.schema_anchors.get(name)
+        return page_slug(name) if anchor is None else anchor
+
+    def schema_type(self, schema: Dict) -> str:
+        """
+        Short description of a schema's type, linking referenced components to the schemas page
+        :param schema: OpenAPI schema object
+        :return: Formatted type
+        """
+        ref: str = schema.get("$ref")
+        if ref is not None:
+            name: str = ref[len(SCHEMA_REF_PREFIX):] if ref.startswith(SCHEMA_REF_PREFIX) else ref
+            return self.link(self.escape(name), self.page_url(SCHEMAS_PAGE, self.schema_anchor(name)))
+
+        if "oneOf" in schema:
+            return " | ".join(self.schema_type(option) for option in schema["oneOf"])
+
+        if schema.get("type") == "array":
+            return f"array of {self.schema_type(schema.get('items', {}))}"
+
+        return self.escape(" ".join(str(part) for part in (schema.get("type", "any"), schema.get("format")) if part))
+
+    def schema_blocks(self, schema: Dict) -> List[str]:
+        """
+        Blocks describing a schema: its type, and its definition when defined inline
+        """
+        blocks: List[str] = [self.paragraph(f"Schema: {self.schema_type(schema)}")]
+        if "$ref" not in schema and len(schema) > 1:
+            blocks.append(self.code_block(json.dumps(schema, indent=2, default=str)))
+
+        return blocks
+
+    def response_content(self, response: Dict) -> str:
+        return ", ".join(f"{self.code(content_type)} {self.schema_type(media_type.get('schema', {}))}"
+                         for content_type, media_type in response.get("content", {}).items())
+
+    def operation_blocks(self,
+                         path: str,
+                         verb: str,
+                         operation: Dict,
+                         path_parameters: List[Dict],
+                         anchor: str = None) -> List[str]:
+        """
+        Blocks documenting an operation: its description, parameters, request body and responses
+        :param anchor: Anchor of the operation heading, unique on its page.  Defaults to its slug
+        """
+        anchor = anchor or page_slug(operation_anchor_name(path, verb, operation))
+        blocks: List[str] = [self.heading(2, f"{verb.upper()} {path}", anchor)]
+
+        summary: str = operation.get("summary")
+        if summary and summary != path:
+            blocks.append(self.paragraph(self.escape(summary)))
+        if operation.get("description"):
+            blocks.append(self.paragraph(self.escape(operation["description"])))
+
+        parameters: List[Dict] = [*path_parameters, *operation.get("parameters", [])]
+        if parameters:
+            blocks.append(self.heading(3, "Parameters"))
+            blocks.append(self.table(["Name", "In", "Type", "Required", "Description"],
+                                     [[self.code(parameter["name"]),
+                                       self.escape(parameter.get("in", "")),
+                                       self.schema_type(parameter.get("schema", {})),
+                                       "yes" if parameter.get("required") else "no",
+                                       self.escape(parameter.get("description", ""))]
+                                      for parameter in parameters]))
+
+        request_body: Dict = operation.get("requestBody")
+        if request_body:
+            blocks.append(self.heading(3, "Request body"))
+            if request_body.get("description"):
+                blocks.append(self.paragraph(self.escape(request_body["description"])))
+
+            content_type: str
+            media_type: Dict
+            for content_type, media_type in request_body.get("content", {}).items():
+                blocks.append(self.paragraph(self.code(content_type)))
+                blocks.extend(self.schema_blocks(media_type.get("schema", {})))
+
+        responses: Dict = operation.get("responses", {})
+        if responses:
+            blocks.append(self.heading(3, "Responses"))
+            blocks.append(self.table(["Status", "Description", "Content"],
+                                     [[self.code(str(status)),
+                                       self.escape(response.get("description", "")),
+                                       self.response_content(response)]
+                                      for status, response in responses.items()]))
+
+        return blocks
+
+    def tag_page(self, title: str, tag: str, description: str, operations: List[TagOperation]) -> str:
+        """
+        Page documenting the operations of a tag
+        :param title: Title of the API
+        :param tag: Tag name
+        :param description: Description of the tag object, if any
+        :param operations: Operations of the tag
+        :return: Rendered page
+        """
+        blocks: List[str] = [self.paragraph(self.link(self.escape(f"{title} index"), self.page_url(INDEX_PAGE))),
+                             self.heading(1, tag)]
+        if description:
+            blocks.append(self.paragraph(self.escape(description)))
+
+        # numbered where operations share a slug, e.g. GET /a/b and GET /a-b
+        anchors: List[str] = list(iter_unique_slugs(operation_anchor_name(path, verb, operation)
+                                                    for path, verb, operation, _ in operations))
+
+        path: str
+        verb: str
+        operation: Dict
+        path_parameters: List[Dict]
+        for (path, verb, operation, path_parameters), anchor in zip(operations, anchors):
+            blocks.extend(self.operation_blocks(path, verb, operation, path_parameters, anchor))
+
+        return self.document(f"{tag} - {title}", blocks)
+
+    def index_page(self, info: Dict, tag_summaries: List[Tuple[str, str, int]], has_schemas: bool) -> str:
+        """
+        Page linking to the page of every tag
+        :param info: Info object of the spec
+        :param tag_summaries: (tag, page name, operation count) of each tag
+        :param has_schemas: Link to the schemas page
+        :return: Rendered page
+        """
+        title: str = info.get("title", "API")
+        blocks: List[str] = [self.heading(1, f"{title} {info.get('version', '')}".strip())]
+        if info.get("description"):
+            blocks.append(self.paragraph(self.escape(info["description"])))
+
+        blocks.append(self.table(["Tag", "Operations"],
+                                 [[self.link(self.escape(tag), self.page_url(page_name)), str(operation_count)]
+                                  for tag, page_name, operation_count in tag_summaries]))
+        if has_schemas:
+            blocks.append(self.paragraph(self.link("Schemas", self.page_url(SCHEMAS_PAGE))))
+
+        return self.document(title, blocks)
+
+    def schemas_page(self, title: str, schemas: Dict[str, Dict]) -> str:
+        """
+        Page documenting the schema components referenced by the operations
+        :param title: Title of the API
+        :param schemas: Schema objects by component name
+        :return: Rendered page
+        """
+        blocks: List[str] = [self.paragraph(self.link(self.escape(f"{title} index"), self.page_url(INDEX_PAGE))),
+                             self.heading(1, "Schemas")]
+
+        name: str
+        schema: Dict
+        for name, schema in schemas.items():
+            blocks.append(self.heading(2, name, self.schema_anchor(name)))
+            blocks.append(self.code_block(json.dumps(schema, indent=2, default=str)))
+
+        return self.document(f"Schemas - {title}", blocks)
+
+
+class HTMLPageRenderer(PageRenderer):
+    page_format: PageFormat = PageFormat.html
+
+    def heading(self, level: int, text: str, anchor: str = None) -> str:
+        anchor_attribute: str = "" if anchor is None else f' id="{html.escape(anchor, quote=True)}"'
+        return f"<h{level}{anchor_attribute}>{html.escape(text)}</h{level}>"
+
+    def paragraph(self, text: str) -> str:
+        return f"<p>{text}</p>"
+
+    def table(self, header: List[str], rows: List[List[str]]) -> str:
+        header_row: str = "".join(f"<th>{html.escape(cell)}</th>" for cell in header)
+        body_rows: str = "\n".join(f"<tr>{''.join(f'<td>{cell}</td>' for cell in row)}</tr>" for row in rows)
+        return f"<table>\n<tr>{header_row}</tr>\n{body_rows}\n</table>"
+
+    def code(self, text: str) -> str:
+        return f"<code>{html.escape(text)}</code>"
+
+    def code_block(self, text: str) -> str:
+        return f"<pre><code>{html.escape(text)}</code></pre>"
+
+    def link(self, text: str, url: str) -> str:
+        return f'<a href="{html.escape(url, quote=True)}">{text}</a>'
+
+    def escape(self, text: str) -> str:
+        return html.escape(text)
+
+    def document(self, title: str, blocks: List[str]) -> str:
+        return STATIC_PAGE_TEMPLATE % {"title": html.escape(title), "body": "\n".join(blocks)}
+
+
+class MarkdownPageRenderer(PageRenderer):
+    page_format: PageFormat = PageFormat.markdown
+
+    def heading(self, level: int, text: str, anchor: str = None) -> str:
+        anchor_tag: str = "" if anchor is None else f'<a id="{html.escape(anchor, quote=True)}"></a>\n'
+        return f"{anchor_tag}{'#' * level} {escape_markdown(text)}"
+
+    def paragraph(self, text: str) -> str:
+        return text
+
+    def table(self, header: List[str], rows: List[List[str]]) -> str:
+        lines: List[str] = [f"| {' | '.join(header)} |", f"|{'---|' * len(header)}"]
+        lines.extend(f"| {' | '.join(cell.replace('|', '&#124;').replace(chr(10), '<br>') for cell in row)} |"
+                     for row in rows)
+        return "\n".join(lines)
+
+    def code(self, text: str) -> str:
+        fence: str = markdown_fence(text)
+        # padded, or backticks at the ends of the text would join the fence
+        padding: str = " " if text.startswith("`") or text.endswith("`") else ""
+        return f"{fence}{padding}{text}{padding}{fence}"
+
+    def code_block(self, text: str) -> str:
+        fence: str = markdown_fence(text, 3)
+        return f"{fence}json\n{text}\n{fence}"
+
+    def link(self, text: str, url: str) -> str:
+        return f"[{text}]({url})"
+
+    def escape(self, text: str) -> str:
+        # OpenAPI descriptions are CommonMark already
+        return text
+
+    def document(self, title: str, blocks: List[str]) -> str:
+        return "\n\n".join(blocks) + "\n"
+
+
+page_renderers: Dict[PageFormat, Type[PageRenderer]] = {
+    PageFormat.html: HTMLPageRenderer,
+    PageFormat.markdown: MarkdownPageRenderer
+}
+
+STATIC_PAGE_TEMPLATE: str = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8"/>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>%(title)s</title>
+    <style>
+      body { font-family: sans-serif; margin: 0 auto; max-width: 60em; padding: 1em; line-height: 1.4; }
+      p { white-space: pre-line; }
+      table { border-collapse: collapse; margin: 0.5em 0; }
+      th, td { border: 1px solid #ddd; padding: 0.3em 0.6em; text-align: left; vertical-align: top; }
+      pre { background: #f6f8fa; padding: 0.6em; overflow-x: auto; }
+      h2 { border-top: 1px solid #ddd; padding-top: 0.8em; }
+    </style>
+  </head>
+  <body>
+%(body)s
+  </body>
+</html>
+"""
+
+
+class PageJob:
+    """
+    Page to render, holding only the part of the spec the page needs, so it is cheap to send to a worker process
+    """
+    def __init__(self,
+                 page_name: str,
+                 page_format: PageFormat,
+                 method: str,
+                 arguments: Tuple,
+                 schema_anchors: Dict[str, str] = None):
+        """
+
+        :param page_name: File name stem of the page
+        :param page_format: Format to render the page in
+        :param method: PageRenderer method rendering the page
+        :param arguments: Arguments of the method
+        :param schema_anchors: Anchor of each schema component on the schemas page, by component name
+        """
+        self.page_name: str = page_name
+        self.page_format: PageFormat = page_format
+        self.method: str = method
+        self.arguments: Tuple = arguments
+        self.schema_anchors: Dict[str, str] = schema_anchors
+
+    @property
+    def filename(self) -> str:
+        return f"{self.page_name}.{self.page_format.value}"
+
+    def render(self) -> str:
+        return getattr(page_renderers[self.page_format](self.schema_anchors), self.method)(*self.arguments)
+
+
+def page_jobs(spec: Dict, page_format: PageFormat) -> List[PageJob]:
+    """
+    Split a spec into its pages: one per tag, an index and the schema components
+    :param spec: OpenAPI spec dict
+    :param page_format: Format to render the pages in
+    :return: Page to render of each page
+    """
+    title: str = spec.get("info", {}).get("title", "API")
+    tag_descriptions: Dict[str, str] = {tag["name"]: tag.get("description") for tag in spec.get("tags", ())}
+    schemas: Dict[str, Dict] = spec.get("components", {}).get("schemas", {})
+
+    tags: Dict[str, List[TagOperation]] = tag_operations(spec)
+    page_names: Dict[str, str] = tag_page_names(tags)
+    schema_anchors: Dict[str, str] = unique_slugs(schemas)
+
+    jobs: List[PageJob] = [
+        PageJob(INDEX_PAGE,
+                page_format,
+                "index_page",
+                (spec.get("info", {}),
+                 [(tag, page_names[tag], len(operations)) for tag, operations in tags.items()],
+                 bool(schemas)))
+    ]
+    jobs.extend(PageJob(page_names[tag],
+                        page_format,
+                        "tag_page",
+                        (title, tag, tag_descriptions.get(tag), operations),
+                        schema_anchors)
+                for tag, operations in tags.items())
+    if schemas:
+        jobs.append(PageJob(SCHEMAS_PAGE, page_format, "schemas_page", (title, schemas), schema_anchors))
+
+    return jobs
+
+
+def render_pages(spec: Dict, page_format: PageFormat = PageFormat.html) -> Dict[str, str]:
+    """
+    Render a spec to static pages, one per tag plus an index, readable without any client side script
+    :param spec: OpenAPI spec dict
+    :param page_format: Format to render the pages in
+    :return: Rendered page by file name
+    """
+    return OrderedDict((job.filename, job.render()) for job in page_jobs(spec, page_format))
+
+
+def write_page(job: PageJob, output_dir: str) -> str:
+    path: str = os.path.join(output_dir, job.filename)
+    Path(path).write_text(job.render(), encoding="utf-8")
+
+    return path
+
+
+def write_pages(spec: Dict,
+                output_dir: str,
+                page_format: PageFormat = PageFormat.html,
+                workers: int = None) -> List[str]:
+    """
+    Render a spec to static pages and write them to a directory, rendering and writing them in parallel
+    :param spec: OpenAPI spec dict
+    :param output_dir: Directory to write the pages to, created if missing
+    :param page_format: Format to render the pages in
+    :param workers: Render pages in a pool of this many processes, in this process when None or 1
+    :return: Paths of the written pages, index first
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    jobs: List[PageJob] = page_jobs(spec, page_format)
+
+    if workers is None or workers <= 1 or len(jobs) <= 1:
+        return [write_page(job, output_dir) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paths: Iterator[str] = executor.map(write_page, jobs, [output_dir] * len(jobs))
+        return list(paths)
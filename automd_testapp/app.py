@@ -4,7 +4,7 @@ from webargs.flaskparser import parser, abort
 
 from automd.decorators import automd
 from automd.http_verbs import HTTPVerb
-from automd.registration import AutoMDApp, AutoMDSpecRoute
+from automd.registration import AutoMDApp, AutoMDSpecRoute, AutoMDBuildMode
 from automd_testapp.endpoints import Status, AddTwo, MinimalStatus, IntrospectionStatus
 
 # Initialize Flask App and API interface
@@ -22,7 +22,8 @@ spec: AutoMDApp = AutoMDApp(api,
                             always_document=True,
                             path_override=None,
                             spec_routes=(AutoMDSpecRoute.html, AutoMDSpecRoute.json, AutoMDSpecRoute.yaml),
-                            documented_verbs=(HTTPVerb.get, HTTPVerb.post, HTTPVerb.put, HTTPVerb.delete))
+                            documented_verbs=(HTTPVerb.get, HTTPVerb.post, HTTPVerb.put, HTTPVerb.delete),
+                            build_mode=AutoMDBuildMode.background)
 
 # Disable 404 route suggestion from flask_restful
 # It would append url suggestions to the error message on 404s, which is undesired behavior
@@ -64,3 +65,4 @@ def flask_status() -> str:
 @app.route("/flask/status/unlisted")
 def flask_status_unlisted() -> str:
     return "OK"
+
@@ -0,0 +1,98 @@
+"""
+Benchmark of the import time of a module with many automd decorated resources.  Introspection of the decorated
+functions is deferred to the first spec build, the eager timing adds it back to show what import used to cost.
+
+    python -m benchmarks.import_time_benchmark --resources 5000
+"""
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+from automd.endpoint_doc import EndpointDoc
+from automd.keys import AutoMDKeys
+
+RESOURCE_TEMPLATE: str = '''
+class Resource{index}(Resource):
+    @automd(summary="Get item {index}", tags=["Group {group}"])
+    def get(self, text: str = None, limit: int = 10, labels: List[str] = None) -> Dict[str, Any]:
+        return {{}}
+
+    @automd(summary="Post item {index}")
+    def post(self, name: str, values: Optional[List[int]] = None) -> int:
+        return 0
+'''
+
+
+def write_resource_module(module_dir: str, resource_count: int) -> Path:
+    """
+    Write a module of decorated Flask-RESTful resources
+    :param module_dir: Directory to write the module to
+    :param resource_count: Number of resources in the module
+    :return: Path of the module
+    """
+    source: List[str] = ["from typing import Any, Dict, List, Optional",
+                         "from flask_restful import Resource",
+                         "from automd.decorators import automd"]
+    source.extend(RESOURCE_TEMPLATE.format(index=index, group=index % 20) for index in range(resource_count))
+
+    module_path: Path = Path(module_dir, "automd_import_benchmark_resources.py")
+    module_path.write_text("\n".join(source))
+    return module_path
+
+
+def import_module(module_path: Path, name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def introspect_module(module: ModuleType):
+    """
+    Run the introspection the automd decorator used to run at import, for every decorated function of the module
+    """
+    for value in vars(module).values():
+        for method in ("get", "post"):
+            endpoint_doc: EndpointDoc = getattr(getattr(value, method, None), AutoMDKeys.function.value, None)
+            if isinstance(endpoint_doc, EndpointDoc):
+                endpoint_doc.response_schemas
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resources", type=int, default=5000, help="Number of resources in the imported module")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of imports to take the best timing of")
+    args: argparse.Namespace = parser.parse_args()
+
+    lazy_timings: List[float] = []
+    eager_timings: List[float] = []
+    with tempfile.TemporaryDirectory() as module_dir:
+        module_path: Path = write_resource_module(module_dir, args.resources)
+
+        for attempt in range(args.repeat):
+            # byte code is compiled on the first import of each name, so warm it up first
+            import_module(module_path, f"automd_import_benchmark_{attempt}")
+
+            start: float = time.perf_counter()
+            module: ModuleType = import_module(module_path, f"automd_import_benchmark_{attempt}")
+            imported: float = time.perf_counter()
+            introspect_module(module)
+            introspected: float = time.perf_counter()
+
+            lazy_timings.append((imported - start) * 1000)
+            eager_timings.append((introspected - start) * 1000)
+            sys.modules.pop(f"automd_import_benchmark_{attempt}", None)
+
+    print(f"{args.resources} resources, {args.resources * 2} decorated methods")
+    print(f"import (lazy introspection):  {min(lazy_timings):.1f} ms")
+    print(f"import + eager introspection: {min(eager_timings):.1f} ms")
+    print(f"saved at import: {min(eager_timings) - min(lazy_timings):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of parallel spec builds of large apps: serial and process pool build times at several app sizes,
+checking the parallel build renders the same spec as the serial one.
+
+    python -m benchmarks.parallel_build_benchmark --routes 1000,10000,50000 --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from typing import List, Tuple
+
+from apispec import APISpec
+from flask import Flask
+
+from automd.automd import AutoMD
+from automd.keys import AutoMDKeys
+from benchmarks.synthetic_app import make_synthetic_app
+
+
+def timed_build(auto_md: AutoMD, app: Flask, workers: int = None) -> Tuple[float, str]:
+    """
+    Build the spec of an app from scratch
+    :return: Build time in ms, and the spec serialized to JSON
+    """
+    auto_md.invalidate_spec_cache()
+    auto_md.clear_operation_cache()
+
+    start: float = time.perf_counter()
+    spec: APISpec = (auto_md.application_to_apispec(app) if workers is None
+                     else auto_md.application_to_apispec_in_pool(app, workers))
+    spec_json: str = json.dumps(spec.to_dict())
+    return (time.perf_counter() - start) * 1000, spec_json
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", default="1000,10000,50000", help="Comma separated numbers of synthetic resources")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of build processes")
+    args: argparse.Namespace = parser.parse_args()
+
+    route_counts: List[int] = [int(route_count) for route_count in args.routes.split(",")]
+
+    print(f"{args.workers} workers, {os.cpu_count()} cpus")
+    for route_count in route_counts:
+        app: Flask = make_synthetic_app(route_count)
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+        serial_time, serial_json = timed_build(auto_md, app)
+
+        # a fresh app, so the serial build's operation cache doesn't flatter the workers
+        app = make_synthetic_app(route_count)
+        auto_md = app.config[AutoMDKeys.config.value].auto_md
+        parallel_time, parallel_json = timed_build(auto_md, app, args.workers)
+
+        shard_count: int = len(auto_md.endpoint_shards(app, args.workers))
+        print(f"{route_count:>6} resources: serial {serial_time:9.1f} ms, "
+              f"parallel {parallel_time:9.1f} ms ({shard_count} shards), "
+              f"speedup {serial_time / parallel_time:.2f}x, identical: {parallel_json == serial_json}")
+
+
+if __name__ == "__main__":
+    main()
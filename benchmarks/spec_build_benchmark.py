@@ -0,0 +1,63 @@
+"""
+Regression benchmark for repeated spec builds: time per build should stay flat over a long-lived process.
+Cold builds introspect every endpoint again, warm builds right after them reuse the cached operations.
+
+    python -m benchmarks.spec_build_benchmark --builds 10000 --routes 5
+"""
+import argparse
+import time
+from typing import List, Dict
+
+from apispec import APISpec
+from flask import Flask
+
+from automd.automd import AutoMD
+from automd.keys import AutoMDKeys
+from automd.responses.responses import type_resolution_stats
+from benchmarks.synthetic_app import make_synthetic_app
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--builds", type=int, default=10000, help="Number of consecutive builds")
+    parser.add_argument("--routes", type=int, default=5, help="Number of synthetic resources in the app")
+    parser.add_argument("--windows", type=int, default=10, help="Number of windows to report timings for")
+    args: argparse.Namespace = parser.parse_args()
+
+    app: Flask = make_synthetic_app(args.routes)
+    auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+    window_size: int = max(args.builds // args.windows, 1)
+    window_timings: Dict[str, List[float]] = {"cold": [], "warm": []}
+    build_timings: Dict[str, float] = {"cold": 0.0, "warm": 0.0}
+
+    for build in range(1, args.builds + 1):
+        auto_md.clear_operation_cache()
+
+        build_kind: str
+        for build_kind in ("cold", "warm"):
+            build_start: float = time.perf_counter()
+            api_spec: APISpec = auto_md.application_to_apispec(app)
+            api_spec.to_dict()
+            build_timings[build_kind] += time.perf_counter() - build_start
+
+        if build % window_size == 0:
+            for build_kind, timing in build_timings.items():
+                window_timings[build_kind].append(timing / window_size * 1000)
+                build_timings[build_kind] = 0.0
+
+    for window in range(len(window_timings["cold"])):
+        print(f"builds {window * window_size + 1:>6}-{(window + 1) * window_size:>6}: "
+              f"{window_timings['cold'][window]:.3f} ms/cold build, "
+              f"{window_timings['warm'][window]:.3f} ms/warm build")
+
+    for build_kind, timings in window_timings.items():
+        print(f"{build_kind} last/first window ratio: {timings[-1] / timings[0]:.2f}")
+
+    for cache_name, stats in type_resolution_stats().items():
+        print(f"{cache_name} cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['uncacheable']} uncacheable, {stats['size']}/{stats['maxsize']} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the peak memory of serializing a large spec, whole documents against streamed ones.
+
+    python -m benchmarks.spec_memory_benchmark --routes 5000
+"""
+import argparse
+import json
+import tracemalloc
+from typing import Callable, Dict
+
+from apispec import APISpec
+from flask import Flask
+
+from automd.automd import AutoMD
+from automd.keys import AutoMDKeys
+from automd.rendering import RenderedSpec, SpecFormat
+from automd.templates.openapi import generate_template_from_dict
+from benchmarks.synthetic_app import make_synthetic_app
+
+whole_document_serializers: Dict[SpecFormat, Callable[[APISpec], str]] = {
+    SpecFormat.json: lambda api_spec: json.dumps(api_spec.to_dict()),
+    SpecFormat.yaml: lambda api_spec: api_spec.to_yaml(),
+    SpecFormat.html: lambda api_spec: generate_template_from_dict(api_spec.to_dict())
+}
+
+
+def peak_memory(func: Callable[[], object]) -> float:
+    """
+    Peak memory allocated while running a function
+    :return: Peak, in MB
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def consume(rendered: RenderedSpec, spec_format: SpecFormat) -> int:
+    return sum(len(chunk) for chunk in rendered.stream(spec_format))
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", type=int, default=5000, help="Number of synthetic resources in the app")
+    args: argparse.Namespace = parser.parse_args()
+
+    app: Flask = make_synthetic_app(args.routes)
+    auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+    api_spec: APISpec = auto_md.application_to_apispec(app)
+    rendered: RenderedSpec = RenderedSpec(api_spec)
+
+    for spec_format in SpecFormat:
+        document_size: float = consume(rendered, spec_format) / 1024 / 1024
+        whole_peak: float = peak_memory(lambda: whole_document_serializers[spec_format](api_spec))
+        streamed_peak: float = peak_memory(lambda: consume(rendered, spec_format))
+
+        print(f"{spec_format.value:>4}: document {document_size:7.2f} MB, "
+              f"whole peak {whole_peak:7.2f} MB, streamed peak {streamed_peak:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from typing import List, Dict, Optional, Union
+
+from flask import Flask
+from flask_restful import Api, Resource
+from webargs import fields
+
+from automd.decorators import automd
+from automd.registration import AutoMDApp
+from automd.responses import ValueResponse, JSONResponse
+
+
+def make_resource(index: int) -> type:
+    """
+    Make a Flask-RESTful Resource with a documented GET and POST, mixing schema and signature documentation
+    :param index: Number of the resource, used in its name and summaries
+    :return: New Resource class
+    """
+    post_arguments: Dict = {
+        "name": fields.String(required=True, description="Name of the item"),
+        "count": fields.Integer(description="Number of items", location="json")
+    }
+
+    @automd(summary=f"Get item {index}", description="Returns an item", tags=[f"Group {index % 20}"])
+    def get(self,
+            text: str = None,
+            limit: int = 10,
+            labels: List[str] = None,
+            filters: Dict[str, int] = None,
+            mixed: Union[str, int] = None,
+            optional: Optional[bool] = None) -> ValueResponse:
+        return ValueResponse(text)
+
+    @automd(parameter_schema=post_arguments, summary=f"Post item {index}", tags=[f"Group {index % 20}"])
+    def post(self, name: str, count: int = 1) -> JSONResponse:
+        return JSONResponse({"name": name, "count": count})
+
+    return type(f"SyntheticResource{index}", (Resource,), {"get": get, "post": post})
+
+
+def make_synthetic_app(route_count: int, **automd_kwargs) -> Flask:
+    """
+    Make a Flask app documented with AutoMD, with the given number of synthetic resources
+    :param route_count: Number of resources to register
+    :param automd_kwargs: Extra arguments to AutoMDApp
+    :return: Flask app
+    """
+    app: Flask = Flask(__name__)
+    api: Api = Api(app)
+    AutoMDApp(api, "Synthetic App", spec_routes=(), **automd_kwargs)
+
+    for index in range(route_count):
+        api.add_resource(make_resource(index), f"/synthetic/{index}/items", endpoint=f"SyntheticResource{index}")
+
+    return app
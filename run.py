@@ -1,4 +1,4 @@
-from automd_testapp.app import app
+from automd_testapp.app import app, spec
 
 
 # Label server as development
@@ -16,5 +16,8 @@ PORT: int = 5001
 THREADED: bool = True
 
 if __name__ == '__main__':
+    # Build the documentation now that all routes are registered, instead of on the first docs request.
+    # Only when serving, so importing the app (e.g. for "automd build") does not start a build thread
+    spec.start_build()
     app.run(host=HOST, port=PORT, debug=DEBUG, threaded=THREADED, use_reloader=USE_RELOADER)
 
@@ -25,11 +25,16 @@ setup(
         "flask",
         "flask-restful",
         "webargs",
-        "apispec",
+        "apispec>=3,<4",
         "pyyaml",
         "marshmallow",
         "werkzeug"
     ],
+    entry_points={
+        "console_scripts": [
+            "automd=automd.cli:main"
+        ]
+    },
     classifiers=[
         "Environment :: Web Environment",
         "Intended Audience :: Developers",
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+from flask import Flask, request
+
+from automd.assets import AssetBundle, hashed_asset_name, IMMUTABLE_MAX_AGE
+
+
+def test_hashed_asset_name():
+    name: str = hashed_asset_name("redoc.standalone.js", b"content")
+
+    assert name.startswith("redoc.standalone.") and name.endswith(".js")
+    assert name != hashed_asset_name("redoc.standalone.js", b"changed content")
+
+
+def test_missing_asset(tmp_path: Path):
+    with pytest.raises(ValueError):
+        AssetBundle(str(tmp_path), ["redoc.standalone.js"])
+
+
+def test_asset_response(tmp_path: Path):
+    Path(tmp_path, "swagger-ui.css").write_text("body {}")
+    bundle: AssetBundle = AssetBundle(str(tmp_path), ["swagger-ui.css"])
+    hashed_name: str = bundle.hashed_names["swagger-ui.css"]
+
+    assert bundle.urls("assets") == {"swagger-ui.css": f"assets/{hashed_name}"}
+
+    with Flask(__name__).test_request_context():
+        response = bundle.response(hashed_name, request)
+
+        assert response.mimetype == "text/css"
+        assert response.get_data() == b"body {}"
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == IMMUTABLE_MAX_AGE
+        assert bundle.response("swagger-ui.css", request) is None
@@ -1,15 +1,34 @@
+import functools
 import inspect
+import json
+import threading
 from inspect import Signature
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, FrozenSet
 
+import pytest
+from apispec import APISpec
+from apispec.ext.marshmallow.openapi import OpenAPIConverter
+from flask import Flask
+from flask_restful import Api, Resource
 from marshmallow import Schema
+from werkzeug.routing import Rule
 from marshmallow.fields import Field
 from webargs import fields
 
 from automd.automd import AutoMD
+from automd.decorators import automd
+from automd.fragments import OperationFragment, component_name
 from automd.http_verbs import HTTPVerb
-from automd.responses import IntegerResponse, JSONResponse, DictResponse, StringResponse
-from automd.responses.responses import TupleResponse
+from automd.keys import AutoMDKeys
+from automd.mixedfield import mixedfield_2properties
+from automd.parallel_build import fork_available
+from automd.registration import AutoMDApp, AutoMDSpecRoute
+from automd.responses import (IntegerResponse, JSONResponse, DictResponse, StringResponse, ValueResponse,
+                              ResponseObjectInterface)
+from automd.responses.responses import (TupleResponse, response_type_registry, response_object_type_map,
+                                        clear_type_resolution_caches)
+from automd.spec_builder import SpecBuilder, OperationResolver
+from benchmarks.synthetic_app import make_synthetic_app
 
 
 class TestAutoMD:
@@ -158,3 +177,566 @@ class TestAutoMD:
         assert isinstance(result_schema.fields["value"], fields.List)
         assert result_schema.fields["value"].metadata["description"] == "Tuple response field"
         assert content_type == "text/plain"
+
+
+class TestAutoMDSpecCache:
+    @pytest.fixture
+    def cache_app(self, make_app) -> Tuple[Flask, AutoMDApp]:
+        return make_app(spec_routes=(AutoMDSpecRoute.json,))
+
+    def test_spec_cached_between_requests(self, cache_app, watch_builds):
+        app, automd_app = cache_app
+        builds: List[Flask] = watch_builds(automd_app.auto_md)
+
+        client = app.test_client()
+        first: Dict = client.get("/automd/spec/json").get_json()
+        second: Dict = client.get("/automd/spec/json").get_json()
+
+        assert first == second
+        assert "/documented" in first["paths"]
+        assert len(builds) == 1
+
+    def test_spec_extended_when_route_added(self, cache_app, watch_builds):
+        app, automd_app = cache_app
+        client = app.test_client()
+
+        first_spec: APISpec
+        with app.test_request_context():
+            first_spec = automd_app.auto_md.cached_apispec(app)
+            assert automd_app.auto_md.cached_apispec(app) is first_spec
+
+        watch_builds(automd_app.auto_md, lambda: pytest.fail("spec should be extended, not rebuilt"))
+
+        @automd(summary="late route")
+        @app.route("/late")
+        def late_route() -> str:
+            return "OK"
+
+        class LateResource(Resource):
+            @automd(summary="late resource")
+            def post(self) -> str:
+                return "OK"
+
+        Api(app).add_resource(LateResource, "/late/resource", endpoint="LateResource")
+
+        spec: Dict = client.get("/automd/spec/json").get_json()
+        assert spec["paths"]["/late"]["get"]["summary"] == "late route"
+        assert spec["paths"]["/late/resource"]["post"]["summary"] == "late resource"
+        assert "/documented" in spec["paths"]
+
+        with app.test_request_context():
+            assert automd_app.auto_md.cached_apispec(app) is first_spec
+
+    def test_spec_rebuilt_when_route_added_directly(self, cache_app):
+        app, automd_app = cache_app
+        client = app.test_client()
+
+        first_spec: APISpec
+        with app.test_request_context():
+            first_spec = automd_app.auto_md.cached_apispec(app)
+
+        @automd(summary="direct route")
+        def direct_route() -> str:
+            return "OK"
+
+        app.url_map.add(Rule("/direct", endpoint="direct_route", methods=["GET"]))
+        app.view_functions["direct_route"] = direct_route
+
+        spec: Dict = client.get("/automd/spec/json").get_json()
+        assert spec["paths"]["/direct"]["get"]["summary"] == "direct route"
+
+        with app.test_request_context():
+            assert automd_app.auto_md.cached_apispec(app) is not first_spec
+
+    def test_route_added_during_build(self, cache_app, watch_builds):
+        app, automd_app = cache_app
+        client = app.test_client()
+        client.get("/automd/spec/json")
+
+        build_started: threading.Event = threading.Event()
+        release_build: threading.Event = threading.Event()
+        builds: List[Flask] = watch_builds(automd_app.auto_md,
+                                           lambda: build_started.set() or release_build.wait(5))
+
+        automd_app.auto_md.invalidate_spec_cache()
+        build_thread: threading.Thread = threading.Thread(target=client.get, args=("/automd/spec/json",))
+        build_thread.start()
+        assert build_started.wait(5)
+
+        @automd(summary="added during build")
+        def added_route() -> str:
+            return "OK"
+
+        register_thread: threading.Thread = threading.Thread(target=app.add_url_rule,
+                                                             args=("/added", "added_route", added_route))
+        register_thread.start()
+        register_thread.join(1)
+        assert not register_thread.is_alive()
+
+        release_build.set()
+        build_thread.join(5)
+
+        spec: Dict = client.get("/automd/spec/json").get_json()
+        assert spec["paths"]["/added"]["get"]["summary"] == "added during build"
+        assert "/documented" in spec["paths"]
+        assert len(builds) == 2
+
+    def test_route_added_while_extending(self, cache_app, watch_builds, monkeypatch):
+        app, automd_app = cache_app
+        client = app.test_client()
+        client.get("/automd/spec/json")
+        watch_builds(automd_app.auto_md, lambda: pytest.fail("spec should be extended, not rebuilt"))
+
+        extend_started: threading.Event = threading.Event()
+        release_extend: threading.Event = threading.Event()
+        extend_apispec: Callable = automd_app.auto_md.extend_apispec
+
+        def blocking_extend_apispec(*args) -> APISpec:
+            extend_started.set()
+            release_extend.wait(5)
+            return extend_apispec(*args)
+
+        monkeypatch.setattr(automd_app.auto_md, "extend_apispec", blocking_extend_apispec)
+
+        app.add_url_rule("/first", "first_route", automd(summary="first")(lambda: "OK"))
+        extend_thread: threading.Thread = threading.Thread(target=client.get, args=("/automd/spec/json",))
+        extend_thread.start()
+        assert extend_started.wait(5)
+
+        app.add_url_rule("/second", "second_route", automd(summary="second")(lambda: "OK"))
+        release_extend.set()
+        extend_thread.join(5)
+
+        spec: Dict = client.get("/automd/spec/json").get_json()
+        assert spec["paths"]["/first"]["get"]["summary"] == "first"
+        assert spec["paths"]["/second"]["get"]["summary"] == "second"
+
+    def test_spec_rebuilt_when_response_type_registered(self, cache_app):
+        app, automd_app = cache_app
+
+        class Point:
+            pass
+
+        class PointResponse(ResponseObjectInterface):
+            class PointResponseSchema(Schema):
+                x = fields.Float(required=True)
+
+            def to_dict(self) -> Dict:
+                return {}
+
+            @staticmethod
+            def to_schema() -> Schema:
+                return PointResponse.PointResponseSchema()
+
+            @staticmethod
+            def content_type() -> str:
+                return "application/json"
+
+        class PointResource(Resource):
+            @automd(summary="point")
+            def get(self) -> Point:
+                return Point()
+
+        automd_app.app_api.add_resource(PointResource, "/point", endpoint="PointResource")
+        client = app.test_client()
+
+        before: Dict = client.get("/automd/spec/json").get_json()
+        assert "application/json" not in before["paths"]["/point"]["get"]["responses"]["200"]["content"]
+
+        try:
+            response_type_registry.register(PointResponse, python_types=[Point])
+
+            after: Dict = client.get("/automd/spec/json").get_json()
+            assert "application/json" in after["paths"]["/point"]["get"]["responses"]["200"]["content"]
+            assert after["paths"]["/documented"] == before["paths"]["/documented"]
+        finally:
+            response_object_type_map.pop(Point, None)
+            response_object_type_map.pop(PointResponse, None)
+            clear_type_resolution_caches()
+
+    def test_spec_rebuilt_when_view_function_swapped(self, cache_app):
+        app, automd_app = cache_app
+        client = app.test_client()
+
+        first: Dict = client.get("/automd/spec/json").get_json()
+        assert first["paths"]["/documented"]["get"]["summary"] == "Documented Resource"
+
+        class SwappedResource(Resource):
+            @automd(summary="swapped resource")
+            def get(self) -> int:
+                return 2
+
+        previous_fingerprint: FrozenSet = automd_app.auto_md.route_fingerprint(app)
+        app.view_functions["DocumentedResource"] = SwappedResource.as_view("DocumentedResource")
+
+        assert automd_app.auto_md.route_fingerprint(app) != previous_fingerprint
+        spec: Dict = client.get("/automd/spec/json").get_json()
+        assert spec["paths"]["/documented"]["get"]["summary"] == "swapped resource"
+
+    def test_route_fingerprint_rule_methods(self, cache_app):
+        app, automd_app = cache_app
+        previous_fingerprint: FrozenSet = automd_app.auto_md.route_fingerprint(app)
+        assert automd_app.auto_md.route_fingerprint(app) == previous_fingerprint
+
+        rule: Rule = next(app.url_map.iter_rules("DocumentedResource"))
+        rule.methods = {*rule.methods, "POST"}
+
+        assert automd_app.auto_md.route_fingerprint(app) != previous_fingerprint
+
+class TestAutoMDSpecBuilder:
+    def test_converter_state_bounded(self):
+        auto_md: AutoMD = AutoMD("Builder Test App")
+
+        attribute_function_counts: List[int] = []
+        for _ in range(100):
+            converter: OpenAPIConverter = SpecBuilder.converter(auto_md.start_spec())
+            attribute_function_counts.append(len(converter.attribute_functions))
+
+            assert [function.__name__ for function in converter.attribute_functions].count(
+                mixedfield_2properties.__name__) == 1
+
+        assert len(set(attribute_function_counts)) == 1
+
+    def test_specs_do_not_share_converters(self):
+        auto_md: AutoMD = AutoMD("Builder Test App")
+
+        first_spec: APISpec = auto_md.start_spec()
+        second_spec: APISpec = auto_md.start_spec()
+
+        assert SpecBuilder.converter(first_spec) is not SpecBuilder.converter(second_spec)
+        assert SpecBuilder.converter(first_spec).spec is first_spec
+
+
+class TestAutoMDOperationCache:
+    @pytest.fixture
+    def operation_app(self, make_app) -> Tuple[Flask, AutoMD, Callable]:
+        app, automd_app = make_app(spec_routes=())
+        return app, automd_app.auto_md, app.view_functions["DocumentedResource"].view_class.get
+
+    def test_unchanged_operation_not_introspected(self, operation_app, monkeypatch):
+        app, auto_md, _ = operation_app
+
+        with app.test_request_context():
+            first: Dict = auto_md.application_to_apispec(app).to_dict()
+
+            def failing_parse_parameter_schema(*args):
+                raise AssertionError("cached operation should not be introspected")
+
+            monkeypatch.setattr(auto_md, "parse_parameter_schema", failing_parse_parameter_schema)
+            second: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert first == second
+        assert auto_md.operation_cache_stats == {"hits": 1, "misses": 1}
+
+    def test_changed_metadata_rebuilds_operation(self, operation_app):
+        app, auto_md, get = operation_app
+
+        with app.test_request_context():
+            auto_md.application_to_apispec(app)
+            automd(summary="changed operation")(get)
+            spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert spec["paths"]["/documented"]["get"]["summary"] == "changed operation"
+        assert auto_md.operation_cache_stats == {"hits": 0, "misses": 2}
+
+    def test_removed_operations_dropped(self, operation_app):
+        app, auto_md, _ = operation_app
+
+        with app.test_request_context():
+            auto_md.application_to_apispec(app)
+            app.view_functions.clear()
+            auto_md.application_to_apispec(app)
+
+        assert auto_md._operation_cache == {}
+        assert auto_md._previous_operation_cache == {}
+
+    def test_cleared_operations_introspected(self, operation_app):
+        app, auto_md, _ = operation_app
+
+        auto_md.application_to_apispec(app)
+        auto_md.clear_operation_cache()
+        auto_md.application_to_apispec(app)
+
+        assert auto_md.operation_cache_stats == {"hits": 0, "misses": 2}
+
+    def test_operations_share_resolver(self, monkeypatch):
+        app: Flask = Flask(__name__)
+        api: Api = Api(app)
+        auto_md: AutoMD = AutoMD("Operation Resolver Test App")
+
+        class FirstResource(Resource):
+            @automd(parameter_schema={"first": fields.String(location="json")})
+            def post(self, first: str) -> ValueResponse:
+                return ValueResponse(first)
+
+        class SecondResource(Resource):
+            @automd(parameter_schema={"second": fields.Integer(location="json")})
+            def post(self, second: int) -> ValueResponse:
+                return ValueResponse(second)
+
+        api.add_resource(FirstResource, "/first", endpoint="FirstResource")
+        api.add_resource(SecondResource, "/second", endpoint="SecondResource")
+
+        started_resolvers: List[OperationResolver] = []
+        start_resolver: Callable = auto_md.spec_builder.start_resolver
+        monkeypatch.setattr(auto_md.spec_builder, "start_resolver",
+                            lambda: started_resolvers.append(start_resolver()) or started_resolvers[-1])
+
+        auto_md.application_to_apispec(app)
+
+        assert len(started_resolvers) == 1
+        assert sorted(started_resolvers[0].plugin.schemas.keys()) == ["ValueResponse"]
+
+        fragments: Dict[str, OperationFragment] = {path_url: fragment
+                                                   for (_, path_url, _, _), (_, fragment)
+                                                   in auto_md._operation_cache.items()}
+        first_body, first_response = fragments["/first"].schemas.keys()
+        second_body, second_response = fragments["/second"].schemas.keys()
+        assert first_body.startswith("RequestBody") and second_body.startswith("RequestBody")
+        assert first_body != second_body
+        assert first_response == second_response == "ValueResponse"
+
+    def test_legacy_metadata_dict_documented(self):
+        app: Flask = Flask(__name__)
+        auto_md: AutoMD = AutoMD("Legacy Metadata Test App")
+
+        @app.route("/legacy")
+        def legacy_route(value: int):
+            return "OK"
+
+        setattr(legacy_route, AutoMDKeys.function.value, {
+            "summary": "legacy route",
+            "parameter_schema": None,
+            "func_signature": inspect.signature(legacy_route),
+            "response_schemas": {200: StringResponse}
+        })
+
+        with app.test_request_context():
+            spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert spec["paths"]["/legacy"]["get"]["summary"] == "legacy route"
+        assert spec["paths"]["/legacy"]["get"]["parameters"][0]["name"] == "value"
+
+    def test_undocumented_views_skipped(self, operation_app, monkeypatch):
+        app, auto_md, _ = operation_app
+        api: Api = Api(app)
+
+        class InternalResource(Resource):
+            def get(self):
+                return "OK"
+
+        api.add_resource(InternalResource, "/internal", endpoint="InternalResource")
+
+        @app.route("/internal/route")
+        def internal_route():
+            return "OK"
+
+        parse_flask_restful: Callable = auto_md.parse_flask_restful
+        parsed_views: List[Callable] = []
+
+        def recording_parse_flask_restful(view, routes):
+            parsed_views.append(view.view_class)
+            return parse_flask_restful(view, routes)
+
+        def failing_parse_flask_route(*args):
+            raise AssertionError("undocumented route should not be parsed")
+
+        monkeypatch.setattr(auto_md, "parse_flask_restful", recording_parse_flask_restful)
+        monkeypatch.setattr(auto_md, "parse_flask_route", failing_parse_flask_route)
+
+        with app.test_request_context():
+            spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert list(spec["paths"].keys()) == ["/documented"]
+        assert InternalResource not in parsed_views
+
+    def test_path_parameters_documented(self):
+        app: Flask = Flask(__name__)
+        api: Api = Api(app)
+        auto_md: AutoMD = AutoMD("Path Parameter Test App")
+
+        class ItemResource(Resource):
+            @automd(summary="item")
+            def get(self, item_id: int, verbose: bool = False) -> str:
+                return "OK"
+
+        api.add_resource(ItemResource, "/items/<int:item_id>", "/items/<int:item_id>/alias", endpoint="ItemResource")
+
+        @automd(summary="file")
+        @app.route("/files/<path:file_path>")
+        def file_route(file_path: str) -> str:
+            return "OK"
+
+        # no app or request context needed
+        spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert set(spec["paths"].keys()) == {"/items/{item_id}", "/items/{item_id}/alias", "/files/{file_path}"}
+
+        item_parameters: List[Dict] = spec["paths"]["/items/{item_id}"]["get"]["parameters"]
+        assert item_parameters[0] == {"in": "path", "name": "item_id", "required": True, "schema": {"type": "integer"}}
+        assert ([(parameter["in"], parameter["name"]) for parameter in item_parameters]
+                == [("path", "item_id"), ("query", "verbose")])
+
+        file_parameters: List[Dict] = spec["paths"]["/files/{file_path}"]["get"]["parameters"]
+        assert file_parameters == [{"in": "path", "name": "file_path", "required": True, "schema": {"type": "string"}}]
+
+
+class TestAutoMDComponents:
+    def test_shared_schemas_referenced(self):
+        app: Flask = Flask(__name__)
+        api: Api = Api(app)
+        auto_md: AutoMD = AutoMD("Shared Schema Test App")
+        body: Dict = {"name": fields.String(required=True, location="json")}
+
+        class FirstResource(Resource):
+            @automd(parameter_schema=body)
+            def post(self, name: str):
+                return "OK"
+
+        class SecondResource(Resource):
+            @automd(parameter_schema=body)
+            def post(self, name: str):
+                return "OK"
+
+        api.add_resource(FirstResource, "/first", endpoint="FirstResource")
+        api.add_resource(SecondResource, "/second", endpoint="SecondResource")
+
+        spec: Dict = auto_md.application_to_apispec(app).to_dict()
+        body_name: str = component_name({"type": "object",
+                                         "properties": {"name": {"type": "string"}},
+                                         "required": ["name"]}, "RequestBody")
+
+        assert set(spec["components"]["schemas"].keys()) == {"EmptyResponse", body_name}
+        for path_url in ("/first", "/second"):
+            operation: Dict = spec["paths"][path_url]["post"]
+            assert operation["requestBody"]["content"]["application/json"]["schema"] == {
+                "$ref": f"#/components/schemas/{body_name}"
+            }
+            assert operation["responses"]["200"]["content"]["text/plain"]["schema"] == {
+                "$ref": "#/components/schemas/EmptyResponse"
+            }
+
+    def test_schema_body_named_after_schema(self):
+        app: Flask = Flask(__name__)
+        api: Api = Api(app)
+        auto_md: AutoMD = AutoMD("Schema Body Test App")
+
+        class ItemSchema(Schema):
+            name = fields.String(required=True, location="json")
+
+        class ItemResource(Resource):
+            @automd(parameter_schema=ItemSchema())
+            def post(self, name: str):
+                return "OK"
+
+        api.add_resource(ItemResource, "/items", endpoint="ItemResource")
+
+        spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert spec["paths"]["/items"]["post"]["requestBody"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/ItemRequestBody"
+        }
+
+
+class TestAutoMDDiscovery:
+    @pytest.fixture
+    def discovery_app(self, make_app) -> Tuple[Flask, AutoMD]:
+        app, automd_app = make_app(spec_routes=())
+        for index in range(10):
+            app.add_url_rule(f"/plain/{index}", f"plain_{index}", lambda: "OK")
+
+        return app, automd_app.auto_md
+
+    def test_only_documented_endpoints_visited(self, discovery_app, monkeypatch):
+        app, auto_md = discovery_app
+        visited: List[str] = []
+        endpoint_operations: Callable = auto_md.endpoint_operations
+        monkeypatch.setattr(auto_md, "endpoint_operations",
+                            lambda name, *args: visited.append(name) or endpoint_operations(name, *args))
+
+        assert list(auto_md.application_to_apispec(app).to_dict()["paths"]) == ["/documented"]
+        assert visited == ["DocumentedResource"]
+
+    def test_wrapped_documented_view(self, discovery_app):
+        app, auto_md = discovery_app
+
+        @automd(summary="wrapped")
+        def wrapped() -> str:
+            return "OK"
+
+        @functools.wraps(wrapped)
+        def wrapper() -> str:
+            return wrapped()
+
+        app.add_url_rule("/wrapped", "wrapped", wrapper)
+
+        assert "/wrapped" in auto_md.application_to_apispec(app).to_dict()["paths"]
+
+    def test_reassigned_view_indexed(self, discovery_app):
+        app, auto_md = discovery_app
+        assert list(auto_md.application_to_apispec(app).to_dict()["paths"]) == ["/documented"]
+
+        @automd(summary="reassigned")
+        def reassigned() -> str:
+            return "OK"
+
+        app.view_functions["plain_0"] = reassigned
+
+        spec: Dict = auto_md.application_to_apispec(app).to_dict()
+        assert list(spec["paths"]) == ["/documented", "/plain/0"]
+        assert spec["paths"]["/plain/0"]["get"]["summary"] == "reassigned"
+
+
+class TestAutoMDParallelBuild:
+    def test_endpoint_shards_contiguous(self, monkeypatch):
+        monkeypatch.setattr("automd.automd.MIN_SHARD_ENDPOINTS", 10)
+        app: Flask = make_synthetic_app(45)
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+        assert len(auto_md.endpoint_shards(app)) == 1
+
+        shards: List[List[str]] = auto_md.endpoint_shards(app, workers=2)
+
+        assert len(shards) == 4
+        assert [name for shard in shards for name in shard] == [f"SyntheticResource{index}" for index in range(45)]
+
+    @pytest.mark.skipif(not fork_available(), reason="process pools fork the app")
+    def test_parallel_build_matches_serial(self, monkeypatch):
+        monkeypatch.setattr("automd.automd.MIN_SHARD_ENDPOINTS", 10)
+        app: Flask = make_synthetic_app(40, always_document=True)
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+        serial_spec: Dict = auto_md.application_to_apispec(app).to_dict()
+
+        assert len(auto_md.endpoint_shards(app, workers=2)) > 1
+        parallel_spec: Dict = auto_md.application_to_apispec_in_pool(app, workers=2).to_dict()
+
+        assert json.dumps(parallel_spec) == json.dumps(serial_spec)
+
+    @pytest.mark.skipif(not fork_available(), reason="process pools fork the app")
+    def test_parallel_build_fills_operation_cache(self, monkeypatch):
+        monkeypatch.setattr("automd.automd.MIN_SHARD_ENDPOINTS", 10)
+        app: Flask = make_synthetic_app(40)
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+        auto_md.rendered_spec_in_pool(app, workers=2)
+        auto_md.invalidate_spec_cache()
+        auto_md.rendered_spec(app)
+
+        assert auto_md.operation_cache_stats["misses"] == 0
+        assert auto_md.operation_cache_stats["hits"] > 0
+
+    @pytest.mark.skipif(not fork_available(), reason="process pools fork the app")
+    def test_parallel_build_introspects_once(self, monkeypatch):
+        monkeypatch.setattr("automd.automd.MIN_SHARD_ENDPOINTS", 10)
+        app: Flask = make_synthetic_app(40)
+        auto_md: AutoMD = app.config[AutoMDKeys.config.value].auto_md
+
+        introspected: List[str] = []
+        endpoint_operation_arguments: Callable = auto_md.endpoint_operation_arguments
+        monkeypatch.setattr(auto_md, "endpoint_operation_arguments",
+                            lambda name, *args: introspected.append(name) or endpoint_operation_arguments(name, *args))
+
+        auto_md.application_to_apispec_in_pool(app, workers=2)
+
+        assert sorted(introspected) == sorted(f"SyntheticResource{index}" for index in range(40))
@@ -0,0 +1,53 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Dict
+
+import pytest
+import yaml
+from flask import Flask
+
+from automd.cli import main, load_app
+
+plain_app: Flask = Flask(__name__)
+
+
+def test_load_app_not_initialized():
+    with pytest.raises(ValueError):
+        load_app("tests.cli_test:plain_app")
+
+
+def test_build_command(tmp_path: Path):
+    output_dir: Path = Path(tmp_path, "docs")
+
+    assert main(["build", "automd_testapp.app:app", "-o", str(output_dir), "--gzip"]) == 0
+
+    json_spec: Dict = json.loads(Path(output_dir, "spec.json").read_text())
+    assert "/status/status" in json_spec["paths"]
+    assert "/flask/status" in json_spec["paths"]
+
+    yaml_spec: Dict = yaml.safe_load(Path(output_dir, "spec.yaml").read_text())
+    assert yaml_spec == json_spec
+
+    html_spec: str = Path(output_dir, "spec.html").read_text()
+    assert "/status/status" in html_spec
+
+    assert gzip.decompress(Path(output_dir, "spec.json.gz").read_bytes()) == Path(output_dir, "spec.json").read_bytes()
+
+
+def test_build_command_format(tmp_path: Path):
+    assert main(["build", "automd_testapp.app", "-o", str(tmp_path), "-f", "yaml"]) == 0
+
+    assert [path.name for path in tmp_path.iterdir()] == ["spec.yaml"]
+
+
+def test_build_command_pages(tmp_path: Path):
+    assert main(["build", "automd_testapp.app", "-o", str(tmp_path), "-f", "json", "--pages", "md"]) == 0
+
+    assert Path(tmp_path, "pages", "index.md").is_file()
+    assert "/status/status" in Path(tmp_path, "pages", "automd-test-application.md").read_text()
+
+
+def test_command_required():
+    with pytest.raises(SystemExit):
+        main([])
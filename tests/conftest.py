@@ -0,0 +1,56 @@
+from typing import Tuple, List, Callable
+
+import pytest
+from apispec import APISpec
+from flask import Flask
+from flask_restful import Api, Resource
+
+from automd.automd import AutoMD
+from automd.decorators import automd
+from automd.registration import AutoMDApp
+
+
+@pytest.fixture
+def make_app() -> Callable[..., Tuple[Flask, AutoMDApp]]:
+    """
+    Factory of Flask apps documented by AutoMD, with a single documented resource routed at /documented.
+    Keyword arguments are passed to AutoMDApp.  The resource is defined anew for each app, so tests may
+    redecorate its handler.
+    """
+    def make(**automd_kwargs) -> Tuple[Flask, AutoMDApp]:
+        app: Flask = Flask(__name__)
+        api: Api = Api(app)
+        automd_app: AutoMDApp = AutoMDApp(api, "Test App", **automd_kwargs)
+
+        class DocumentedResource(Resource):
+            @automd(summary="Documented Resource")
+            def get(self) -> str:
+                return "OK"
+
+        api.add_resource(DocumentedResource, "/documented", endpoint="DocumentedResource")
+        return app, automd_app
+
+    return make
+
+
+@pytest.fixture
+def watch_builds(monkeypatch) -> Callable[..., List[Flask]]:
+    """
+    Wrap the application_to_apispec of an AutoMD to record the apps it builds, calling before_build ahead of each
+    build, e.g. to block or fail it.
+    :return: Function wrapping an AutoMD, which returns the list the built apps are recorded in
+    """
+    def watch(auto_md: AutoMD, before_build: Callable[[], None] = None) -> List[Flask]:
+        builds: List[Flask] = []
+        application_to_apispec: Callable = auto_md.application_to_apispec
+
+        def watched_application_to_apispec(flask_app: Flask) -> APISpec:
+            builds.append(flask_app)
+            if before_build is not None:
+                before_build()
+            return application_to_apispec(flask_app)
+
+        monkeypatch.setattr(auto_md, "application_to_apispec", watched_application_to_apispec)
+        return builds
+
+    return watch
@@ -1,7 +1,15 @@
+import inspect
 from inspect import Signature
-from typing import Dict
+from typing import Dict, List, Callable
 
-from automd.decorators import disable_automd, automd
+import pytest
+from flask import Flask
+from marshmallow import Schema
+from webargs import fields
+
+from automd.decorators import disable_automd, automd, argument_location
+from automd.endpoint_doc import EndpointDoc
+from automd.endpoint_registry import endpoint_registry
 from automd.keys import AutoMDKeys
 from automd.responses import IntegerResponse
 
@@ -49,3 +57,120 @@ def test_disable_automd_decorator():
 
     test_func = func
     assert hasattr(test_func, AutoMDKeys.hide_function.value)
+
+
+def test_automd_decorator_introspection_deferred(monkeypatch):
+    signature_calls: List[Callable] = []
+    signature: Callable = inspect.signature
+
+    def counting_signature(func: Callable) -> Signature:
+        signature_calls.append(func)
+        return signature(func)
+
+    monkeypatch.setattr(inspect, "signature", counting_signature)
+
+    @automd(summary="test_summary")
+    def func(arg_1: str) -> int:
+        pass
+
+    automd_params: EndpointDoc = getattr(func, AutoMDKeys.function.value)
+    assert signature_calls == []
+
+    assert automd_params["response_schemas"] == {200: IntegerResponse}
+    assert automd_params["func_signature"] is automd_params.func_signature
+    assert signature_calls == [func]
+
+    assert dict(automd_params) == {
+        "summary": "test_summary",
+        "parameter_schema": None,
+        "func_signature": automd_params.func_signature,
+        "response_schemas": {200: IntegerResponse}
+    }
+    assert automd_params.get("description") is None
+
+
+def test_endpoint_doc_slotted():
+    @automd(summary="test_summary")
+    def func() -> int:
+        pass
+
+    automd_params: EndpointDoc = getattr(func, AutoMDKeys.function.value)
+    assert not hasattr(automd_params, "__dict__")
+    assert automd_params.summary == "test_summary"
+    assert automd_params.tags is None
+
+
+def test_endpoint_doc_from_legacy_metadata():
+    def func(arg_1: str) -> int:
+        pass
+
+    legacy_params: Dict = {
+        "summary": "legacy_summary",
+        "parameter_schema": None,
+        "func_signature": inspect.signature(func),
+        "response_schemas": {200: IntegerResponse}
+    }
+
+    automd_params: EndpointDoc = EndpointDoc.from_metadata(func, legacy_params)
+    assert automd_params.summary == "legacy_summary"
+    assert automd_params.func_signature is legacy_params["func_signature"]
+    assert dict(automd_params) == legacy_params
+    assert EndpointDoc.from_metadata(func, automd_params) is automd_params
+
+
+def test_decorators_record_registry():
+    @automd()
+    def documented_func():
+        pass
+
+    @disable_automd()
+    def hidden_func():
+        pass
+
+    def plain_func():
+        pass
+
+    assert endpoint_registry.is_documented(documented_func)
+    assert not endpoint_registry.is_documented(hidden_func)
+    assert not endpoint_registry.is_documented(plain_func)
+    assert endpoint_registry.is_hidden(hidden_func)
+    assert documented_func in endpoint_registry.documented
+    assert hidden_func in endpoint_registry.hidden
+
+
+def test_use_kwargs_argmap_compiled_once(monkeypatch):
+    from webargs.flaskparser import use_kwargs
+
+    arguments: Dict = {"text": fields.String(required=False)}
+
+    @use_kwargs(arguments, location="query")
+    def first(text: str = None):
+        return text
+
+    @use_kwargs(arguments, location="query")
+    def second(text: str = None):
+        return text
+
+    assert argument_location(arguments["text"]) == "query"
+
+    monkeypatch.setattr(Schema, "from_dict", classmethod(lambda *args: pytest.fail("argmap compiled per request")))
+    app: Flask = Flask(__name__)
+    with app.test_request_context("/?text=compiled"):
+        assert first() == "compiled"
+        assert second() == "compiled"
+
+
+def test_use_kwargs_leaves_fields_unchanged():
+    from webargs.flaskparser import use_kwargs
+
+    shared_field: fields.Field = fields.String(required=False)
+    declared_field: fields.Field = fields.String(required=False, location="json")
+
+    @use_kwargs({"text": shared_field}, location="form")
+    def handler(text: str = None):
+        return text
+
+    assert shared_field.metadata == {}
+    assert argument_location(shared_field) == "form"
+    assert argument_location(declared_field) == "json"
+    assert argument_location(fields.String()) == "query"
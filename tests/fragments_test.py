@@ -0,0 +1,86 @@
+import copy
+from typing import Dict
+
+from apispec import APISpec
+from marshmallow import Schema
+
+from automd.fragments import OperationFragment, merge_fragment, component_name, REF_PREFIX
+
+
+def make_fragment(schema_name: str, schema: Dict) -> OperationFragment:
+    operation: Dict = {
+        "responses": {"200": {"content": {"application/json": {"schema": {"$ref": f"{REF_PREFIX}{schema_name}"}}}}}
+    }
+    return OperationFragment(operation, {schema_name: schema})
+
+
+def response_ref(api_spec: APISpec, path_url: str) -> str:
+    return api_spec.to_dict()["paths"][path_url]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["$ref"]
+
+
+class TestMergeFragment:
+    def test_identical_schemas_shared(self):
+        api_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+
+        merge_fragment(api_spec, "/first", "GET", make_fragment("FirstBody", {"type": "object", "properties": {}}))
+        merge_fragment(api_spec, "/second", "GET", make_fragment("SecondBody", {"properties": {}, "type": "object"}))
+
+        assert list(api_spec.to_dict()["components"]["schemas"].keys()) == ["FirstBody"]
+        assert response_ref(api_spec, "/second") == f"{REF_PREFIX}FirstBody"
+
+    def test_different_schema_under_taken_name_numbered(self):
+        api_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+
+        merge_fragment(api_spec, "/first", "GET", make_fragment("Body", {"type": "object"}))
+        merge_fragment(api_spec, "/second", "GET", make_fragment("Body", {"type": "array"}))
+        merge_fragment(api_spec, "/third", "GET", make_fragment("Body", {"type": "array"}))
+
+        assert list(api_spec.to_dict()["components"]["schemas"].keys()) == ["Body", "Body1"]
+        assert response_ref(api_spec, "/second") == f"{REF_PREFIX}Body1"
+        assert response_ref(api_spec, "/third") == f"{REF_PREFIX}Body1"
+
+    def test_schemas_registered_outside_merges_shared(self):
+        api_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+        api_spec.components.schema("Existing", component={"type": "string"})
+
+        merge_fragment(api_spec, "/first", "GET", make_fragment("Body", {"type": "string"}))
+
+        assert response_ref(api_spec, "/first") == f"{REF_PREFIX}Existing"
+
+    def test_schemas_registered_between_merges(self):
+        api_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+
+        merge_fragment(api_spec, "/first", "GET", make_fragment("First", {"type": "object"}))
+        api_spec.components.schema("Body", component={"type": "string"})
+        merge_fragment(api_spec, "/second", "GET", make_fragment("Body", {"type": "array"}))
+        merge_fragment(api_spec, "/third", "GET", make_fragment("Other", {"type": "string"}))
+
+        assert list(api_spec.to_dict()["components"]["schemas"].keys()) == ["First", "Body", "Body1"]
+        assert response_ref(api_spec, "/second") == f"{REF_PREFIX}Body1"
+        assert response_ref(api_spec, "/third") == f"{REF_PREFIX}Body"
+
+    def test_path_merge_matches_public_path(self):
+        fragment: OperationFragment = make_fragment("Body", {"type": "object"})
+        merged_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+        merge_fragment(merged_spec, "/first", "GET", fragment)
+        merge_fragment(merged_spec, "/first", "POST", fragment)
+
+        public_spec: APISpec = APISpec("Test", "1.0.0", "3.0.0")
+        public_spec.components.schema("Body", component={"type": "object"})
+        public_spec.path("/first", operations={"get": copy.deepcopy(fragment.operation),
+                                               "post": copy.deepcopy(fragment.operation)})
+
+        assert merged_spec.to_dict() == public_spec.to_dict()
+        assert list(merged_spec.to_dict()["paths"]["/first"].keys()) == ["get", "post"]
+
+    def test_component_name(self):
+        class ItemSchema(Schema):
+            pass
+
+        schema: Dict = {"type": "object", "properties": {"name": {"type": "string"}}}
+        reordered_schema: Dict = {"properties": {"name": {"type": "string"}}, "type": "object"}
+
+        assert component_name(schema, "RequestBody", ItemSchema) == "ItemRequestBody"
+        assert component_name(schema, "RequestBody") == component_name(reordered_schema, "RequestBody")
+        assert component_name(schema, "RequestBody").startswith("RequestBody")
+        assert component_name(schema, "RequestBody") != component_name({"type": "object"}, "RequestBody")
@@ -0,0 +1,59 @@
+from typing import Any, List
+
+import pytest
+from marshmallow import ValidationError, fields
+
+from automd.mixedfield import MixedField
+
+
+class TestMixedField:
+    def test_first_converting_field_used(self):
+        field: MixedField = MixedField([fields.Integer(), fields.Float(), fields.String()])
+
+        assert field._deserialize("5", "value", {}) == 5
+        assert field._deserialize("2.5", "value", {}) == 2.5
+        assert field._deserialize("text", "value", {}) == "text"
+        assert field._serialize(5, "value", {}) == 5
+
+        with pytest.raises(ValidationError, match="could not be deserialized"):
+            field._deserialize([1], "value", {})
+
+    def test_rejected_fields_skipped(self, monkeypatch):
+        field: MixedField = MixedField([fields.String(), fields.List(fields.Integer()), fields.Integer()])
+
+        def failing_deserialize(*args, **kwargs) -> Any:
+            pytest.fail("field rejecting the value type was tried")
+
+        monkeypatch.setattr(field.field_types[0], "_deserialize", failing_deserialize)
+        monkeypatch.setattr(field.field_types[1], "_deserialize", failing_deserialize)
+
+        assert field._deserialize(7, "value", {}) == 7
+        assert field._deserialize(8, "value", {}) == 8
+        assert field.dispatch_stats == {"hits": 2, "misses": 0, "skipped": 4}
+
+    def test_adaptive_order(self):
+        values: List[str] = ["text", "more text", "5"]
+        ordered: MixedField = MixedField([fields.Integer(), fields.String()])
+        adaptive: MixedField = MixedField([fields.Integer(), fields.String()], adaptive_order=True)
+
+        assert [ordered._deserialize(value, "value", {}) for value in values] == ["text", "more text", 5]
+        # String converted the most str values, so it is tried first and converts "5" too
+        assert [adaptive._deserialize(value, "value", {}) for value in values] == ["text", "more text", "5"]
+
+    def test_adaptive_order_reordered_during_conversion(self, monkeypatch):
+        integer_field: fields.Integer = fields.Integer()
+        string_field: fields.String = fields.String()
+        field: MixedField = MixedField([integer_field, string_field], adaptive_order=True)
+        integer_deserialize = integer_field._deserialize
+
+        def reordering_deserialize(value, *args, **kwargs) -> Any:
+            # values converted meanwhile, e.g. by another thread, move String ahead of Integer
+            monkeypatch.setattr(integer_field, "_deserialize", integer_deserialize)
+            assert [field._deserialize(text, "value", {}) for text in ["a", "b"]] == ["a", "b"]
+            return integer_deserialize(value, *args, **kwargs)
+
+        monkeypatch.setattr(integer_field, "_deserialize", reordering_deserialize)
+
+        assert field._deserialize("5", "value", {}) == 5
+        # the conversion of "5" is counted for Integer, not for the field now first
+        assert field._dispatch["deserialize"][str] == ((string_field, integer_field), (2, 1))
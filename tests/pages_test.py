@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Dict, List
+
+from automd.templates.pages import (PageFormat, render_pages, tag_operations, tag_page_names, write_pages,
+                                    TagOperation, MarkdownPageRenderer, unique_slugs)
+
+spec: Dict = {
+    "info": {"title": "Pages <Test>", "version": "1.0.0"},
+    "tags": [{"name": "Items", "description": "Item endpoints"}, {"name": "Unused"}],
+    "paths": {
+        "/items/{item_id}": {
+            "parameters": [{"in": "path", "name": "item_id", "required": True, "schema": {"type": "integer"}}],
+            "get": {
+                "tags": ["Items"],
+                "summary": "Get an item",
+                "responses": {"200": {"description": "OK", "content": {
+                    "application/json": {"schema": {"$ref": "#/components/schemas/Item"}}
+                }}}
+            },
+            "delete": {"tags": ["Items", "Admin"], "responses": {"204": {"description": "Deleted"}}}
+        },
+        "/status": {"get": {"summary": "<Status>", "responses": {}}}
+    },
+    "components": {"schemas": {"Item": {"type": "object", "properties": {"name": {"type": "string"}}}}}
+}
+
+
+def test_tag_operations():
+    tags: Dict[str, List[TagOperation]] = tag_operations(spec)
+
+    assert list(tags) == ["Items", "Admin", "default"]
+    assert [(path, verb) for path, verb, _, _ in tags["Items"]] == [("/items/{item_id}", "get"),
+                                                                    ("/items/{item_id}", "delete")]
+
+
+def test_tag_page_names():
+    assert tag_page_names(["Index", "My Tag", "my-tag"]) == {"Index": "index-2", "My Tag": "my-tag",
+                                                             "my-tag": "my-tag-2"}
+
+
+def test_schema_anchors_unique():
+    schemas: Dict = {"Foo_Bar": {"type": "object"}, "Foo-Bar": {"type": "string"}}
+    anchors: Dict[str, str] = unique_slugs(schemas)
+    pages: Dict[str, str] = render_pages({**spec, "components": {"schemas": schemas}}, PageFormat.html)
+
+    assert anchors == {"Foo_Bar": "foo-bar", "Foo-Bar": "foo-bar-2"}
+    assert 'id="foo-bar"' in pages["schemas.html"] and 'id="foo-bar-2"' in pages["schemas.html"]
+
+
+def test_operation_anchors_unique():
+    paths: Dict = {"/a/b": {"get": {"responses": {}}}, "/a-b": {"get": {"responses": {}}}}
+    pages: Dict[str, str] = render_pages({**spec, "paths": paths}, PageFormat.html)
+
+    assert 'id="get-a-b"' in pages["default.html"] and 'id="get-a-b-2"' in pages["default.html"]
+
+
+def test_markdown_code_backticks():
+    renderer: MarkdownPageRenderer = MarkdownPageRenderer()
+
+    assert renderer.code("name") == "`name`"
+    assert renderer.code("a`b") == "``a`b``"
+    assert renderer.code("`quoted`") == "`` `quoted` ``"
+    assert renderer.code_block('{"a": "```"}') == '````json\n{"a": "```"}\n````'
+
+
+def test_render_html_pages():
+    pages: Dict[str, str] = render_pages(spec, PageFormat.html)
+
+    assert list(pages) == ["index.html", "items.html", "admin.html", "default.html", "schemas.html"]
+    assert '<a href="items.html">Items</a>' in pages["index.html"]
+    assert "<title>Pages &lt;Test&gt;</title>" in pages["index.html"]
+    assert "&lt;Status&gt;" in pages["default.html"]
+    assert "<script" not in "".join(pages.values())
+
+    items_page: str = pages["items.html"]
+    assert "Item endpoints" in items_page
+    assert "<code>item_id</code>" in items_page
+    assert '<a href="schemas.html#item">Item</a>' in items_page
+    assert 'id="item"' in pages["schemas.html"]
+
+
+def test_render_markdown_pages():
+    pages: Dict[str, str] = render_pages(spec, PageFormat.markdown)
+
+    assert "| [Items](items.md) | 2 |" in pages["index.md"]
+    assert "## DELETE /items/\\{item\\_id\\}" in pages["admin.md"]
+    assert "[Item](schemas.md#item)" in pages["items.md"]
+
+
+def test_write_pages_in_parallel(tmp_path: Path):
+    paths: List[str] = write_pages(spec, str(tmp_path), PageFormat.html, workers=2)
+
+    assert [Path(path).name for path in paths] == list(render_pages(spec, PageFormat.html))
+    assert Path(paths[0]).read_text() == render_pages(spec, PageFormat.html)["index.html"]
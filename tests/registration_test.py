@@ -0,0 +1,212 @@
+import gzip
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict
+
+import pytest
+from flask import Flask
+
+from automd.cli import build_artifacts
+from automd.registration import AutoMDBuildMode, AutoMDHTMLMode, AutoMDSpecRoute
+
+
+class TestAutoMDAppBuildMode:
+    def test_lazy_start_build_does_nothing(self, make_app, monkeypatch):
+        app, automd_app = make_app()
+        build_calls: List[int] = []
+        monkeypatch.setattr(automd_app, "build_spec", lambda: build_calls.append(1))
+
+        assert automd_app.start_build() is None
+        assert build_calls == []
+
+    def test_eager_build(self, make_app, watch_builds):
+        app, automd_app = make_app(build_mode=AutoMDBuildMode.eager)
+        builds: List[Flask] = watch_builds(automd_app.auto_md)
+
+        automd_app.start_build()
+        assert len(builds) == 1
+
+        response = app.test_client().get("/automd/spec/json")
+        assert response.status_code == 200
+        assert "/documented" in response.get_json()["paths"]
+        assert len(builds) == 1
+
+    def test_background_build_waits(self, make_app, watch_builds):
+        app, automd_app = make_app(build_mode=AutoMDBuildMode.background)
+        release_build: threading.Event = threading.Event()
+        watch_builds(automd_app.auto_md, release_build.wait)
+
+        build_thread: threading.Thread = automd_app.start_build()
+
+        responses: List = []
+        request_thread: threading.Thread = threading.Thread(
+            target=lambda: responses.append(app.test_client().get("/automd/html"))
+        )
+        request_thread.start()
+        request_thread.join(0.2)
+        assert request_thread.is_alive()
+
+        release_build.set()
+        build_thread.join(5)
+        request_thread.join(5)
+        assert responses[0].status_code == 200
+
+    def test_background_build_unavailable(self, make_app, watch_builds):
+        app, automd_app = make_app(build_mode=AutoMDBuildMode.background, wait_for_build=False, retry_after=7)
+        release_build: threading.Event = threading.Event()
+        watch_builds(automd_app.auto_md, release_build.wait)
+
+        build_thread: threading.Thread = automd_app.start_build()
+        client = app.test_client()
+
+        building_response = client.get("/automd/spec/json")
+        assert building_response.status_code == 503
+        assert building_response.headers["Retry-After"] == "7"
+
+        release_build.set()
+        build_thread.join(5)
+
+        assert client.get("/automd/spec/json").status_code == 200
+
+
+class TestAutoMDAppPrebuilt:
+    @pytest.fixture
+    def prebuilt_app(self, tmp_path: Path, make_app, watch_builds) -> Flask:
+        build_app, _ = make_app()
+        build_artifacts(build_app, tmp_path, gzip=True)
+
+        app, automd_app = make_app(prebuilt_path=str(tmp_path), build_mode=AutoMDBuildMode.eager)
+        watch_builds(automd_app.auto_md, lambda: pytest.fail("spec should not be built with prebuilt files"))
+        automd_app.start_build()
+
+        return app
+
+    def test_serves_prebuilt_files(self, tmp_path: Path, prebuilt_app: Flask):
+        app: Flask = prebuilt_app
+        client = app.test_client()
+
+        for url, filename, mimetype in [("/automd/spec/json", "spec.json", "application/json"),
+                                        ("/automd/spec/yaml", "spec.yaml", "text/yaml"),
+                                        ("/automd/html", "spec.html", "text/html")]:
+            response = client.get(url)
+
+            assert response.status_code == 200
+            assert response.mimetype == mimetype
+            assert response.data == Path(tmp_path, filename).read_bytes()
+            assert "Content-Encoding" not in response.headers
+            response.close()
+
+    def test_serves_prebuilt_gzip(self, tmp_path: Path, prebuilt_app: Flask):
+        app: Flask = prebuilt_app
+        client = app.test_client()
+
+        response = client.get("/automd/spec/json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.data) == Path(tmp_path, "spec.json").read_bytes()
+        response.close()
+
+    def test_prebuilt_conditional_and_range(self, tmp_path: Path, prebuilt_app: Flask):
+        app: Flask = prebuilt_app
+        client = app.test_client()
+
+        response = client.get("/automd/spec/json")
+        etag: str = response.headers["ETag"]
+        response.close()
+
+        cached_response = client.get("/automd/spec/json", headers={"If-None-Match": etag})
+        assert cached_response.status_code == 304
+        cached_response.close()
+
+        range_response = client.get("/automd/spec/json", headers={"Range": "bytes=0-9"})
+        assert range_response.status_code == 206
+        assert range_response.data == Path(tmp_path, "spec.json").read_bytes()[:10]
+        range_response.close()
+
+    def test_prebuilt_missing_file(self, tmp_path: Path, make_app):
+        app, _ = make_app(prebuilt_path=str(tmp_path))
+
+        assert app.test_client().get("/automd/spec/json").status_code == 404
+
+
+class TestAutoMDAppConcurrency:
+    def test_concurrent_requests_single_build(self, make_app, watch_builds):
+        app, automd_app = make_app()
+        builds: List[Flask] = watch_builds(automd_app.auto_md, lambda: time.sleep(0.1))
+
+        urls: List[str] = ["/automd/spec/json", "/automd/spec/yaml", "/automd/html"]
+        thread_count: int = 24
+        start_barrier: threading.Barrier = threading.Barrier(thread_count)
+        responses: Dict[str, List[bytes]] = {url: [] for url in urls}
+
+        def hammer(url: str):
+            client = app.test_client()
+            start_barrier.wait()
+            for _ in range(5):
+                response = client.get(url, headers={"Accept-Encoding": "gzip"})
+                assert response.status_code == 200
+                responses[url].append(gzip.decompress(response.data))
+
+        threads: List[threading.Thread] = [threading.Thread(target=hammer, args=(urls[index % len(urls)],))
+                                           for index in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        for url, bodies in responses.items():
+            assert len(bodies) == thread_count // len(urls) * 5
+            assert len(set(bodies)) == 1
+
+
+class TestAutoMDAppHTMLShell:
+    def test_shell_served_without_building_spec(self, make_app, watch_builds):
+        app, automd_app = make_app(html_mode=AutoMDHTMLMode.redoc_shell, html_max_age=3600)
+        watch_builds(automd_app.auto_md, lambda: pytest.fail("spec built for the shell page"))
+        client = app.test_client()
+
+        response = client.get("/automd/html")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/html"
+        assert b'<redoc spec-url="spec/json">' in response.data
+        assert response.cache_control.public and response.cache_control.max_age == 3600
+
+        not_modified = client.get("/automd/html", headers={"If-None-Match": response.headers["ETag"]})
+        assert not_modified.status_code == 304
+
+    def test_swagger_ui_shell(self, make_app):
+        app, _ = make_app(html_mode=AutoMDHTMLMode.swagger_ui_shell)
+
+        assert b'url: "spec/json"' in app.test_client().get("/automd/html").data
+
+    def test_shell_needs_json_route(self, make_app):
+        with pytest.raises(ValueError):
+            make_app(html_mode=AutoMDHTMLMode.redoc_shell, spec_routes=(AutoMDSpecRoute.html,))
+
+    def test_served_assets(self, tmp_path: Path, make_app):
+        Path(tmp_path, "redoc.standalone.js").write_text("var Redoc = {};")
+        app, automd_app = make_app(html_mode=AutoMDHTMLMode.redoc_shell, serve_assets=True, asset_dir=str(tmp_path))
+        client = app.test_client()
+
+        page: bytes = client.get("/automd/html").data
+        asset_url: str = automd_app.asset_bundle.urls("/automd/assets")["redoc.standalone.js"]
+        assert b"https://" not in page
+        assert f'src="{asset_url[len("/automd/"):]}"'.encode("utf-8") in page
+
+        response = client.get(asset_url)
+        assert response.status_code == 200
+        assert response.data == b"var Redoc = {};"
+        assert response.cache_control.immutable
+        assert client.get("/automd/assets/redoc.standalone.js").status_code == 404
+
+        shell_response = client.get("/automd/html")
+        assert shell_response.cache_control.no_cache and shell_response.cache_control.max_age is None
+        assert client.get("/automd/html", headers={"If-None-Match": shell_response.headers["ETag"]}).status_code == 304
+
+    def test_served_assets_need_shell(self, tmp_path: Path, make_app):
+        with pytest.raises(ValueError):
+            make_app(serve_assets=True, asset_dir=str(tmp_path))
@@ -0,0 +1,160 @@
+import gzip
+import json
+import zlib
+from collections import OrderedDict
+from typing import List, Dict
+
+import yaml
+from apispec.yaml_utils import YAMLDumper
+from flask import Flask
+from flask_restful import Resource
+
+from automd.decorators import automd
+from automd.keys import AutoMDKeys
+from automd.rendering import RenderedSpec, SpecFormat, iter_json, iter_yaml
+from benchmarks.synthetic_app import make_synthetic_app
+
+
+class TestRenderedSpec:
+    def test_body_rendered_once(self, make_app):
+        app, automd_app = make_app()
+
+        with app.test_request_context():
+            rendered: RenderedSpec = automd_app.auto_md.rendered_spec(app)
+
+            assert rendered.body(SpecFormat.json) is rendered.body(SpecFormat.json)
+            assert rendered.body(SpecFormat.json).etag != rendered.body(SpecFormat.yaml).etag
+
+    def test_spec_routes_serve_etag(self, make_app):
+        app, _ = make_app()
+        client = app.test_client()
+
+        for url, mimetype in [("/automd/spec/json", "application/json"),
+                              ("/automd/spec/yaml", "text/yaml"),
+                              ("/automd/html", "text/html")]:
+            response = client.get(url)
+
+            assert response.status_code == 200
+            assert response.mimetype == mimetype
+            assert response.headers["ETag"]
+
+    def test_yaml_route_serves_yaml(self, make_app):
+        app, _ = make_app()
+        client = app.test_client()
+
+        spec = yaml.safe_load(client.get("/automd/spec/yaml").get_data(as_text=True))
+
+        assert spec["paths"]["/documented"]["get"]["summary"] == "Documented Resource"
+
+    def test_if_none_match_not_modified(self, make_app):
+        app, _ = make_app()
+        client = app.test_client()
+
+        response = client.get("/automd/spec/json")
+        etag: str = response.headers["ETag"]
+
+        cached_response = client.get("/automd/spec/json", headers={"If-None-Match": etag})
+        assert cached_response.status_code == 304
+        assert cached_response.data == b""
+
+        stale_response = client.get("/automd/spec/json", headers={"If-None-Match": '"stale"'})
+        assert stale_response.status_code == 200
+        assert stale_response.data == response.data
+
+    def test_accept_encoding_variants(self, make_app):
+        app, _ = make_app()
+        client = app.test_client()
+
+        for url in ["/automd/spec/json", "/automd/spec/yaml", "/automd/html"]:
+            plain_response = client.get(url)
+            assert "Content-Encoding" not in plain_response.headers
+            assert plain_response.headers["Vary"] == "Accept-Encoding"
+
+            gzip_response = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+            assert gzip_response.headers["Content-Encoding"] == "gzip"
+            assert gzip_response.headers["Vary"] == "Accept-Encoding"
+            assert gzip.decompress(gzip_response.data) == plain_response.data
+            assert gzip_response.headers["ETag"] != plain_response.headers["ETag"]
+
+            deflate_response = client.get(url, headers={"Accept-Encoding": "gzip;q=0.5, deflate"})
+            assert deflate_response.headers["Content-Encoding"] == "deflate"
+            assert zlib.decompress(deflate_response.data) == plain_response.data
+
+            refused_response = client.get(url, headers={"Accept-Encoding": "br"})
+            assert "Content-Encoding" not in refused_response.headers
+            assert refused_response.data == plain_response.data
+
+    def test_if_none_match_compressed_variant(self, make_app):
+        app, _ = make_app()
+        client = app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+
+        etag: str = client.get("/automd/html", headers=headers).headers["ETag"]
+        cached_response = client.get("/automd/html", headers={**headers, "If-None-Match": etag})
+
+        assert cached_response.status_code == 304
+        assert cached_response.headers["Vary"] == "Accept-Encoding"
+
+    def test_to_dict_default_served(self, make_app):
+        class DictDefault:
+            def to_dict(self):
+                return {"key": "value"}
+
+        app, automd_app = make_app()
+
+        class DefaultResource(Resource):
+            @automd(summary="Default Resource")
+            def get(self, value: dict = DictDefault()) -> str:
+                return "OK"
+
+        automd_app.app_api.add_resource(DefaultResource, "/default", endpoint="DefaultResource")
+        client = app.test_client()
+
+        for url in ["/automd/spec/json", "/automd/html"]:
+            assert client.get(url).status_code == 200
+
+        spec: Dict = json.loads(client.get("/automd/spec/json").data)
+        parameter: Dict = spec["paths"]["/default"]["get"]["parameters"][0]
+
+        assert parameter["schema"]["default"] == {"key": "value"}
+
+        automd_app.stream_specs = True
+        assert json.loads(client.get("/automd/spec/json").data) == spec
+
+
+class TestStreamedSpec:
+    def test_stream_matches_body(self):
+        app: Flask = make_synthetic_app(20, always_document=True)
+        rendered: RenderedSpec = app.config[AutoMDKeys.config.value].auto_md.rendered_spec(app)
+
+        spec_format: SpecFormat
+        for spec_format in SpecFormat:
+            chunks: List[bytes] = list(rendered.stream(spec_format, chunk_size=512))
+
+            assert len(chunks) > 1
+            assert max(len(chunk) for chunk in chunks) < 4096
+            assert b"".join(chunks) == rendered.body(spec_format).body
+
+    def test_iter_json_pieces(self):
+        document: Dict = {"paths": {"/a": {"get": {"summary": "a"}}, "/b": {}}, "info": {"title": "t"}, "ids": [1]}
+
+        assert "".join(iter_json(document)) == json.dumps(document)
+        assert "".join(iter_json({})) == "{}"
+        assert "".join(iter_json({1: "non string key"})) == json.dumps({1: "non string key"})
+
+    def test_iter_yaml_key_order(self):
+        document: Dict = {"paths": OrderedDict([("/b", {"z": 1, "a": 2}), ("/a", {})]), "info": {"title": "t"}}
+
+        assert "".join(iter_yaml(document)) == yaml.dump(document, Dumper=YAMLDumper)
+
+    def test_streamed_spec_route(self, make_app):
+        app, automd_app = make_app()
+        automd_app.stream_specs = True
+        client = app.test_client()
+
+        response = client.get("/automd/spec/json")
+
+        assert response.is_streamed
+        assert response.headers.get("ETag") is None
+        assert json.loads(response.data)["paths"]["/documented"]["get"]["summary"] == "Documented Resource"
+        assert automd_app.auto_md.rendered_spec(app)._bodies == {}
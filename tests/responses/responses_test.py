@@ -1,9 +1,11 @@
 import inspect
+import mimetypes
 import typing
 from typing import List, Dict
 from inspect import Signature
 
-from marshmallow import fields
+import pytest
+from marshmallow import Schema, fields
 
 from automd.mixedfield import MixedField
 from automd.responses.responses import (map_response_object_type,
@@ -13,7 +15,9 @@ from automd.responses.responses import (map_response_object_type,
                                         DictResponse,
                                         ListResponse,
                                         ValueResponse, map_type_field_mapping, type_to_field, get_type_origin,
-                                        TupleResponse)
+                                        TupleResponse, TypeResolutionCache, type_resolution_stats,
+                                        ResponseObjectInterface, ResponseTypeRegistry, response_object_type_map,
+                                        clear_type_resolution_caches)
 
 
 def test_map_response_object_type_str():
@@ -219,6 +223,19 @@ class TestResponsesTypeToField:
         int_compare = getattr(int, "__name__", str(int))
         assert field.metadata["description"] == f"Tuple of types ({string_compare}, {int_compare})"
 
+    def test_tuple_bare_python36(self, monkeypatch):
+        class BareTuple:
+            # typing.Tuple as seen on Python 3.6, before typing.get_args
+            __origin__ = tuple
+            __args__ = None
+
+        monkeypatch.delattr(typing, "get_args")
+        monkeypatch.delattr(typing, "get_origin")
+        field: fields.Field = type_to_field(BareTuple)
+
+        assert isinstance(field, fields.List)
+        assert field.metadata["description"] == "Tuple of types ()"
+
     def test_dict(self):
         field: fields.Field = type_to_field(Dict)
 
@@ -257,3 +274,101 @@ class TestResponsesTypeToField:
         list_compare = getattr(List[str], "__name__", str(List[str]))
         dict_compare = getattr(Dict[str, bool], "__name__", str(Dict[str, bool]))
         assert field.metadata["description"] == f"Multiple Types Allowed: {list_compare}, {dict_compare}"
+
+
+class TestTypeResolutionCache:
+    def test_cached_fields_are_new(self):
+        first: fields.Field = type_to_field(typing.Optional[List[str]], required=True)
+        second: fields.Field = type_to_field(typing.Optional[List[str]], required=False)
+
+        assert first is not second
+        assert first.inner is not second.inner
+        assert first.required and not second.required
+
+    def test_union_order_kept(self):
+        int_first: fields.Field = type_to_field(typing.Union[int, str])
+        str_first: fields.Field = type_to_field(typing.Union[str, int])
+
+        assert int_first.metadata["description"] == "Multiple Types Allowed: int, str"
+        assert str_first.metadata["description"] == "Multiple Types Allowed: str, int"
+
+    def test_stats(self):
+        resolved: List = []
+        cache: TypeResolutionCache = TypeResolutionCache(lambda key: resolved.append(key) or len(resolved), maxsize=2)
+
+        assert cache(List[str]) == cache(List[str]) == 1
+        assert cache([str]) == 2
+        assert cache([str]) == 3
+        cache(int)
+        cache(float)
+
+        assert cache.stats() == {"hits": 1, "misses": 3, "uncacheable": 2, "size": 2, "maxsize": 2}
+        assert cache(List[str]) == 6
+
+        cache.clear()
+        assert cache.stats()["size"] == 0
+
+    def test_type_resolution_stats(self):
+        type_to_field(Dict[str, int])
+        stats: typing.Dict[str, typing.Dict[str, int]] = type_resolution_stats()
+
+        assert set(stats.keys()) == {"response_object_type", "type_field_mapping", "field_factory"}
+        assert stats["field_factory"]["hits"] + stats["field_factory"]["misses"] > 0
+
+
+class TestResponseTypeRegistry:
+    def test_schema_and_content_type_resolved_once(self, monkeypatch):
+        registry: ResponseTypeRegistry = ResponseTypeRegistry()
+        schema: Schema = registry.schema(StringResponse)
+
+        monkeypatch.setattr(StringResponse, "to_schema", staticmethod(lambda: pytest.fail("schema built again")))
+        monkeypatch.setattr(mimetypes, "MimeTypes", lambda *args: pytest.fail("mime database read"))
+
+        assert registry.schema(StringResponse("OK")) is schema
+        assert registry.content_type(StringResponse) == "text/plain"
+        assert registry.content_type(DictResponse) == "application/json"
+
+    def test_register_custom_response(self):
+        class Point:
+            pass
+
+        class PointResponse(ResponseObjectInterface):
+            class PointResponseSchema(Schema):
+                x = fields.Float(required=True)
+                y = fields.Float(required=True)
+
+            def to_dict(self) -> typing.Dict:
+                return {}
+
+            @staticmethod
+            def to_schema() -> Schema:
+                return PointResponse.PointResponseSchema()
+
+            @staticmethod
+            def content_type() -> str:
+                return "application/json"
+
+        assert map_response_object_type(Point) is None
+
+        registry: ResponseTypeRegistry = ResponseTypeRegistry()
+        try:
+            assert registry.register(PointResponse, python_types=[Point]) is PointResponse
+
+            assert map_response_object_type(Point) is PointResponse
+            assert isinstance(registry.schema(PointResponse), PointResponse.PointResponseSchema)
+        finally:
+            response_object_type_map.pop(Point, None)
+            response_object_type_map.pop(PointResponse, None)
+            clear_type_resolution_caches()
+
+    def test_duck_typed_response_without_content_type(self):
+        class DuckResponse:
+            @staticmethod
+            def to_schema() -> Schema:
+                return Schema.from_dict({"value": fields.String()}, name="DuckResponseSchema")()
+
+        registry: ResponseTypeRegistry = ResponseTypeRegistry()
+
+        assert registry.content_type(DuckResponse) == "text/plain"
+        assert list(registry.schema(DuckResponse).fields.keys()) == ["value"]
+        assert registry.resolve_entry(DuckResponse)[1] == "text/plain"
@@ -0,0 +1,50 @@
+from typing import Dict, List
+
+from werkzeug.routing import Map, Rule
+
+from automd.route_index import RouteIndex, Route, openapi_path
+
+
+def test_openapi_path_static():
+    assert openapi_path("/items") == ("/items", [])
+
+
+def test_openapi_path_converters():
+    path, path_parameters = openapi_path("/items/<int:item_id>/<name>/<float:ratio>/<uuid:key>/<path:rest>")
+
+    assert path == "/items/{item_id}/{name}/{ratio}/{key}/{rest}"
+    assert [parameter["name"] for parameter in path_parameters] == ["item_id", "name", "ratio", "key", "rest"]
+    assert all(parameter["in"] == "path" and parameter["required"] for parameter in path_parameters)
+    assert [parameter["schema"] for parameter in path_parameters] == [
+        {"type": "integer"},
+        {"type": "string"},
+        {"type": "number"},
+        {"type": "string", "format": "uuid"},
+        {"type": "string"}
+    ]
+
+
+def test_openapi_path_converter_arguments():
+    path, path_parameters = openapi_path("/<any(json, 'yaml'):fmt>/<string(length=2):code>/<custom:value>")
+
+    assert path == "/{fmt}/{code}/{value}"
+    assert path_parameters[0]["schema"] == {"type": "string", "enum": ["json", "yaml"]}
+    assert path_parameters[1]["schema"] == {"type": "string"}
+    assert path_parameters[2]["schema"] == {"type": "string"}
+
+
+def test_route_index_routes():
+    url_map: Map = Map([
+        Rule("/items", endpoint="items", methods=["GET"]),
+        Rule("/items/<int:item_id>", endpoint="items", methods=["GET", "DELETE"]),
+        Rule("/other", endpoint="other")
+    ])
+    route_index: RouteIndex = RouteIndex(url_map, "/api/")
+
+    routes: List[Route] = route_index.routes("items")
+    routes_by_path: Dict[str, Route] = {route.path: route for route in routes}
+    assert set(routes_by_path.keys()) == {"/api/items", "/api/items/{item_id}"}
+    assert routes_by_path["/api/items/{item_id}"].path_arguments == ["item_id"]
+    assert set(routes_by_path["/api/items/{item_id}"].methods) == {"GET", "HEAD", "DELETE"}
+    assert route_index.routes("items") is routes
+    assert route_index.routes("missing") == []
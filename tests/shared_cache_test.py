@@ -0,0 +1,153 @@
+import gc
+import gzip
+import mmap
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from automd.decorators import automd
+from automd.rendering import SpecFormat, RenderedSpec
+from automd.shared_cache import SharedSpecCache, MappedSpec, spec_version
+
+
+def test_spec_version_stable(tmp_path: Path, make_app):
+    first_app, first_automd_app = make_app(shared_cache_dir=str(tmp_path))
+    second_app, second_automd_app = make_app(shared_cache_dir=str(tmp_path))
+
+    assert (spec_version(first_app, first_automd_app.auto_md)
+            == spec_version(second_app, second_automd_app.auto_md))
+    assert (spec_version(first_app, first_automd_app.auto_md, "v1")
+            != spec_version(first_app, first_automd_app.auto_md, "v2"))
+
+    second_app.add_url_rule("/other", "other", lambda: "OK")
+    assert (spec_version(first_app, first_automd_app.auto_md)
+            != spec_version(second_app, second_automd_app.auto_md))
+
+
+def test_spec_shared_between_apps(tmp_path: Path, make_app, watch_builds):
+    first_app, _ = make_app(shared_cache_dir=str(tmp_path))
+    first_response = first_app.test_client().get("/automd/spec/json")
+    assert "/documented" in first_response.get_json()["paths"]
+
+    second_app, second_automd_app = make_app(shared_cache_dir=str(tmp_path))
+    watch_builds(second_automd_app.auto_md, lambda: pytest.fail("spec should be loaded from the shared cache"))
+    client = second_app.test_client()
+
+    second_response = client.get("/automd/spec/json")
+    assert second_response.data == first_response.data
+    assert second_response.headers["ETag"] == first_response.headers["ETag"]
+
+    gzip_response = client.get("/automd/spec/json", headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(gzip_response.data) == first_response.data
+
+    cached_response = client.get("/automd/html", headers={"If-None-Match": client.get("/automd/html").headers["ETag"]})
+    assert cached_response.status_code == 304
+
+    with second_app.test_request_context():
+        mapped: MappedSpec = second_automd_app.current_spec()
+        assert isinstance(mapped.body(SpecFormat.yaml).body, mmap.mmap)
+
+
+def test_single_build_under_lock(tmp_path: Path, make_app):
+    app, automd_app = make_app(shared_cache_dir=str(Path(tmp_path, "app")))
+    cache: SharedSpecCache = SharedSpecCache(str(Path(tmp_path, "cache")))
+    build_calls: List[int] = []
+
+    def build() -> RenderedSpec:
+        build_calls.append(1)
+        time.sleep(0.1)
+        with app.test_request_context():
+            return automd_app.auto_md.rendered_spec(app)
+
+    mapped_specs: List[MappedSpec] = []
+
+    def load():
+        mapped_specs.append(cache.load("version", build, (SpecFormat.json,)))
+
+    threads: List[threading.Thread] = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(build_calls) == 1
+    assert len({bytes(mapped.body(SpecFormat.json).body) for mapped in mapped_specs}) == 1
+
+
+def test_old_versions_pruned(tmp_path: Path, make_app):
+    app, automd_app = make_app(shared_cache_dir=str(Path(tmp_path, "app")))
+    cache: SharedSpecCache = SharedSpecCache(str(Path(tmp_path, "cache")))
+
+    def build() -> RenderedSpec:
+        with app.test_request_context():
+            return automd_app.auto_md.rendered_spec(app)
+
+    def version_dirs() -> List[str]:
+        return sorted(path.name for path in cache.cache_dir.iterdir() if path.is_dir())
+
+    cache.load("v1", build, (SpecFormat.json,))
+    gc.collect()
+    in_use: MappedSpec = cache.load("v2", build, (SpecFormat.json,))
+    assert version_dirs() == ["v2"]
+
+    cache.load("v3", build, (SpecFormat.json,))
+    assert version_dirs() == ["v2", "v3"]
+    assert b"/documented" in bytes(in_use.body(SpecFormat.json).body)
+
+    # mapped again after being pruned, the version is written again
+    del in_use
+    gc.collect()
+    assert b"/documented" in bytes(cache.load("v1", build, (SpecFormat.json,)).body(SpecFormat.json).body)
+    assert version_dirs() == ["v1"]
+    assert sorted(path.name for path in cache.cache_dir.glob("*.lock")) == ["v1.lock"]
+
+
+def test_leftover_version_dir_replaced(tmp_path: Path, make_app):
+    app, automd_app = make_app(shared_cache_dir=str(Path(tmp_path, "app")))
+    cache: SharedSpecCache = SharedSpecCache(str(Path(tmp_path, "cache")))
+
+    def build() -> RenderedSpec:
+        with app.test_request_context():
+            return automd_app.auto_md.rendered_spec(app)
+
+    # left by a prune interrupted after removing the manifest
+    leftover_dir: Path = Path(cache.cache_dir, "v1")
+    leftover_dir.mkdir()
+    Path(leftover_dir, "spec.json").write_bytes(b"partial")
+
+    mapped: MappedSpec = cache.load("v1", build, (SpecFormat.json,))
+
+    assert b"/documented" in bytes(mapped.body(SpecFormat.json).body)
+    assert sorted(path.name for path in cache.cache_dir.iterdir() if path.is_dir()) == ["v1"]
+
+
+def test_write_failure_served_from_memory(tmp_path: Path, make_app, monkeypatch):
+    app, automd_app = make_app(shared_cache_dir=str(Path(tmp_path, "app")))
+    cache: SharedSpecCache = SharedSpecCache(str(Path(tmp_path, "cache")))
+
+    def build() -> RenderedSpec:
+        with app.test_request_context():
+            return automd_app.auto_md.rendered_spec(app)
+
+    def failing_replace(source, destination):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr("automd.shared_cache.os.replace", failing_replace)
+    spec = cache.load("v1", build, (SpecFormat.json,))
+
+    assert isinstance(spec, RenderedSpec)
+    assert b"/documented" in spec.body(SpecFormat.json).body
+    assert list(path for path in cache.cache_dir.iterdir() if path.is_dir()) == []
+
+
+def test_documentation_changes_version(tmp_path: Path, make_app):
+    for summary in ("First summary", "Second summary"):
+        app, _ = make_app(shared_cache_dir=str(tmp_path))
+        automd(summary=summary)(app.view_functions["DocumentedResource"].view_class.get)
+
+        spec = app.test_client().get("/automd/spec/json").get_json()
+
+        assert spec["paths"]["/documented"]["get"]["summary"] == summary